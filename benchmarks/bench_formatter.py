@@ -0,0 +1,92 @@
+"""
+Benchmark da renderização de tweets: 20 clubes x N snapshots
+
+Monta N snapshots sintéticos (benchmarks/pagina_exemplo.py) com os 20
+clubes e compara gerar_tweet chamado uma vez por clube e snapshot com
+renderizar_lote, que usa os modelos compilados e formata cada data uma
+única vez. Os dois caminhos precisam gerar exatamente os mesmos textos.
+
+Para executar: python benchmarks/bench_formatter.py [snapshots] [repeticoes]
+"""
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.pagina_exemplo import CLUBES, gerar_pagina
+from src.scraper import parsear_tabela
+from src.tabela import normalizar_texto
+from src.formatter import gerar_tweet, renderizar_lote
+import main as bot
+
+
+def montar_snapshots(quantidade: int) -> list:
+    """Retorna um item de renderizar_lote por clube e snapshot"""
+    itens = []
+    for semente in range(quantidade):
+        tabelas = {
+            chave: parsear_tabela(
+                gerar_pagina(tipo, semente * 10 + indice),
+                tipo
+            )
+            for indice, (chave, tipo) in enumerate(bot.TIPOS_TABELA.items())
+        }
+        for clube in CLUBES:
+            classificacao, probabilidades = bot.dados_do_time(tabelas, normalizar_texto(clube))
+            itens.append({
+                "classificacao": classificacao,
+                "probabilidades": probabilidades,
+                "time": clube,
+                "emoji_time": "⚽",
+            })
+    return itens
+
+
+def medir(funcao, repeticoes: int) -> list:
+    """Tempos (s) de cada repetição, após uma execução de aquecimento"""
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def main() -> int:
+    argumentos = sys.argv[1:]
+    snapshots = int(argumentos[0]) if argumentos else 50
+    repeticoes = int(argumentos[1]) if len(argumentos) > 1 else 20
+
+    itens = montar_snapshots(snapshots)
+
+    def um_por_chamada():
+        return [
+            gerar_tweet(i["classificacao"], i["probabilidades"], time=i["time"], emoji_time=i["emoji_time"])
+            for i in itens
+        ]
+
+    def em_lote():
+        # gerar_tweet usa a data de hoje; o lote recebe a mesma data
+        return renderizar_lote(itens, quando=datetime.now())
+
+    if um_por_chamada() != em_lote():
+        print("renderizar_lote difere de gerar_tweet!")
+        return 1
+
+    print(f"{len(CLUBES)} clubes x {snapshots} snapshots = {len(itens)} tweets, {repeticoes} repetições")
+    print(f"{'caminho':<16} {'lote (ms)':>10} {'por tweet (µs)':>15}")
+    resultados = {}
+    for nome, funcao in (("gerar_tweet", um_por_chamada), ("renderizar_lote", em_lote)):
+        media = statistics.fmean(medir(funcao, repeticoes))
+        resultados[nome] = media
+        print(f"{nome:<16} {media * 1000:>10.2f} {media / len(itens) * 1e6:>15.2f}")
+    print(f"Aceleração do lote: {resultados['gerar_tweet'] / resultados['renderizar_lote']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Benchmark dos backends de parse das tabelas do UFMG
+
+Para executar: python benchmarks/bench_parser.py [repeticoes]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.pagina_exemplo import gerar_pagina
+from src.parsers import BACKENDS
+
+
+def medir(funcao, html: str, repeticoes: int) -> tuple[float, float]:
+    """
+    Mede tempo médio e pico de memória de um backend
+
+    Returns:
+        Tupla com (tempo médio em ms, pico de memória em KiB)
+    """
+    funcao(html)  # Aquecimento (imports, caches internos)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(html)
+    media = (time.perf_counter() - inicio) / repeticoes * 1000
+
+    tracemalloc.start()
+    funcao(html)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return media, pico / 1024
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    paginas = {tipo: gerar_pagina(tipo) for tipo in ["classificacao", "probabilidade"]}
+    referencia = {tipo: BACKENDS["bs4"](html) for tipo, html in paginas.items()}
+
+    print(f"{'backend':<12} {'pagina':<14} {'tempo (ms)':>11} {'pico (KiB)':>11}")
+    for nome, funcao in BACKENDS.items():
+        for tipo, html in paginas.items():
+            try:
+                resultado = funcao(html)
+            except ImportError:
+                print(f"{nome:<12} {tipo:<14} {'não instalado':>23}")
+                continue
+            if resultado != referencia[tipo]:
+                print(f"{nome:<12} {tipo:<14} resultado difere do bs4!")
+                continue
+            media, pico = medir(funcao, html, repeticoes)
+            print(f"{nome:<12} {tipo:<14} {media:>11.2f} {pico:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Teste de carga da coleta contra o servidor replay (sem rede)
+
+Sobe src.replay.ServidorUFMG com os snapshots de um diretório (ou com as
+fixtures de benchmarks/fixtures.py) e executa várias rodadas de
+main.baixar_conteudos, medindo vazão, latência por rodada e falhas. As
+falhas injetadas vêm de <dir>/falhas.json.
+
+Para executar: python benchmarks/bench_replay.py [diretorio] [rodadas]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Sem cache HTTP: toda rodada baixa as páginas completas
+os.environ.setdefault("HTTP_CACHE", "0")
+os.environ.setdefault("HTTP_TAXA_POR_HOST", "0")
+os.environ.setdefault("HISTORICO_DB", ":memory:")
+os.environ.setdefault("OUTBOX_DB", "")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fixtures import carregar_fixtures
+from config.settings import URLS
+from src.replay import iniciar_replay
+import main as bot
+
+
+def gravar_snapshots(diretorio: str) -> None:
+    """Grava as fixtures no formato de diretório do servidor replay"""
+    paginas = carregar_fixtures()
+    for chave, url in URLS.items():
+        with open(os.path.join(diretorio, f"{chave}.html"), "w", encoding="utf-8") as f:
+            f.write(paginas[url])
+
+
+def main() -> int:
+    argumentos = sys.argv[1:]
+    rodadas = int(argumentos[1]) if len(argumentos) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = argumentos[0] if argumentos else temporario
+        if not argumentos:
+            gravar_snapshots(diretorio)
+
+        servidor = iniciar_replay(diretorio)
+        try:
+            tempos = []
+            paginas = falhas = 0
+            inicio = time.perf_counter()
+            for _ in range(rodadas):
+                inicio_rodada = time.perf_counter()
+                conteudos = bot.baixar_conteudos()
+                tempos.append(time.perf_counter() - inicio_rodada)
+                paginas += sum(1 for c in conteudos.values() if c is not None)
+                falhas += sum(1 for c in conteudos.values() if c is None)
+            total = time.perf_counter() - inicio
+        finally:
+            servidor.parar()
+
+    tempos.sort()
+    print(f"Falhas injetadas: {servidor.falhas}")
+    print(f"Rodadas: {rodadas}  páginas: {paginas}  falhas: {falhas}")
+    print(f"Vazão: {paginas / total:.1f} páginas/s")
+    print(
+        f"Rodada: média {statistics.fmean(tempos) * 1000:.1f} ms, "
+        f"p95 {tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))] * 1000:.1f} ms"
+    )
+    print(f"Servidor: {servidor.estatisticas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Benchmark da simulação Monte Carlo: temporadas simuladas por segundo
+
+Usa uma classificação sintética de 20 clubes na metade do campeonato e
+mede os dois modelos de src/simulacao.py: com a tabela de jogos restantes
+(turno e returno completos, 190 jogos) e com o adversário médio.
+
+Para executar: python benchmarks/bench_simulacao.py [temporadas] [repeticoes]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.pagina_exemplo import CLUBES
+from src.tabela import Tabela, normalizar_texto
+from src.simulacao import simular
+
+RODADAS_JOGADAS = 19
+
+
+def classificacao_exemplo(semente: int = 1) -> Tabela:
+    """Classificação após RODADAS_JOGADAS rodadas, ordenada por pontos"""
+    aleatorio = random.Random(semente)
+    linhas = []
+    for clube in CLUBES:
+        vitorias = aleatorio.randint(2, 13)
+        empates = aleatorio.randint(2, RODADAS_JOGADAS - vitorias)
+        derrotas = RODADAS_JOGADAS - vitorias - empates
+        linhas.append([clube, 3 * vitorias + empates, vitorias, empates, derrotas, aleatorio.randint(-15, 15)])
+    linhas.sort(key=lambda linha: -linha[1])
+    return Tabela.de_celulas([], [
+        [str(posicao), clube, str(pontos), str(RODADAS_JOGADAS), str(v), str(e), str(d), "0", "0", str(sg), "0"]
+        for posicao, (clube, pontos, v, e, d, sg) in enumerate(linhas, 1)
+    ], "classificacao")
+
+
+def returno() -> list:
+    """Jogos do returno de um turno e returno pelo método do círculo"""
+    indices = list(range(len(CLUBES)))
+    rodadas = []
+    for _ in range(len(CLUBES) - 1):
+        rodadas.append([(indices[i], indices[-1 - i]) for i in range(len(CLUBES) // 2)])
+        indices = [indices[0], indices[-1]] + indices[1:-1]
+    return [
+        (normalizar_texto(CLUBES[visitante]), normalizar_texto(CLUBES[mandante]))
+        for rodada in rodadas for mandante, visitante in rodada
+    ]
+
+
+def main() -> int:
+    argumentos = sys.argv[1:]
+    temporadas = int(argumentos[0]) if argumentos else 100000
+    repeticoes = int(argumentos[1]) if len(argumentos) > 1 else 5
+
+    classificacao = classificacao_exemplo()
+    partidas = returno()
+
+    print(f"{len(CLUBES)} clubes, {temporadas} temporadas, {repeticoes} repetições")
+    print(f"{'modelo':<18} {'tempo (s)':>10} {'temporadas/s':>14}")
+    for nome, jogos in (("jogos restantes", partidas), ("adversário médio", None)):
+        simular(classificacao, jogos, temporadas=1000)
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            simular(classificacao, jogos, temporadas=temporadas)
+            tempos.append(time.perf_counter() - inicio)
+        media = statistics.fmean(tempos)
+        print(f"{nome:<18} {media:>10.3f} {temporadas / media:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
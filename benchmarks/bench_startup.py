@@ -0,0 +1,163 @@
+"""
+Benchmark de inicialização do bot no caminho "nada mudou"
+
+Executa main.executar_bot em um subprocesso com python -X importtime,
+servindo páginas de exemplo por uma sessão falsa e com o cache do último
+post já contendo as mesmas impressões digitais. Soma o tempo de import
+(descontando o do interpretador vazio) e falha se passar do orçamento ou
+se módulos que só servem para postar/parsear forem carregados.
+
+Para executar: python benchmarks/bench_startup.py [repeticoes]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmarks.pagina_exemplo import gerar_pagina
+from config.settings import URLS
+from src.cache import calcular_impressao, salvar_dados_cache
+
+# Orçamento de tempo de import (ms) do caminho sem mudanças
+ORCAMENTO_MS = 220
+
+# Módulos que não podem ser carregados quando nada é postado nem parseado
+PROIBIDOS = ["bs4", "tweepy", "lxml", "oauthlib", "requests_oauthlib"]
+
+CACHE_ULTIMO_POST = "last_post_cache.json"
+
+TIPOS = {
+    chave: "classificacao" if chave == "classificacao_geral" else "probabilidade"
+    for chave in URLS
+}
+
+# Script executado no subprocesso (diretório de trabalho = diretório temporário)
+SCRIPT = """
+import json
+import sys
+
+sys.path.insert(0, {raiz!r})
+
+import main
+from src import scraper
+
+PAGINAS = json.load(open("paginas.json", encoding="utf-8"))
+
+
+class RespostaFalsa:
+    status_code = 200
+    encoding = "utf-8"
+    headers = {{}}
+
+    def __init__(self, url):
+        self.url = url
+        self.text = PAGINAS[url]
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        corpo = self.text.encode("utf-8")
+        for i in range(0, len(corpo), chunk_size):
+            yield corpo[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class SessaoFalsa:
+    def get(self, url, **kwargs):
+        return RespostaFalsa(url)
+
+
+scraper.sessao_padrao = lambda: SessaoFalsa()
+sucesso = main.executar_bot(modo_teste=True, clube={{
+    "nome": "VITORIA", "emoji": "", "credenciais": None, "cache": {cache!r}
+}})
+carregados = [m for m in {proibidos!r} if m in sys.modules]
+print(json.dumps({{"sucesso": sucesso, "carregados": carregados}}))
+"""
+
+
+def tempo_import_ms(stderr: str) -> float:
+    """Soma os tempos "self" de todas as linhas de -X importtime (em ms)"""
+    total = 0
+    for linha in stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        proprio = linha.split(":", 1)[1].split("|")[0].strip()
+        if proprio.isdigit():
+            total += int(proprio)
+    return total / 1000
+
+
+def executar(argumentos: list, diretorio: str) -> subprocess.CompletedProcess:
+    """Executa o interpretador com -X importtime sem cache HTTP nem histórico em disco"""
+    ambiente = dict(os.environ, HTTP_CACHE="0", HTTP_TAXA_POR_HOST="0", HISTORICO_DB=":memory:", OUTBOX_DB="", PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", *argumentos],
+        cwd=diretorio, env=ambiente, capture_output=True, text=True, timeout=120
+    )
+
+
+def preparar(diretorio: str) -> None:
+    """Grava as páginas de exemplo e um cache de último post com as mesmas impressões"""
+    paginas = {url: gerar_pagina(TIPOS[chave]) for chave, url in URLS.items()}
+    with open(os.path.join(diretorio, "paginas.json"), "w", encoding="utf-8") as f:
+        json.dump(paginas, f, ensure_ascii=False)
+
+    impressoes = {chave: calcular_impressao(paginas[url]) for chave, url in URLS.items()}
+    salvar_dados_cache({}, {}, os.path.join(diretorio, CACHE_ULTIMO_POST), impressoes)
+
+    script = SCRIPT.format(raiz=str(RAIZ), cache=CACHE_ULTIMO_POST, proibidos=PROIBIDOS)
+    with open(os.path.join(diretorio, "caminho_sem_mudancas.py"), "w", encoding="utf-8") as f:
+        f.write(script)
+
+
+def main() -> int:
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        preparar(diretorio)
+
+        tempos = []
+        carregados: set = set()
+        for _ in range(repeticoes):
+            base = executar(["-c", "pass"], diretorio)
+            execucao = executar(["caminho_sem_mudancas.py"], diretorio)
+            if execucao.returncode != 0:
+                print(execucao.stderr[-2000:])
+                print("Execução do caminho sem mudanças falhou")
+                return 1
+
+            resultado = json.loads(execucao.stdout.strip().splitlines()[-1])
+            if not resultado["sucesso"]:
+                print("executar_bot retornou False")
+                return 1
+            carregados.update(resultado["carregados"])
+            tempos.append(tempo_import_ms(execucao.stderr) - tempo_import_ms(base.stderr))
+
+    mediana = statistics.median(tempos)
+    print(f"Tempo de import (mediana de {repeticoes}): {mediana:.1f} ms (orçamento {ORCAMENTO_MS} ms)")
+
+    falhou = False
+    if carregados:
+        print(f"Módulos proibidos carregados: {', '.join(sorted(carregados))}")
+        falhou = True
+    if mediana > ORCAMENTO_MS:
+        print("Orçamento de inicialização excedido")
+        falhou = True
+
+    if not falhou:
+        print("OK")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Suíte de benchmarks offline do scraper, do formatter e do fluxo completo
+
+Usa as fixtures HTML de benchmarks/fixtures.py (sem rede) e um
+tweepy.Client falso. Para cada caso mede tempo médio, mediana, p95 e pico
+de memória, e compara a mediana e o pico com a linha de base gravada em
+benchmarks/baseline.json. Termina com erro se algum caso regredir além da
+tolerância.
+
+Para executar:   python benchmarks/bench_suite.py [repeticoes]
+Nova baseline:   python benchmarks/bench_suite.py --salvar-baseline [repeticoes]
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+from unittest.mock import MagicMock, patch
+
+# Sem cache HTTP nem histórico em disco: cada repetição faz o trabalho completo
+os.environ.setdefault("HTTP_CACHE", "0")
+os.environ.setdefault("HTTP_TAXA_POR_HOST", "0")
+os.environ.setdefault("HISTORICO_DB", ":memory:")
+os.environ.setdefault("OUTBOX_DB", "")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fixtures import SessaoFalsa, carregar_fixtures
+from config.settings import URLS, TIME_ALVO
+from src import scraper
+from src.scraper import fazer_requisicao, extrair_classificacao_geral, extrair_probabilidade
+from src.formatter import gerar_tweet, criar_thread
+from src.cache import dados_mudaram
+import main as bot
+
+ARQUIVO_BASELINE = Path(__file__).parent / "baseline.json"
+
+# Fração de piora aceita em relação à baseline (mediana do tempo e pico de memória)
+TOLERANCIA = 0.5
+
+# Casos com mediana abaixo de CURTO_MS na baseline oscilam mais (GC, cache da
+# CPU, agendador) e usam a tolerância maior
+CURTO_MS = 5.0
+TOLERANCIA_CURTA = 1.0
+
+# Diferenças absolutas menores que estas são ruído de medição (casos abaixo de
+# 0,1 ms variam mais que a tolerância de uma execução para outra)
+RUIDO = {"mediana_ms": 0.1, "pico_kib": 16}
+
+# Execuções descartadas antes das medidas (imports tardios, sessões, clientes, caches)
+AQUECIMENTO = 5
+
+TIPOS_PROBABILIDADE = ["rebaixamento", "sulamericana", "libertadores"]
+
+
+def montar_casos(sessao: SessaoFalsa, diretorio: str) -> Dict[str, Callable[[], Any]]:
+    """
+    Monta os casos medidos, todos servidos pela sessão falsa
+
+    Args:
+        sessao: Sessão com as fixtures
+        diretorio: Diretório temporário para o cache do último post
+
+    Returns:
+        Dicionário {nome do caso: função sem argumentos}
+    """
+    url_classificacao = URLS["classificacao_geral"]
+    classificacao = extrair_classificacao_geral(url_classificacao, TIME_ALVO, sessao=sessao)
+    probabilidades = {
+        tipo: extrair_probabilidade(URLS[tipo], TIME_ALVO, sessao=sessao)
+        for tipo in TIPOS_PROBABILIDADE
+    }
+    tweet = gerar_tweet(classificacao, probabilidades)
+    cache = {"classificacao": dict(classificacao), "probabilidades": dict(probabilidades)}
+    clube = {
+        "nome": TIME_ALVO,
+        "emoji": "",
+        "credenciais": {
+            "consumer_key": "x", "consumer_secret": "x",
+            "access_token": "x", "access_token_secret": "x"
+        },
+        "cache": os.path.join(diretorio, "last_post_cache.json")
+    }
+
+    return {
+        "fazer_requisicao": lambda: fazer_requisicao(url_classificacao, sessao),
+        "extrair_classificacao_geral": lambda: extrair_classificacao_geral(
+            url_classificacao, TIME_ALVO, sessao=sessao
+        ),
+        "extrair_probabilidade": lambda: extrair_probabilidade(
+            URLS["rebaixamento"], TIME_ALVO, sessao=sessao
+        ),
+        "gerar_tweet": lambda: gerar_tweet(classificacao, probabilidades),
+        "criar_thread": lambda: criar_thread("\n".join([tweet] * 10)),
+        "dados_mudaram": lambda: dados_mudaram(classificacao, probabilidades, cache),
+        "executar_bot": lambda: bot.executar_bot(forcar_post=True, clube=clube),
+    }
+
+
+def medir(funcao: Callable[[], Any], repeticoes: int) -> Dict[str, float]:
+    """
+    Mede um caso
+
+    Returns:
+        Dicionário com media_ms, mediana_ms, p95_ms e pico_kib
+    """
+    for _ in range(AQUECIMENTO):
+        funcao()
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tempos.sort()
+    return {
+        "media_ms": statistics.fmean(tempos),
+        "mediana_ms": statistics.median(tempos),
+        "p95_ms": tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))],
+        "pico_kib": pico / 1024,
+    }
+
+
+def comparar(resultado: Dict[str, float], base: Dict[str, float]) -> list:
+    """Retorna as métricas que pioraram além da tolerância em relação à baseline"""
+    curto = base.get("mediana_ms", CURTO_MS) < CURTO_MS
+    tolerancia = TOLERANCIA_CURTA if curto else TOLERANCIA
+    return [
+        metrica for metrica in ("mediana_ms", "pico_kib")
+        if metrica in base
+        and resultado[metrica] > base[metrica] * (1 + tolerancia)
+        and resultado[metrica] - base[metrica] > RUIDO[metrica]
+    ]
+
+
+def main() -> int:
+    salvar = "--salvar-baseline" in sys.argv
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    repeticoes = int(argumentos[0]) if argumentos else 30
+
+    baseline = {}
+    if ARQUIVO_BASELINE.exists() and not salvar:
+        baseline = json.loads(ARQUIVO_BASELINE.read_text(encoding="utf-8"))
+
+    sessao = SessaoFalsa(carregar_fixtures())
+    resultados = {}
+    regressoes = []
+
+    cliente_falso = MagicMock()
+    cliente_falso.return_value.create_tweet.return_value.data = {"id": "1"}
+
+    print(
+        f"{'caso':<28} {'média (ms)':>11} {'mediana (ms)':>13} {'p95 (ms)':>10} "
+        f"{'pico (KiB)':>11} {'vs base':>9}"
+    )
+    with tempfile.TemporaryDirectory() as diretorio, \
+            patch.object(scraper, "sessao_padrao", lambda: sessao), \
+            patch("tweepy.Client", cliente_falso):
+        for nome, funcao in montar_casos(sessao, diretorio).items():
+            resultado = medir(funcao, repeticoes)
+            resultados[nome] = resultado
+
+            base = baseline.get(nome)
+            relacao = f"{resultado['mediana_ms'] / base['mediana_ms']:.2f}x" if base and "mediana_ms" in base else "-"
+            pioras = comparar(resultado, base) if base else []
+            if pioras:
+                regressoes.append(f"{nome} ({', '.join(pioras)})")
+                relacao += " !"
+
+            print(
+                f"{nome:<28} {resultado['media_ms']:>11.3f} {resultado['mediana_ms']:>13.3f} {resultado['p95_ms']:>10.3f} "
+                f"{resultado['pico_kib']:>11.1f} {relacao:>9}"
+            )
+
+    if salvar:
+        ARQUIVO_BASELINE.write_text(
+            json.dumps(resultados, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"Baseline gravada em {ARQUIVO_BASELINE}")
+        return 0
+
+    if regressoes:
+        print(
+            f"Regressões acima de {TOLERANCIA:.0%} ({TOLERANCIA_CURTA:.0%} abaixo de "
+            f"{CURTO_MS:g} ms): {'; '.join(regressoes)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Fixtures HTML das páginas do UFMG e sessão HTTP falsa para benchmarks offline
+
+As páginas gravadas ficam em benchmarks/fixtures/<chave>.html. Quando uma
+fixture não foi gravada, usa a página de exemplo de pagina_exemplo.py.
+
+Para gravar as páginas reais: python benchmarks/fixtures.py --gravar
+"""
+import os
+import sys
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.pagina_exemplo import gerar_pagina
+from config.settings import URLS
+
+DIRETORIO_FIXTURES = Path(__file__).parent / "fixtures"
+
+TIPOS = {
+    chave: "classificacao" if chave == "classificacao_geral" else "probabilidade"
+    for chave in URLS
+}
+
+
+def carregar_fixtures() -> Dict[str, str]:
+    """
+    Carrega o HTML de cada página do UFMG
+
+    Returns:
+        Dicionário {url: html}
+    """
+    paginas = {}
+    for semente, (chave, url) in enumerate(URLS.items()):
+        arquivo = DIRETORIO_FIXTURES / f"{chave}.html"
+        if arquivo.exists():
+            paginas[url] = arquivo.read_text(encoding="utf-8")
+        else:
+            paginas[url] = gerar_pagina(TIPOS[chave], semente)
+    return paginas
+
+
+def gravar_fixtures() -> None:
+    """Baixa as páginas reais do UFMG e grava em benchmarks/fixtures/"""
+    from src.scraper import baixar_pagina
+
+    DIRETORIO_FIXTURES.mkdir(parents=True, exist_ok=True)
+    for chave, url in URLS.items():
+        html = baixar_pagina(url).text
+        (DIRETORIO_FIXTURES / f"{chave}.html").write_text(html, encoding="utf-8")
+        print(f"{chave}: {len(html)} caracteres gravados")
+
+
+class RespostaFalsa:
+    """Resposta HTTP 200 com o HTML de uma fixture (interface usada por scraper)"""
+
+    status_code = 200
+    encoding = "utf-8"
+
+    def __init__(self, url: str, html: str):
+        self.url = url
+        self.text = html
+        self.headers: Dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int):
+        corpo = self.text.encode("utf-8")
+        for i in range(0, len(corpo), chunk_size):
+            yield corpo[i:i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+class SessaoFalsa:
+    """Sessão que responde cada URL com a sua fixture, sem acessar a rede"""
+
+    def __init__(self, paginas: Dict[str, str]):
+        self.paginas = paginas
+        self.requisicoes = 0
+
+    def get(self, url: str, **kwargs) -> RespostaFalsa:
+        self.requisicoes += 1
+        return RespostaFalsa(url, self.paginas[url])
+
+
+if __name__ == "__main__":
+    if "--gravar" in sys.argv:
+        gravar_fixtures()
+    else:
+        print(__doc__)
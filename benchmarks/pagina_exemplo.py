@@ -0,0 +1,65 @@
+"""
+Gera páginas HTML no formato das páginas do UFMG para benchmarks
+"""
+import random
+from typing import List
+
+CLUBES: List[str] = [
+    "Flamengo", "Palmeiras", "Cruzeiro", "Mirassol", "Fluminense",
+    "Botafogo", "Bahia", "São Paulo", "Grêmio", "Bragantino",
+    "Atlético-MG", "Santos", "Corinthians", "Vasco", "Vitória",
+    "Internacional", "Ceará", "Fortaleza", "Juventude", "Sport",
+]
+
+# Conteúdo fora da tabela (menu, textos, rodapé) para o tamanho ficar próximo do real
+_ENCHIMENTO = "".join(
+    f'<div class="menu-item"><a href="/futebol/pagina-{i}/">Link {i}</a>'
+    f"<p>Texto explicativo sobre a metodologia número {i}.</p></div>\n"
+    for i in range(400)
+)
+
+
+def gerar_pagina(tipo: str, semente: int = 0) -> str:
+    """
+    Gera uma página de exemplo
+
+    Args:
+        tipo: "classificacao" ou "probabilidade"
+        semente: Semente para os números gerados
+
+    Returns:
+        HTML completo da página
+    """
+    aleatorio = random.Random(semente)
+
+    if tipo == "classificacao":
+        cabecalho = ["Pos", "Time", "PG", "J", "V", "E", "D", "GP", "GC", "SG", "%"]
+    else:
+        cabecalho = ["Pos", "Time", "Probabilidade (%)"]
+
+    linhas = []
+    for posicao, clube in enumerate(CLUBES, 1):
+        if tipo == "classificacao":
+            v, e, d = aleatorio.randint(5, 25), aleatorio.randint(3, 12), aleatorio.randint(3, 20)
+            gp, gc = aleatorio.randint(20, 70), aleatorio.randint(20, 70)
+            jogos = v + e + d
+            pontos = 3 * v + e
+            valores = [
+                str(posicao), clube, str(pontos), str(jogos), str(v), str(e), str(d),
+                str(gp), str(gc), str(gp - gc), f"{100 * pontos / (3 * jogos):.1f}",
+            ]
+        else:
+            valores = [str(posicao), clube, f"{aleatorio.uniform(0, 100):.4f}"]
+        celulas = "".join(f'<td class="c{i}">{v}</td>' for i, v in enumerate(valores))
+        linhas.append(f"<tr>{celulas}</tr>")
+
+    ths = "".join(f"<th>{c}</th>" for c in cabecalho)
+    return (
+        "<!DOCTYPE html><html><head><title>UFMG - Futebol</title></head><body>\n"
+        f"{_ENCHIMENTO}\n"
+        f'<table class="tabela"><thead><tr>{ths}</tr></thead><tbody>\n'
+        + "\n".join(linhas)
+        + "\n</tbody></table>\n"
+        f"{_ENCHIMENTO}\n"
+        "</body></html>"
+    )
@@ -2,7 +2,7 @@
 Configurações centralizadas do bot
 """
 import os
-from typing import Dict
+from typing import Dict, Tuple
 from pathlib import Path
 
 # Carrega variáveis de ambiente do arquivo .env
@@ -16,18 +16,91 @@ except ImportError:
     # (variáveis podem vir do sistema operacional)
     pass
 
-# URLs de dados do UFMG
-URLS: Dict[str, str] = {
-    "classificacao_geral": "https://www.mat.ufmg.br/futebol/classificacao-geral_seriea/",
-    "rebaixamento": "https://www.mat.ufmg.br/futebol/rebaixamento_seriea/",
-    "sulamericana": "https://www.mat.ufmg.br/futebol/classificacao-para-sulamericana_seriea/",
-    "libertadores": "https://www.mat.ufmg.br/futebol/classificacao-para-libertadores_seriea/"
+# Competições com páginas no UFMG: nome exibido, URL de cada página e posições
+# (inicial, final) de cada objetivo na simulação local
+COMPETICOES: Dict[str, Dict] = {
+    "serie_a": {
+        "nome": "Serie A",
+        "paginas": {
+            "classificacao_geral": "https://www.mat.ufmg.br/futebol/classificacao-geral_seriea/",
+            "rebaixamento": "https://www.mat.ufmg.br/futebol/rebaixamento_seriea/",
+            "sulamericana": "https://www.mat.ufmg.br/futebol/classificacao-para-sulamericana_seriea/",
+            "libertadores": "https://www.mat.ufmg.br/futebol/classificacao-para-libertadores_seriea/"
+        },
+        "zonas": {
+            "rebaixamento": (17, 20),
+            "sulamericana": (7, 12),
+            "libertadores": (1, 6),
+        },
+    },
+    "serie_b": {
+        "nome": "Serie B",
+        "paginas": {
+            "classificacao_geral": "https://www.mat.ufmg.br/futebol/classificacao-geral_serieb/",
+            "rebaixamento": "https://www.mat.ufmg.br/futebol/rebaixamento_serieb/"
+        },
+        "zonas": {
+            "rebaixamento": (17, 20),
+        },
+    },
 }
+COMPETICAO_PADRAO = "serie_a"  # Competição do TIME_ALVO e dos clubes sem "competicao"
+
+# URLs de dados do UFMG da competição padrão (o mesmo dicionário do registro)
+URLS: Dict[str, str] = COMPETICOES[COMPETICAO_PADRAO]["paginas"]
 
 # Configurações do time
 TIME_ALVO = "VITORIA"
 EMOJI_TIME = "🔴⚫"
 
+# Arquivo com a configuração de vários clubes (modo --multi)
+# Cada clube tem nome, emoji, prefixo das variáveis de credenciais e caminho do cache
+CLUBES_FILE = os.getenv("CLUBES_FILE", str(Path(__file__).parent / "clubes.json"))
+
+# Histórico de todas as coletas em SQLite (vazio desativa)
+HISTORICO_DB = os.getenv("HISTORICO_DB", "historico.sqlite3")
+
+# Fila persistente de posts (outbox) em SQLite (vazio = fila só em memória)
+OUTBOX_DB = os.getenv("OUTBOX_DB", "outbox.sqlite3")
+OUTBOX_TENTATIVAS = 3  # Tentativas de cada tweet por execução antes de deixá-lo na fila
+OUTBOX_BACKOFF_BASE = 2  # Espera inicial (segundos) após erro transitório da API
+OUTBOX_BACKOFF_MAX = 60  # Espera máxima (segundos) entre tentativas
+OUTBOX_ESPERA_MAX = 60  # Esperas maiores (ex: reset do rate limit) ficam para a próxima execução
+
+# Canais de publicação, separados por vírgula: twitter, arquivo, webhook, mastodon, telegram
+PUBLICADORES = [p.strip() for p in os.getenv("PUBLICADORES", "twitter").split(",") if p.strip()]
+PUBLICADOR_ARQUIVO = os.getenv("PUBLICADOR_ARQUIVO", "posts.jsonl")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+MASTODON_URL = os.getenv("MASTODON_URL")  # Ex: https://mastodon.social
+MASTODON_TOKEN = os.getenv("MASTODON_TOKEN")
+TELEGRAM_URL = os.getenv("TELEGRAM_URL", "https://api.telegram.org")
+TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+DESPACHO_MAX_CONCORRENCIA = 4  # Canais publicando ao mesmo tempo
+DESPACHO_TIMEOUT = 30  # Segundos do despacho a todos os canais; o que passar disso fica na outbox
+
+# Simulação local do campeonato (requer numpy): "fallback" preenche as páginas de
+# probabilidade que faltarem, "conferir" também compara com o UFMG, "desligado"
+SIMULACAO = os.getenv("SIMULACAO", "fallback")
+SIMULACAO_TEMPORADAS = int(os.getenv("SIMULACAO_TEMPORADAS", "100000"))  # Temporadas simuladas
+SIMULACAO_LOTE = 20000  # Temporadas por lote (limita a memória das matrizes)
+SIMULACAO_SEMENTE = 2025  # Semente fixa: mesma classificação, mesmas probabilidades
+SIMULACAO_RODADAS = 38  # Jogos de cada clube na temporada
+SIMULACAO_EMPATE = 0.26  # Probabilidade de empate em cada jogo
+SIMULACAO_MANDO = 1.25  # Multiplicador da força do mandante
+SIMULACAO_REGRESSAO = 5  # Jogos "médios" somados a cada clube ao estimar sua força
+SIMULACAO_DIVERGENCIA = 15.0  # Diferença (pontos percentuais) para o UFMG registrada no modo conferir
+# Zonas da competição padrão (o mesmo dicionário do registro)
+SIMULACAO_ZONAS: Dict[str, Tuple[int, int]] = COMPETICOES[COMPETICAO_PADRAO]["zonas"]
+# Jogos restantes (JSON com pares [mandante, visitante]); sem ele, cada clube
+# joga o que falta contra um adversário de força média
+PARTIDAS_FILE = os.getenv("PARTIDAS_FILE", "")
+
+# Cenários "e se": resultados fixos em alguns jogos e nova simulação de cada combinação
+CENARIOS_PROCESSOS = int(os.getenv("CENARIOS_PROCESSOS", "0"))  # 0 = um processo por CPU
+CENARIOS_TEMPORADAS = int(os.getenv("CENARIOS_TEMPORADAS", "20000"))  # Temporadas por cenário
+CENARIOS_JOGOS = 3  # Jogos-chave combinados (3^n cenários)
+
 # Emojis para as seções
 EMOJIS = {
     "rebaixamento": "⬇🛑",
@@ -35,7 +108,9 @@ EMOJIS = {
     "libertadores": "🏆",
     "classificacao": "📊",
     "calendario": "📅",
-    "gols": "🎯"
+    "gols": "🎯",
+    "variacoes": "📈",
+    "cenarios": "🔮"
 }
 
 # Labels personalizados
@@ -55,9 +130,62 @@ TWITTER_CONFIG = {
 
 # Configurações de requisição
 REQUEST_TIMEOUT = 15
+MAX_WORKERS = 4  # Threads usadas na coleta concorrente
+MAX_CONEXOES_POR_HOST = 4  # Limite de requisições simultâneas ao mesmo host
+HTTP_TAXA_POR_HOST = float(os.getenv("HTTP_TAXA_POR_HOST", "2"))  # Requisições por segundo a cada host (0 = sem limite)
+HTTP_RAJADA_POR_HOST = 4  # Requisições seguidas permitidas antes da taxa valer
+HTTP_TENTATIVAS = 3  # Tentativas por página (1 = sem retentativa)
+HTTP_BACKOFF_BASE = 0.5  # Espera inicial (segundos) entre tentativas, dobrada a cada falha
+HTTP_BACKOFF_MAX = 8  # Espera máxima (segundos) entre tentativas
+HTTP_STATUS_RETENTAVEIS = (429, 500, 502, 503, 504)
+# Prazo de cada execução (segundos), dividido entre as requisições; 0 = sem prazo
+PRAZO_EXECUCAO = float(os.getenv("PRAZO_EXECUCAO", "60"))
+PRAZO_RESERVA = 5  # Segundos finais do prazo guardados para parse e postagem
+# Disjuntor por host: falhas seguidas que o abrem e segundos até a requisição de teste
+DISJUNTOR_FALHAS = 5
+DISJUNTOR_ESPERA = 300
+DISJUNTOR_ARQUIVO = os.getenv("DISJUNTOR_ARQUIVO", ".cache/disjuntor.json")  # Vazio = só em memória
+# Páginas servidas do cache por falha do UFMG: "marcar" posta com aviso no rodapé, "pular" não posta
+DADOS_OBSOLETOS = os.getenv("DADOS_OBSOLETOS", "marcar")
+# Backend de parse das tabelas: "htmlparser" (rápido, só a tabela), "lxml" (opcional) ou "bs4"
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "htmlparser")
+# Lê o corpo em pedaços e fecha a conexão assim que a tabela termina (só com "htmlparser")
+HTTP_STREAMING = os.getenv("HTTP_STREAMING", "1") != "0"
+HTTP_TAMANHO_PEDACO = 8192  # Bytes lidos por pedaço no modo streaming
+USER_AGENT = "VitoriaBot/1.0 (+https://github.com/Guilherme1ss/Bot_Probabilidade_ECV)"
 MAX_TWEET_LENGTH = 280
 
+# Cache HTTP em disco (requisições condicionais com ETag / Last-Modified)
+HTTP_CACHE_ATIVO = os.getenv("HTTP_CACHE", "1") != "0"
+HTTP_CACHE_DIR = ".cache/http"
+HTTP_CACHE_TTL = 7 * 24 * 3600  # Segundos até uma entrada expirar
+HTTP_CACHE_MAX_BYTES = 5 * 1024 * 1024  # Tamanho máximo do cache em disco
+HTTP_CACHE_FRESCOR = 0  # Segundos em que uma entrada é usada sem revalidar
+
+# Modo replay (--source=replay:<dir>): servidor local que imita o UFMG
+REPLAY_PORTA = int(os.getenv("REPLAY_PORTA", "0"))  # 0 = porta livre escolhida pelo sistema
+
+# Modo daemon (--daemon): intervalos de verificação em segundos
+DAEMON_INTERVALO_JOGO = 10 * 60  # Dentro das janelas de jogo
+DAEMON_INTERVALO_NORMAL = 2 * 60 * 60  # Fora das janelas de jogo
+DAEMON_MAX_MEMORIA_MB = 256  # Acima disso o daemon encerra para ser reiniciado
+# Janelas de jogo no horário de Brasília: (dia da semana, hora inicial, hora final)
+# 0 = segunda ... 6 = domingo; as madrugadas cobrem a atualização pós-jogo do UFMG
+DAEMON_JANELAS_JOGO = [
+    (0, 0, 3), (0, 19, 24), (1, 0, 3),
+    (2, 19, 24), (3, 0, 3), (3, 19, 24), (4, 0, 3),
+    (5, 15, 24), (6, 0, 3), (6, 11, 24),
+]
+
+# Métricas de cada execução (vazio desativa o arquivo)
+METRICAS_PROM = os.getenv("METRICAS_PROM", "metricas/vitoria_bot.prom")  # Textfile do Prometheus
+METRICAS_JSON = os.getenv("METRICAS_JSON", "metricas/ultima_execucao.json")  # Resumo da execução
+
 # Configurações de log
 LOG_DIR = "logs"
 LOG_FILE = "vitoria_bot.log"
-LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
\ No newline at end of file
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO")
+LOG_JSON = os.getenv("LOG_JSON", "0") == "1"  # Arquivo de log em JSON lines (um objeto por linha)
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Tamanho do arquivo de log antes da rotação
+LOG_BACKUPS = 5  # Arquivos rotacionados mantidos (vitoria_bot.log.1 ... .5)
\ No newline at end of file
@@ -1,130 +1,927 @@
 import logging
+import os
 import sys
-from typing import Dict, Optional
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
 
-from config.settings import URLS, TIME_ALVO, LOG_DIR, LOG_FILE, LOG_FORMAT
-from src.scraper import extrair_classificacao_geral, extrair_probabilidade
-from src.formatter import gerar_tweet
-from src.twitter_client import TwitterClient
-from src.cache import salvar_dados_cache, carregar_dados_cache, dados_mudaram
+from config.settings import (
+    URLS, COMPETICOES, COMPETICAO_PADRAO, TIME_ALVO, EMOJI_TIME, CLUBES_FILE, MAX_TWEET_LENGTH, SIMULACAO,
+    SIMULACAO_ZONAS, PRAZO_EXECUCAO, DADOS_OBSOLETOS
+)
+from src.scraper import (
+    extrair_classificacao_geral, extrair_probabilidade, coletar_em_paralelo,
+    obter_conteudo, tabela_do_conteudo
+)
+from src.http_cache import cache_http_padrao
+from src.tabela import Tabela, normalizar_texto
+from src.clubes import carregar_clubes
+from src.coleta import planejar, competicao_do_clube
+from src.resiliencia import prazo_execucao
+from src.historico import historico_padrao
+from src.formatter import gerar_thread, gerar_variacoes, gerar_cenarios, peso_tweet
+from src.variacoes import comparar, alterados, maiores_variacoes
+from src.publicadores import obter_publicadores
+from src.outbox import outbox_padrao, chave_idempotencia, PUBLICADO, PENDENTE
+from src.metricas import metricas_atuais, nova_execucao
+from src.logs import configurar_logging as iniciar_logging
+from src.cache import (
+    salvar_dados_cache, carregar_dados_cache, dados_mudaram, paginas_mudaram,
+    trava_cache
+)
 
 
 def configurar_logging() -> None:
-    """Configura o sistema de logging"""
-    import os
-    
-    # Cria diretório de logs se não existir
-    if not os.path.exists(LOG_DIR):
-        os.makedirs(LOG_DIR)
-    
-    # Configura logging com encoding UTF-8 para Windows
-    logging.basicConfig(
-        level=logging.INFO,
-        format=LOG_FORMAT,
-        handlers=[
-            logging.FileHandler(os.path.join(LOG_DIR, LOG_FILE), encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
-    # Fix para encoding no Windows
+    """Configura o sistema de logging (fila + thread de gravação, ver src/logs.py)"""
+    # Fix para encoding no Windows (antes de o console ser ligado ao sys.stdout)
     if sys.platform == 'win32':
         import io
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    
+    iniciar_logging()
+
+
+TIPOS_PROBABILIDADE = ["rebaixamento", "sulamericana", "libertadores"]
 
 
-def coletar_dados() -> tuple[Optional[Dict], Dict[str, Optional[str]]]:
+TIPOS_TABELA = {
+    chave: "classificacao" if chave == "classificacao_geral" else "probabilidade"
+    for competicao in COMPETICOES.values() for chave in competicao["paginas"]
+}
+
+
+def _obter_conteudo_seguro(url: str, sessao=None, pagina: Optional[str] = None) -> Optional[Dict]:
+    """Obtém o conteúdo de uma página retornando None em caso de erro (uma página fora não derruba as outras)"""
+    logger = logging.getLogger(__name__)
+    pagina = pagina or next((chave for chave, endereco in URLS.items() if endereco == url), url)
+    inicio = time.perf_counter()
+    try:
+        conteudo = obter_conteudo(url, sessao=sessao)
+    except Exception as e:
+        logger.error("Erro ao baixar %s: %s", url, e)
+        metricas_atuais().registrar_requisicao(pagina, time.perf_counter() - inicio, "erro", 0)
+        return None
+    metricas_atuais().registrar_requisicao(
+        pagina, time.perf_counter() - inicio, conteudo["origem"], conteudo["bytes"]
+    )
+    return conteudo
+
+
+def baixar_competicoes(
+    competicoes: List[str],
+    concorrente: bool = True,
+    sessao=None
+) -> Dict[str, Dict[str, Optional[Dict]]]:
     """
-    Coleta todos os dados necessários das páginas do UFMG
+    Baixa as páginas de várias competições, cada URL uma única vez, sem parsear as tabelas
+    
+    Args:
+        competicoes: Chaves de COMPETICOES
+        concorrente: Se True, busca todas as páginas em paralelo
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
     
     Returns:
-        Tupla com (classificação geral, dicionário de probabilidades)
+        Dicionário {competição: {chave da página: conteúdo de obter_conteudo ou None}}
     """
     logger = logging.getLogger(__name__)
     logger.info("Iniciando coleta de dados")
+    plano = planejar(competicoes)
+    
+    # Nome da página nas métricas: a chave na competição padrão, "competição:chave" nas outras
+    rotulos = {}
+    for competicao, paginas in plano["paginas"].items():
+        for chave, url in paginas.items():
+            rotulos.setdefault(url, chave if competicao == COMPETICAO_PADRAO else f"{competicao}:{chave}")
+    
+    if concorrente:
+        tarefas = {
+            url: (_obter_conteudo_seguro, url, (sessao, rotulos[url]))
+            for url in plano["urls"]
+        }
+        por_url, latencias = coletar_em_paralelo(tarefas)
+        logger.info("Coleta concorrente: página mais lenta levou %.2fs", max(latencias.values()))
+    else:
+        por_url = {
+            url: _obter_conteudo_seguro(url, sessao, rotulos[url])
+            for url in plano["urls"]
+        }
+    
+    cache_http = cache_http_padrao()
+    if cache_http:
+        logger.info("Cache HTTP: %s", cache_http.resumo())
+    
+    logger.info("Coleta de dados finalizada")
+    return {
+        competicao: {chave: por_url[url] for chave, url in paginas.items()}
+        for competicao, paginas in plano["paginas"].items()
+    }
+
+
+def baixar_conteudos(
+    concorrente: bool = True,
+    sessao=None,
+    competicao: str = COMPETICAO_PADRAO
+) -> Dict[str, Optional[Dict]]:
+    """
+    Baixa cada página do UFMG de uma competição uma única vez, sem parsear as tabelas
+    
+    Args:
+        concorrente: Se True, busca todas as páginas em paralelo
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
+        competicao: Chave de COMPETICOES
+    
+    Returns:
+        Dicionário {chave da página: conteúdo de obter_conteudo ou None}
+    """
+    return baixar_competicoes([competicao], concorrente, sessao)[competicao]
+
+
+def impressoes_digitais(conteudos: Dict[str, Optional[Dict]]) -> Dict[str, Optional[str]]:
+    """Retorna a impressão digital da tabela de cada página baixada"""
+    return {
+        chave: conteudo["impressao"] if conteudo else None
+        for chave, conteudo in conteudos.items()
+    }
+
+
+def dados_obsoletos(conteudos: Dict[str, Optional[Dict]]) -> Optional[datetime]:
+    """Retorna quando foi validada a página mais antiga servida do cache com o UFMG fora do ar (None se nenhuma)"""
+    momentos = [
+        conteudo.get("atualizado_em") or 0
+        for conteudo in conteudos.values()
+        if conteudo and conteudo.get("origem") == "obsoleto"
+    ]
+    return datetime.fromtimestamp(min(momentos)) if momentos else None
+
+
+def probabilidades_simuladas(tabelas: Dict[str, Optional[Tabela]]) -> List[str]:
+    """Retorna os tipos de probabilidade preenchidos pela simulação local, e não pelo UFMG"""
+    return [
+        tipo for tipo in TIPOS_PROBABILIDADE
+        if tabelas.get(tipo) is not None and tabelas[tipo].origem == "simulacao"
+    ]
+
+
+def paginas_faltando(
+    classificacao: Optional[Dict],
+    probabilidades: Dict[str, Optional[str]]
+) -> List[str]:
+    """Retorna os dados de um clube que não puderam ser extraídos (post incompleto)"""
+    faltando = [] if classificacao else ["classificacao_geral"]
+    return faltando + [tipo for tipo, prob in probabilidades.items() if prob is None]
+
+
+def parsear_conteudos(conteudos: Dict[str, Optional[Dict]]) -> Dict[str, Optional[Tabela]]:
+    """
+    Parseia as tabelas das páginas baixadas por baixar_conteudos
+    
+    Args:
+        conteudos: Conteúdos retornados por baixar_conteudos
+    
+    Returns:
+        Dicionário {chave de URLS: Tabela ou None}
+    """
+    logger = logging.getLogger(__name__)
+    tabelas = {}
+    
+    for chave, conteudo in conteudos.items():
+        tabelas[chave] = None
+        if conteudo is None:
+            continue
+        try:
+            tabelas[chave] = tabela_do_conteudo(conteudo, TIPOS_TABELA[chave])
+        except Exception as e:
+            logger.error("Erro ao parsear tabela de %s: %s", chave, e)
+    
+    return tabelas
+
+
+def completar_probabilidades(
+    tabelas: Dict[str, Optional[Tabela]],
+    competicao: str = COMPETICAO_PADRAO
+) -> Dict[str, Optional[Tabela]]:
+    """
+    Preenche com a simulação local as páginas de probabilidade que faltaram
+    
+    No modo SIMULACAO="conferir" a simulação roda sempre e as diferenças
+    grandes para o UFMG são registradas no log. As tabelas simuladas têm
+    origem "simulacao": o post avisa no rodapé e o histórico não as grava
+    como dados do UFMG.
+    
+    A simulação usa as zonas da competição (COMPETICOES) e só recebe os
+    jogos de PARTIDAS_FILE na competição padrão, a do arquivo.
+    
+    Args:
+        tabelas: Tabelas retornadas por parsear_conteudos (alteradas no lugar)
+        competicao: Chave de COMPETICOES das tabelas
+    
+    Returns:
+        As mesmas tabelas, completadas quando possível
+    """
+    logger = logging.getLogger(__name__)
+    # Só os tipos com página na competição das tabelas (a Série B não tem Sula nem Libertadores)
+    faltando = [tipo for tipo in TIPOS_PROBABILIDADE if tipo in tabelas and tabelas[tipo] is None]
+    classificacao = tabelas.get("classificacao_geral")
+    if SIMULACAO not in ("fallback", "conferir") or classificacao is None:
+        return tabelas
+    if not faltando and SIMULACAO != "conferir":
+        return tabelas
+    
+    from src.simulacao import simular, tabelas_simuladas, divergencias, carregar_partidas
+    try:
+        with metricas_atuais().etapa("simulacao"):
+            partidas = carregar_partidas() if competicao == COMPETICAO_PADRAO else None
+            resultado = simular(classificacao, partidas, zonas=COMPETICOES[competicao]["zonas"])
+    except ImportError:
+        logger.warning("numpy não instalado - simulação local indisponível")
+        return tabelas
+    except Exception as e:
+        logger.error("Erro na simulação local: %s", e)
+        return tabelas
+    
+    for time_, objetivo, ufmg, simulado in divergencias(tabelas, resultado):
+        logger.warning("%s: %s %.2f%% no UFMG e %.2f%% na simulação", time_, objetivo, ufmg, simulado)
     
-    # Classificação geral
-    classificacao = extrair_classificacao_geral(
-        URLS["classificacao_geral"], 
-        TIME_ALVO
+    simuladas = tabelas_simuladas(resultado, classificacao)
+    for tipo in faltando:
+        logger.warning("Probabilidades de %s indisponíveis no UFMG - usando a simulação local", tipo)
+        tabelas[tipo] = simuladas[tipo]
+    return tabelas
+
+
+def coletar_tabelas(concorrente: bool = True, sessao=None) -> Dict[str, Optional[Tabela]]:
+    """
+    Baixa e parseia cada página do UFMG uma única vez, com todos os clubes
+    
+    Args:
+        concorrente: Se True, busca todas as páginas em paralelo
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
+    
+    Returns:
+        Dicionário {chave de URLS: Tabela ou None}
+    """
+    return completar_probabilidades(parsear_conteudos(baixar_conteudos(concorrente, sessao)))
+
+
+def registrar_coleta_historico(
+    tabelas: Dict[str, Optional[Tabela]],
+    impressoes: Dict[str, Optional[str]],
+    competicao: str = COMPETICAO_PADRAO
+) -> Optional[int]:
+    """Grava a coleta no histórico, sem interromper o bot em caso de erro"""
+    logger = logging.getLogger(__name__)
+    try:
+        historico = historico_padrao()
+        return historico.registrar_coleta(tabelas, impressoes, competicao=competicao) if historico else None
+    except Exception as e:
+        logger.error("Erro ao gravar coleta no histórico: %s", e)
+        return None
+
+
+def carregar_ultimo_post(clube: Dict) -> Optional[Dict]:
+    """
+    Carrega o último post de um clube do cache, ou do histórico se o cache faltar
+    
+    Args:
+        clube: Configuração do clube
+    
+    Returns:
+        Dados do último post ou None
+    """
+    logger = logging.getLogger(__name__)
+    cache = carregar_dados_cache(clube["cache"])
+    if cache is not None:
+        return cache
+    
+    try:
+        historico = historico_padrao()
+        cache = historico.ultimo_post(clube["nome"]) if historico else None
+    except Exception as e:
+        logger.error("Erro ao ler último post do histórico: %s", e)
+        return None
+    
+    if cache is not None:
+        logger.info("Último post recuperado do histórico")
+    return cache
+
+
+def registrar_post_historico(
+    clube: Dict,
+    classificacao: Optional[Dict],
+    probabilidades: Dict[str, Optional[str]],
+    impressoes: Optional[Dict[str, Optional[str]]],
+    coleta_id: Optional[int],
+    simulados: Optional[List[str]] = None
+) -> None:
+    """Grava o snapshot postado no histórico, sem interromper o bot em caso de erro"""
+    logger = logging.getLogger(__name__)
+    try:
+        historico = historico_padrao()
+        if historico:
+            dados = {
+                "classificacao": classificacao,
+                "probabilidades": probabilidades,
+                "impressoes": impressoes
+            }
+            if simulados:
+                dados["simulados"] = simulados
+            historico.registrar_post(clube["nome"], dados, coleta_id)
+    except Exception as e:
+        logger.error("Erro ao gravar post no histórico: %s", e)
+
+
+def comparar_coleta(coleta_id: Optional[int]) -> tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Compara a coleta gravada com os últimos posts e com a coleta anterior
+    
+    Args:
+        coleta_id: Id da coleta atual no histórico
+    
+    Returns:
+        Tupla com (variações desde o último post de cada clube, variações
+        desde a coleta anterior); None onde não há base (histórico desativado,
+        primeira coleta ou erro)
+    """
+    logger = logging.getLogger(__name__)
+    historico = historico_padrao()
+    if historico is None or coleta_id is None:
+        return None, None
+    
+    try:
+        atual = historico.snapshot(coleta_id)
+        desde_post = comparar(atual, historico.snapshots_postados())
+        anterior = historico.coleta_anterior(coleta_id)
+        desde_anterior = comparar(atual, historico.snapshot(anterior)) if anterior else None
+    except Exception as e:
+        logger.error("Erro ao comparar a coleta com o histórico: %s", e)
+        return None, None
+    return desde_post, desde_anterior
+
+
+def mostrar_variacoes(variacoes: Optional[Dict], modo_teste: bool) -> None:
+    """Registra (e, no modo teste, exibe) os clubes que mais se moveram na rodada"""
+    logger = logging.getLogger(__name__)
+    destaques = maiores_variacoes(variacoes) if variacoes else []
+    if not destaques:
+        return
+    
+    logger.info(
+        "Maiores variações desde a coleta anterior: %s",
+        ', '.join(f"{v['time']} ({v['maior_variacao']:.2f} p.p.)" for v in destaques)
     )
+    if modo_teste:
+        for indice, tweet in enumerate(gerar_variacoes(destaques), 1):
+            print("\n" + "="*60)
+            print(f"PREVIEW DAS VARIAÇÕES {indice}:")
+            print("="*60)
+            print(tweet)
+            print("="*60)
+
+
+def mostrar_cenarios(objetivo: str = "rebaixamento") -> bool:
+    """
+    Simula os cenários dos jogos-chave do TIME_ALVO e exibe o post do "o que precisa"
+    
+    Requer numpy e a tabela de jogos restantes (PARTIDAS_FILE). O post é
+    só exibido, não publicado.
+    
+    Args:
+        objetivo: Chave das zonas da competição padrão (SIMULACAO_ZONAS)
+    
+    Returns:
+        True se os cenários foram simulados
+    """
+    logger = logging.getLogger(__name__)
+    from src.simulacao import carregar_partidas
+    from src.cenarios import combinacoes, jogos_chave, simular_cenarios, o_que_precisa
+    
+    if objetivo not in SIMULACAO_ZONAS:
+        logger.error("Objetivo %r inválido - use um de: %s", objetivo, ", ".join(SIMULACAO_ZONAS))
+        return False
+    
+    partidas = carregar_partidas()
+    if not partidas:
+        logger.error("Cenários exigem a tabela de jogos restantes (PARTIDAS_FILE)")
+        return False
+    
+    classificacao = coletar_tabelas().get("classificacao_geral")
+    if classificacao is None:
+        logger.error("Classificação indisponível - cenários não simulados")
+        return False
+    
+    time_ = normalizar_texto(TIME_ALVO)
+    jogos = jogos_chave(classificacao, partidas, time_)
+    try:
+        with metricas_atuais().etapa("cenarios"):
+            resultados = simular_cenarios(classificacao, combinacoes(jogos), partidas)
+    except ImportError:
+        logger.error("numpy não instalado - cenários indisponíveis")
+        return False
+    
+    for indice, tweet in enumerate(gerar_cenarios(o_que_precisa(resultados, time_, objetivo)), 1):
+        print("\n" + "="*60)
+        print(f"PREVIEW DOS CENÁRIOS {indice} ({peso_tweet(tweet)}/{MAX_TWEET_LENGTH}):")
+        print("="*60)
+        print(tweet)
+        print("="*60)
+    return True
+
+
+def registrar_paginas_inalteradas(cache: Optional[Dict], inicio: float) -> None:
+    """Registra no log a decisão de encerrar antes do parse e o tempo economizado"""
+    logger = logging.getLogger(__name__)
+    logger.info("=" * 60)
+    logger.info("⏭️  TABELAS NÃO MUDARAM - parse e formatação evitados")
+    logger.info("=" * 60)
+    logger.info("As impressões digitais de todas as páginas são iguais às do último post.")
+    
+    economia = (cache or {}).get("tempo_processamento")
+    if economia is not None:
+        logger.info("Tempo economizado (estimado pelo último post): %.3fs", economia)
+    logger.info("Execução encerrada em %.2fs", time.perf_counter() - inicio)
+
+
+def atualizar_impressoes_cache(clube: Dict, cache: Optional[Dict], impressoes: Optional[Dict[str, Optional[str]]]) -> None:
+    """
+    Grava no cache as impressões digitais novas de um post que não mudou
+    
+    As páginas mudaram (ex: outro jogo da rodada) mas os dados do clube não:
+    sem isso a próxima execução repete o parse das mesmas páginas.
+    
+    Args:
+        clube: Configuração do clube
+        cache: Dados do último post
+        impressoes: Impressões digitais das páginas desta coleta
+    """
+    if not cache or not impressoes or cache.get("impressoes") == impressoes:
+        return
+    salvar_dados_cache(
+        cache["classificacao"], cache["probabilidades"], clube["cache"],
+        impressoes, cache.get("tempo_processamento"), cache.get("simulados")
+    )
+    logging.getLogger(__name__).info("Impressões digitais do cache atualizadas")
+
+
+def concluir_post(clube: Dict, post: Dict) -> None:
+    """Grava cache e histórico de um post publicado pela outbox"""
+    logger = logging.getLogger(__name__)
+    dados = post["dados"]
+    with metricas_atuais().etapa("cache"):
+        salvar_dados_cache(
+            dados["classificacao"], dados["probabilidades"], clube["cache"],
+            dados["impressoes"], dados["tempo_processamento"], dados.get("simulados")
+        )
+    registrar_post_historico(
+        clube, dados["classificacao"], dados["probabilidades"],
+        dados["impressoes"], dados["coleta_id"], dados.get("simulados")
+    )
+    logger.info("Cache atualizado com sucesso")
+
+
+def enviar_pendentes(clube: Dict, cliente=None) -> Dict[str, str]:
+    """
+    Envia os posts do clube que estão na outbox
+    
+    Args:
+        clube: Configuração do clube
+        cliente: Único canal de postagem (padrão: canais de PUBLICADORES, com o
+            Twitter usando as credenciais do clube)
+    
+    Returns:
+        Dicionário {chave: estado final} dos posts processados
+    """
+    return outbox_padrao().drenar(
+        clube["nome"],
+        lambda: [cliente] if cliente else obter_publicadores(clube["credenciais"]),
+        lambda post: concluir_post(clube, post)
+    )
+
+
+def dados_do_time(
+    tabelas: Dict[str, Optional[Tabela]],
+    time: str
+) -> tuple[Optional[Dict], Dict[str, Optional[str]]]:
+    """
+    Extrai os dados de um time a partir das tabelas já carregadas
+    
+    Args:
+        tabelas: Tabelas retornadas por coletar_tabelas
+        time: Nome do time normalizado (ex: "VITORIA")
+    
+    Returns:
+        Tupla com (classificação geral, dicionário de probabilidades)
+    """
+    classificacao = None
+    if tabelas.get("classificacao_geral") is not None:
+        classificacao = extrair_classificacao_geral(
+            URLS["classificacao_geral"],
+            time,
+            tabela=tabelas["classificacao_geral"]
+        )
     
-    # Probabilidades
     probabilidades = {}
-    for tipo in ["rebaixamento", "sulamericana", "libertadores"]:
-        prob = extrair_probabilidade(URLS[tipo], TIME_ALVO)
+    for tipo in TIPOS_PROBABILIDADE:
+        if tipo not in tabelas:
+            continue  # Sem página na competição
+        prob = None
+        if tabelas.get(tipo) is not None:
+            prob = extrair_probabilidade(URLS[tipo], time, tabela=tabelas[tipo])
         probabilidades[tipo] = prob
     
-    logger.info("Coleta de dados finalizada")
     return classificacao, probabilidades
 
 
-def executar_bot(modo_teste: bool = False, forcar_post: bool = False) -> bool:
+def coletar_dados(concorrente: bool = True) -> tuple[Optional[Dict], Dict[str, Optional[str]]]:
+    """
+    Coleta todos os dados necessários das páginas do UFMG
+    
+    Args:
+        concorrente: Se True, busca todas as páginas em paralelo
+    
+    Returns:
+        Tupla com (classificação geral, dicionário de probabilidades)
+    """
+    return dados_do_time(coletar_tabelas(concorrente), TIME_ALVO)
+
+
+def clube_padrao() -> Dict:
+    """Retorna a configuração do clube único definido em config/settings.py"""
+    return {
+        "nome": TIME_ALVO,
+        "emoji": EMOJI_TIME,
+        "competicao": COMPETICAO_PADRAO,
+        "credenciais": None,
+        "cache": None
+    }
+
+
+def executar_bot(
+    modo_teste: bool = False,
+    forcar_post: bool = False,
+    clube: Optional[Dict] = None,
+    tabelas: Optional[Dict[str, Optional[Tabela]]] = None,
+    impressoes: Optional[Dict[str, Optional[str]]] = None,
+    coleta_id: Optional[int] = None,
+    cliente=None,
+    obsoleto: Optional[datetime] = None
+) -> bool:
     """
     Executa o fluxo completo do bot
     
+    A coleta feita aqui respeita o prazo PRAZO_EXECUCAO, contado depois do
+    envio dos posts que estavam na fila. Post com dados
+    faltando nunca é publicado; com páginas servidas do cache (UFMG fora do
+    ar), DADOS_OBSOLETOS decide entre postar com aviso no rodapé ou pular.
+    
     Args:
         modo_teste: Se True, apenas exibe o tweet sem postar
         forcar_post: Se True, posta mesmo se os dados não mudaram
+        clube: Configuração do clube (padrão: TIME_ALVO de config/settings.py)
+        tabelas: Tabelas já coletadas (se None, faz a coleta)
+        impressoes: Impressões digitais das páginas das tabelas informadas
+        coleta_id: Id no histórico da coleta das tabelas informadas
+        cliente: Único canal de postagem (padrão: canais de PUBLICADORES)
+        obsoleto: Validação mais antiga das páginas informadas vindas do cache
+            por falha do UFMG (ver dados_obsoletos)
         
     Returns:
-        True se executado com sucesso, False caso contrário
+        True se executado com sucesso, False caso contrário (inclusive post
+        cancelado por dados faltando ou obsoletos)
     """
     logger = logging.getLogger(__name__)
+    clube = clube or clube_padrao()
+    competicao = competicao_do_clube(clube)
+    metricas = metricas_atuais()
+    
+    inicio = time.perf_counter()
     
     try:
-        # Coleta dados
-        classificacao, probabilidades = coletar_dados()
+        # Trava o cache do clube: execuções simultâneas (cron + manual) esperam a vez
+        with trava_cache(clube["cache"]), ExitStack() as contextos:
+            # Envia posts que ficaram na fila em execuções anteriores (sem nova coleta)
+            if not modo_teste:
+                with metricas.etapa("outbox"):
+                    enviar_pendentes(clube, cliente)
+            
+            # O prazo começa depois da fila, que tem o seu próprio (DESPACHO_TIMEOUT):
+            # posts antigos não consomem o tempo da coleta
+            contextos.enter_context(prazo_execucao((PRAZO_EXECUCAO or None) if tabelas is None else None))
+            
+            # Carrega cache anterior
+            cache = carregar_ultimo_post(clube)
         
-        # Carrega cache anterior
-        cache = carregar_dados_cache()
+            # Coleta dados, encerrando antes do parse se nenhuma tabela mudou
+            if tabelas is None:
+                with metricas.etapa("coleta"):
+                    conteudos = baixar_conteudos(competicao=competicao)
+                impressoes = impressoes_digitais(conteudos)
+                obsoleto = dados_obsoletos(conteudos)
+                with metricas.etapa("deteccao"):
+                    mudou = forcar_post or paginas_mudaram(impressoes, cache)
+                if not mudou:
+                    registrar_coleta_historico({}, impressoes, competicao)
+                    registrar_paginas_inalteradas(cache, inicio)
+                    metricas.registrar_post(clube["nome"], "inalterado")
+                    return True
+                with metricas.etapa("parse"):
+                    tabelas = parsear_conteudos(conteudos)
+                completar_probabilidades(tabelas, competicao)
+                coleta_id = registrar_coleta_historico(tabelas, impressoes, competicao)
         
-        # Verifica se os dados mudaram
-        if not forcar_post and not dados_mudaram(classificacao, probabilidades, cache):
-            logger.info("=" * 60)
-            logger.info("⏭️  DADOS NÃO MUDARAM - Post cancelado")
-            logger.info("=" * 60)
-            logger.info("Os dados são idênticos ao último post.")
-            logger.info("Nenhum tweet será postado para evitar duplicação.")
-            logger.info("Use --force para forçar postagem mesmo assim.")
-            return True  # Não é erro, apenas não há nada para postar
+            inicio_processamento = time.perf_counter()
+            with metricas.etapa("extracao"):
+                classificacao, probabilidades = dados_do_time(tabelas, clube["nome"])
+                simulados = probabilidades_simuladas(tabelas)
         
-        # Gera tweet
-        tweet = gerar_tweet(classificacao, probabilidades)
-        logger.info(f"Tweet gerado:\n{'-'*50}\n{tweet}\n{'-'*50}")
+            # Verifica se os dados mudaram
+            with metricas.etapa("deteccao"):
+                mudou = forcar_post or dados_mudaram(classificacao, probabilidades, cache)
+            if not mudou:
+                atualizar_impressoes_cache(clube, cache, impressoes)
+                metricas.registrar_post(clube["nome"], "inalterado")
+                logger.info("=" * 60)
+                logger.info("⏭️  DADOS NÃO MUDARAM - Post cancelado (%s)", clube['nome'])
+                logger.info("=" * 60)
+                logger.info("Os dados são idênticos ao último post.")
+                logger.info("Nenhum tweet será postado para evitar duplicação.")
+                logger.info("Use --force para forçar postagem mesmo assim.")
+                return True  # Não é erro, apenas não há nada para postar
+            
+            # Nunca posta conteúdo parcial ("Dados indisponíveis" no lugar da tabela)
+            faltando = paginas_faltando(classificacao, probabilidades)
+            if faltando:
+                logger.warning("⏭️  Dados incompletos (%s) - post de %s cancelado", ', '.join(faltando), clube['nome'])
+                metricas.registrar_post(clube["nome"], "incompleto")
+                return False
+            if obsoleto and DADOS_OBSOLETOS == "pular":
+                logger.warning(
+                    "⏭️  UFMG indisponível e dados do cache de %s - post de %s cancelado",
+                    obsoleto.strftime("%d/%m %H:%M"), clube['nome']
+                )
+                metricas.registrar_post(clube["nome"], "obsoleto")
+                return False
         
-        if modo_teste:
-            logger.info("Modo teste ativado - tweet não será postado")
-            print("\n" + "="*60)
-            print("PREVIEW DO TWEET:")
-            print("="*60)
-            print(tweet)
-            print("="*60)
-            print(f"Caracteres: {len(tweet)}/280")
-            print("="*60)
-            return True
+            # Gera tweet (conteúdo que não cabe em um só vira thread, sem cortes)
+            with metricas.etapa("formatacao"):
+                tweets = gerar_thread(
+                    classificacao, probabilidades,
+                    time=clube["nome"], emoji_time=clube["emoji"],
+                    serie=COMPETICOES[competicao]["nome"], obsoleto=obsoleto,
+                    simulados=simulados
+                )
+            tempo_processamento = time.perf_counter() - inicio_processamento
+            for tweet in tweets:
+                logger.info("Tweet gerado:\n%s\n%s\n%s", '-'*50, tweet, '-'*50)
         
-        # Posta no Twitter
-        logger.info("Iniciando postagem no Twitter")
-        cliente = TwitterClient()
-        resultado = cliente.postar_tweet(tweet)
+            if modo_teste:
+                logger.info("Modo teste ativado - tweet não será postado")
+                for indice, tweet in enumerate(tweets, 1):
+                    print("\n" + "="*60)
+                    print("PREVIEW DO TWEET:" if len(tweets) == 1 else f"PREVIEW DO TWEET {indice}/{len(tweets)}:")
+                    print("="*60)
+                    print(tweet)
+                    print("="*60)
+                    print(f"Caracteres: {peso_tweet(tweet)}/{MAX_TWEET_LENGTH}")
+                    print("="*60)
+                metricas.registrar_post(clube["nome"], "teste")
+                return True
         
-        if resultado:
-            logger.info("✅ Bot executado com sucesso!")
-            # Salva dados no cache após postagem bem-sucedida
-            salvar_dados_cache(classificacao, probabilidades)
-            logger.info("Cache atualizado com sucesso")
-            return True
-        else:
-            logger.error("❌ Falha ao postar tweet")
-            return False
+            # Posta pela outbox: o post fica gravado antes do envio a cada canal
+            logger.info("Iniciando postagem")
+            chave = chave_idempotencia(
+                clube["nome"], classificacao, probabilidades,
+                unico=str(time.time()) if forcar_post else None
+            )
+            estado = outbox_padrao().enfileirar(chave, clube["nome"], tweets, {
+                "classificacao": classificacao,
+                "probabilidades": probabilidades,
+                "impressoes": impressoes,
+                "tempo_processamento": tempo_processamento,
+                "coleta_id": coleta_id,
+                "simulados": simulados
+            })
+            if estado == PUBLICADO:
+                logger.info("Post %s já foi publicado - nada a enviar", chave)
+                metricas.registrar_post(clube["nome"], "publicado")
+                return True
+            
+            with metricas.etapa("postagem"):
+                estado = enviar_pendentes(clube, cliente).get(chave)
+            entregas = outbox_padrao().entregas(chave)
+            publicados = [d for d, e in entregas.items() if e["estado"] == PUBLICADO]
+            if estado == PUBLICADO:
+                logger.info("✅ Bot executado com sucesso!")
+                metricas.registrar_post(clube["nome"], "publicado")
+                return True
+            elif publicados:
+                faltando = [d for d, e in entregas.items() if e["estado"] != PUBLICADO]
+                logger.warning(
+                    "✅ Publicado em %s; %s continuam na fila",
+                    ', '.join(publicados), ', '.join(faltando) or 'demais canais'
+                )
+                metricas.registrar_post(clube["nome"], "parcial")
+                return True
+            elif estado == PENDENTE:
+                logger.error("❌ Falha ao postar tweet - post mantido na fila para a próxima execução")
+                metricas.registrar_post(clube["nome"], "pendente")
+                return False
+            else:
+                logger.error("❌ Falha ao postar tweet")
+                metricas.registrar_post(clube["nome"], "falhou")
+                return False
             
     except Exception as e:
-        logger.error(f"Erro durante execução do bot: {e}", exc_info=True)
+        logger.error("Erro durante execução do bot: %s", e, exc_info=True)
+        metricas.registrar_post(clube["nome"], "erro")
         return False
 
 
+def executar_competicao(
+    competicao: str,
+    clubes: List[Dict],
+    conteudos: Dict[str, Optional[Dict]],
+    modo_teste: bool = False,
+    forcar_post: bool = False,
+    cliente=None
+) -> List[str]:
+    """
+    Executa o bot para os clubes de uma competição a partir das páginas já baixadas
+    
+    Args:
+        competicao: Chave de COMPETICOES
+        clubes: Clubes da competição
+        conteudos: Páginas da competição retornadas por baixar_competicoes
+        modo_teste: Se True, apenas exibe os tweets sem postar
+        forcar_post: Se True, posta mesmo se os dados não mudaram
+        cliente: Cliente de postagem usado por todos os clubes (padrão: um por clube)
+        
+    Returns:
+        Nomes dos clubes que falharam
+    """
+    logger = logging.getLogger(__name__)
+    metricas = metricas_atuais()
+    inicio = time.perf_counter()
+    impressoes = impressoes_digitais(conteudos)
+    obsoleto = dados_obsoletos(conteudos)
+    
+    if not forcar_post:
+        caches = [carregar_ultimo_post(clube) for clube in clubes]
+        with metricas.etapa("deteccao"):
+            mudou = any(paginas_mudaram(impressoes, cache) for cache in caches)
+        if not mudou:
+            registrar_coleta_historico({}, impressoes, competicao)
+            registrar_paginas_inalteradas(caches[0] if caches else None, inicio)
+            for clube in clubes:
+                metricas.registrar_post(clube["nome"], "inalterado")
+            return []
+    
+    with metricas.etapa("parse"):
+        tabelas = parsear_conteudos(conteudos)
+    completar_probabilidades(tabelas, competicao)
+    coleta_id = registrar_coleta_historico(tabelas, impressoes, competicao)
+    with metricas.etapa("deteccao"):
+        desde_post, desde_anterior = comparar_coleta(coleta_id)
+    mostrar_variacoes(desde_anterior, modo_teste)
+    
+    # Só os clubes cujos dados mudaram desde o último post são renderizados e postados
+    atualizar = set(alterados(desde_post)) if desde_post is not None and not forcar_post else None
+    falhas = []
+    
+    for clube in clubes:
+        nome = normalizar_texto(clube["nome"])
+        if atualizar is not None and nome in desde_post and nome not in atualizar:
+            logger.info("⏭️  %s sem mudanças desde o último post", clube['nome'])
+            atualizar_impressoes_cache(clube, carregar_ultimo_post(clube), impressoes)
+            metricas.registrar_post(clube["nome"], "inalterado")
+            continue
+        logger.info("Processando clube %s", clube['nome'])
+        if not executar_bot(
+            modo_teste, forcar_post, clube=clube, tabelas=tabelas,
+            impressoes=impressoes, coleta_id=coleta_id, cliente=cliente, obsoleto=obsoleto
+        ):
+            falhas.append(clube["nome"])
+    
+    return falhas
+
+
+def executar_multiclubes(
+    modo_teste: bool = False,
+    forcar_post: bool = False,
+    caminho: str = CLUBES_FILE,
+    cliente=None
+) -> bool:
+    """
+    Executa o bot para todos os clubes configurados a partir de uma única coleta
+    
+    As páginas de todas as competições dos clubes são baixadas de uma vez,
+    cada URL uma única vez (src/coleta.py), e parseadas uma vez por
+    competição; cada clube usa suas próprias credenciais e seu próprio
+    cache de detecção de mudança. Coleta e posts respeitam o prazo
+    PRAZO_EXECUCAO.
+    
+    Args:
+        modo_teste: Se True, apenas exibe os tweets sem postar
+        forcar_post: Se True, posta mesmo se os dados não mudaram
+        caminho: Arquivo JSON com a lista de clubes
+        cliente: Cliente de postagem usado por todos os clubes (padrão: um por clube)
+        
+    Returns:
+        True se todos os clubes foram executados com sucesso
+    """
+    logger = logging.getLogger(__name__)
+    
+    try:
+        clubes: List[Dict] = carregar_clubes(caminho)
+    except Exception as e:
+        logger.error("Erro ao carregar clubes de %s: %s", caminho, e)
+        return False
+    
+    metricas = metricas_atuais()
+    if not modo_teste:
+        for clube in clubes:
+            with trava_cache(clube["cache"]), metricas.etapa("outbox"):
+                enviar_pendentes(clube, cliente)
+    
+    grupos: Dict[str, List[Dict]] = {}
+    for clube in clubes:
+        grupos.setdefault(competicao_do_clube(clube), []).append(clube)
+    
+    falhas = []
+    with prazo_execucao(PRAZO_EXECUCAO or None):
+        with metricas.etapa("coleta"):
+            conteudos = baixar_competicoes(list(grupos))
+        
+        for competicao, grupo in grupos.items():
+            if len(grupos) > 1:
+                logger.info("Competição %s: %s clubes", COMPETICOES[competicao]["nome"], len(grupo))
+            falhas += executar_competicao(
+                competicao, grupo, conteudos[competicao], modo_teste, forcar_post, cliente
+            )
+    
+    if falhas:
+        logger.error("Falha em %s/%s clubes: %s", len(falhas), len(clubes), ', '.join(falhas))
+        return False
+    
+    logger.info("%s clubes processados com sucesso", len(clubes))
+    return True
+
+
+def iniciar_modo_replay(diretorio: str):
+    """
+    Aponta o bot para o servidor local com os snapshots de um diretório
+    
+    O estado da execução (cache do último post, histórico e cache HTTP) fica
+    em <dir>/estado, e os posts vão para <dir>/estado/posts.jsonl em vez do
+    Twitter, então o modo replay nunca toca o estado de produção.
+    
+    Args:
+        diretorio: Diretório com os snapshots (src/replay.py: arquivo_snapshot)
+    
+    Returns:
+        Cliente de postagem do modo replay
+    """
+    from src.replay import iniciar_replay, ClienteReplay
+    
+    logger = logging.getLogger(__name__)
+    diretorio = os.path.abspath(diretorio)
+    servidor = iniciar_replay(diretorio)
+    
+    estado = os.path.join(diretorio, "estado")
+    os.makedirs(estado, exist_ok=True)
+    os.chdir(estado)
+    
+    logger.info("Modo REPLAY ativado - páginas de %s, estado em %s", servidor.url_base, estado)
+    return ClienteReplay(estado)
+
+
+def executar_com_metricas(executar: Callable[[], bool]) -> bool:
+    """
+    Executa o bot uma vez e exporta as métricas da execução
+    
+    Args:
+        executar: Função que executa o bot e retorna o sucesso
+    
+    Returns:
+        Resultado de executar (False se ela levantar exceção)
+    """
+    logger = logging.getLogger(__name__)
+    metricas = nova_execucao()
+    sucesso = False
+    try:
+        sucesso = executar()
+        return sucesso
+    finally:
+        metricas.finalizar(sucesso)
+        metricas.exportar()
+        resumo = metricas.resumo()
+        logger.info(
+            "Métricas: %.2fs, %s bytes baixados, páginas %s",
+            resumo['duracao_segundos'], resumo['bytes_baixados'], resumo['paginas_por_origem']
+        )
+
+
 def main():
     """Função principal"""
     configurar_logging()
@@ -137,11 +934,42 @@ def main():
     # Verifica flags
     modo_teste = "--test" in sys.argv or "-t" in sys.argv
     forcar_post = "--force" in sys.argv or "-f" in sys.argv
+    multiclubes = "--multi" in sys.argv or "-m" in sys.argv
+    daemon = "--daemon" in sys.argv or "-d" in sys.argv
+    fonte = next((a.split("=", 1)[1] for a in sys.argv if a.startswith("--source=")), "ufmg")
+    cenarios = next((a.partition("=")[2] or "rebaixamento" for a in sys.argv if a.split("=")[0] == "--cenarios"), None)
     
     if forcar_post:
         logger.info("⚠️  Modo FORÇAR ativado - postará mesmo se dados não mudaram")
     
-    sucesso = executar_bot(modo_teste=modo_teste, forcar_post=forcar_post)
+    caminho_clubes = os.path.abspath(CLUBES_FILE)
+    cliente = None
+    if fonte.startswith("replay:"):
+        cliente = iniciar_modo_replay(fonte[len("replay:"):])
+    elif fonte != "ufmg":
+        logger.error("Fonte desconhecida: %s (use ufmg ou replay:<dir>)", fonte)
+        sys.exit(1)
+    
+    if cenarios:
+        logger.info("Modo CENÁRIOS ativado - objetivo %s", cenarios)
+        executar = lambda: executar_com_metricas(lambda: mostrar_cenarios(cenarios))
+    elif multiclubes:
+        logger.info("Modo MULTICLUBES ativado - clubes de %s", caminho_clubes)
+        executar = lambda: executar_com_metricas(lambda: executar_multiclubes(
+            modo_teste=modo_teste, forcar_post=forcar_post,
+            caminho=caminho_clubes, cliente=cliente
+        ))
+    else:
+        executar = lambda: executar_com_metricas(lambda: executar_bot(
+            modo_teste=modo_teste, forcar_post=forcar_post, cliente=cliente
+        ))
+    
+    if daemon:
+        logger.info("Modo DAEMON ativado - verificação contínua com intervalo adaptativo")
+        from src.daemon import executar_daemon
+        sucesso = executar_daemon(executar)
+    else:
+        sucesso = executar()
     
     if sucesso:
         logger.info("Bot finalizado com sucesso")
@@ -1,50 +1,218 @@
 """
 Módulo para gerenciar cache do último post
 """
+import hashlib
 import json
 import os
+import re
+import sys
+import tempfile
+import time
 import logging
-from typing import Optional, Dict
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator, List
 from pathlib import Path
 
+from src.parsers import trecho_tabela
+
 logger = logging.getLogger(__name__)
 
 CACHE_FILE = "last_post_cache.json"
+TRAVA_TIMEOUT = 300  # Segundos esperando outra execução liberar o cache
+
+
+def _travar(arquivo) -> None:
+    """Tenta obter a trava exclusiva do arquivo sem bloquear (levanta OSError se ocupada)"""
+    if sys.platform == 'win32':
+        import msvcrt
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _destravar(arquivo) -> None:
+    """Libera a trava do arquivo"""
+    if sys.platform == 'win32':
+        import msvcrt
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def trava_cache(caminho: Optional[str] = None, timeout: float = TRAVA_TIMEOUT) -> Iterator[None]:
+    """
+    Trava consultiva sobre o cache, para execuções simultâneas não postarem em dobro
+    
+    Deve envolver toda a sequência carregar → comparar → postar → salvar.
+    A trava é liberada pelo sistema operacional se o processo morrer.
+    
+    Args:
+        caminho: Arquivo de cache (padrão: CACHE_FILE); a trava usa "<caminho>.lock"
+        timeout: Tempo máximo esperando outra execução
+        
+    Raises:
+        TimeoutError: Se a trava não for obtida dentro do timeout
+    """
+    caminho_trava = Path(str(caminho or CACHE_FILE) + ".lock")
+    caminho_trava.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(caminho_trava, 'a+') as f:
+        inicio = time.monotonic()
+        avisou = False
+        while True:
+            try:
+                _travar(f)
+                break
+            except OSError:
+                if time.monotonic() - inicio > timeout:
+                    raise TimeoutError(f"Cache {caminho_trava} travado por outra execução")
+                if not avisou:
+                    logger.info("Outra execução está usando o cache - aguardando")
+                    avisou = True
+                time.sleep(0.2)
+        try:
+            yield
+        finally:
+            _destravar(f)
+
+
+def _checksum(dados: Dict) -> str:
+    """Calcula o checksum (SHA-256) do conteúdo do cache, sem o próprio campo checksum"""
+    conteudo = {chave: valor for chave, valor in dados.items() if chave != "checksum"}
+    serializado = json.dumps(conteudo, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
 
 
-def salvar_dados_cache(classificacao: Dict, probabilidades: Dict[str, str]) -> None:
+def _ler_umask() -> int:
+    """Lê a umask do processo (os.umask só permite ler trocando o valor)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Lida uma vez, no import: trocar a umask depois afetaria arquivos criados ao
+# mesmo tempo por outras threads (cache HTTP, logs, outbox)
+_UMASK = _ler_umask()
+
+
+def _modo_padrao(caminho: Path) -> int:
+    """Permissões do arquivo existente ou, se não existir, as de um open() comum (0666 sem a umask)"""
+    try:
+        return caminho.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def escrever_atomico(caminho: Path, texto: str, modo: Optional[int] = None) -> None:
+    """
+    Grava um arquivo de forma atômica (arquivo temporário + fsync + rename)
+    
+    Um processo interrompido no meio da escrita deixa o arquivo antigo intacto.
+    O temporário do mkstemp nasce com 0600; antes do rename ele recebe as
+    permissões do arquivo substituído (ou as de um arquivo novo), para que
+    o rename não mude quem pode ler o destino.
+    
+    Args:
+        caminho: Arquivo de destino
+        texto: Conteúdo a gravar
+        modo: Permissões do arquivo gravado (padrão: as do arquivo atual)
+    """
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    modo = _modo_padrao(caminho) if modo is None else modo
+    fd, temporario = tempfile.mkstemp(
+        dir=caminho.parent, prefix=f".{caminho.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(texto)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporario, modo)
+        os.replace(temporario, caminho)
+    except BaseException:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+
+
+def calcular_impressao(html: Optional[str]) -> Optional[str]:
+    """
+    Calcula a impressão digital (SHA-256) da tabela de uma página
+    
+    Só o trecho da primeira <table> entra no hash, com espaços normalizados,
+    para que mudanças no restante da página não contem como mudança.
+    
+    Args:
+        html: Conteúdo da página
+        
+    Returns:
+        Hash hexadecimal ou None se não houver tabela
+    """
+    trecho = trecho_tabela(html) if html else None
+    if trecho is None:
+        return None
+    trecho = re.sub(r"\s+", " ", trecho)
+    trecho = re.sub(r"> <", "><", trecho).strip()
+    return hashlib.sha256(trecho.encode("utf-8")).hexdigest()
+
+
+def salvar_dados_cache(
+    classificacao: Dict,
+    probabilidades: Dict[str, str],
+    caminho: Optional[str] = None,
+    impressoes: Optional[Dict[str, Optional[str]]] = None,
+    tempo_processamento: Optional[float] = None,
+    simulados: Optional[List[str]] = None
+) -> None:
     """
     Salva os dados do último post em cache
     
     Args:
         classificacao: Dados da classificação geral
         probabilidades: Dicionário com probabilidades
+        caminho: Arquivo de cache (padrão: CACHE_FILE)
+        impressoes: Impressões digitais das tabelas usadas no post
+        tempo_processamento: Segundos gastos em parse, comparação e formatação
+        simulados: Tipos de probabilidade que vieram da simulação local, e não do UFMG
     """
     try:
         cache_data = {
             "classificacao": classificacao,
             "probabilidades": probabilidades
         }
+        if impressoes:
+            cache_data["impressoes"] = impressoes
+        if tempo_processamento is not None:
+            cache_data["tempo_processamento"] = round(tempo_processamento, 4)
+        if simulados:
+            cache_data["simulados"] = simulados
+        cache_data["checksum"] = _checksum(cache_data)
         
-        cache_path = Path(CACHE_FILE)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        cache_path = Path(caminho or CACHE_FILE)
+        escrever_atomico(cache_path, json.dumps(cache_data, ensure_ascii=False, indent=2))
         
-        logger.info(f"Cache salvo em: {cache_path}")
+        logger.info("Cache salvo em: %s", cache_path)
         
     except Exception as e:
-        logger.error(f"Erro ao salvar cache: {e}")
+        logger.error("Erro ao salvar cache: %s", e)
 
 
-def carregar_dados_cache() -> Optional[Dict]:
+def carregar_dados_cache(caminho: Optional[str] = None) -> Optional[Dict]:
     """
     Carrega os dados do último post do cache
     
+    Args:
+        caminho: Arquivo de cache (padrão: CACHE_FILE)
+    
     Returns:
-        Dicionário com dados do cache ou None se não existir
+        Dicionário com dados do cache ou None se não existir ou estiver corrompido
     """
     try:
-        cache_path = Path(CACHE_FILE)
+        cache_path = Path(caminho or CACHE_FILE)
         
         if not cache_path.exists():
             logger.info("Arquivo de cache não existe ainda")
@@ -53,11 +221,16 @@ def carregar_dados_cache() -> Optional[Dict]:
         with open(cache_path, 'r', encoding='utf-8') as f:
             cache_data = json.load(f)
         
+        # Caches antigos não têm checksum e são aceitos como estão
+        if "checksum" in cache_data and cache_data["checksum"] != _checksum(cache_data):
+            logger.error("Cache corrompido (checksum inválido): %s", cache_path)
+            return None
+        
         logger.info("Cache carregado com sucesso")
         return cache_data
         
     except Exception as e:
-        logger.error(f"Erro ao carregar cache: {e}")
+        logger.error("Erro ao carregar cache: %s", e)
         return None
 
 
@@ -88,35 +261,65 @@ def dados_mudaram(
         # Compara classificação
         if classificacao_nova != classificacao_antiga:
             logger.info("Classificação mudou!")
-            logger.debug(f"Antiga: {classificacao_antiga}")
-            logger.debug(f"Nova: {classificacao_nova}")
+            logger.debug("Antiga: %s", classificacao_antiga)
+            logger.debug("Nova: %s", classificacao_nova)
             return True
         
         # Compara probabilidades
         if probabilidades_novas != probabilidades_antigas:
             logger.info("Probabilidades mudaram!")
-            logger.debug(f"Antigas: {probabilidades_antigas}")
-            logger.debug(f"Novas: {probabilidades_novas}")
+            logger.debug("Antigas: %s", probabilidades_antigas)
+            logger.debug("Novas: %s", probabilidades_novas)
             return True
         
         logger.info("Dados NÃO mudaram - nenhuma alteração detectada")
         return False
         
     except Exception as e:
-        logger.error(f"Erro ao comparar dados: {e}")
+        logger.error("Erro ao comparar dados: %s", e)
         # Em caso de erro, considera como mudado para não perder post
         return True
 
 
-def limpar_cache() -> bool:
+def paginas_mudaram(
+    impressoes_novas: Dict[str, Optional[str]],
+    cache: Optional[Dict]
+) -> bool:
+    """
+    Compara as impressões digitais das páginas com as do último post
+    
+    Permite encerrar a execução antes de qualquer parse quando nenhuma
+    tabela mudou. Páginas sem impressão (erro ou sem tabela) contam como
+    mudança, deixando a decisão para dados_mudaram.
+    
+    Args:
+        impressoes_novas: Impressões calculadas nesta execução
+        cache: Dados do cache anterior
+        
+    Returns:
+        True se alguma página mudou (ou não há como saber), False se todas são iguais
+    """
+    if cache is None or not cache.get("impressoes"):
+        return True
+    
+    if None in impressoes_novas.values():
+        return True
+    
+    return impressoes_novas != cache["impressoes"]
+
+
+def limpar_cache(caminho: Optional[str] = None) -> bool:
     """
     Remove o arquivo de cache
     
+    Args:
+        caminho: Arquivo de cache (padrão: CACHE_FILE)
+    
     Returns:
         True se removido com sucesso, False caso contrário
     """
     try:
-        cache_path = Path(CACHE_FILE)
+        cache_path = Path(caminho or CACHE_FILE)
         
         if cache_path.exists():
             cache_path.unlink()
@@ -127,5 +330,5 @@ def limpar_cache() -> bool:
             return False
             
     except Exception as e:
-        logger.error(f"Erro ao remover cache: {e}")
+        logger.error("Erro ao remover cache: %s", e)
         return False
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Cenários "e se" sobre a simulação do campeonato
+
+Um cenário fixa o resultado de alguns jogos ("V", "E" ou "D", do ponto de
+vista do mandante) e simula de novo o resto da temporada. combinacoes gera
+os 3^n cenários de n jogos-chave; simular_cenarios distribui os cenários
+entre processos e o_que_precisa ordena o resultado do melhor para o pior
+cenário de um clube, a tabela do "o que o time precisa".
+
+A base da simulação (src/simulacao.py: preparar) é enviada uma única vez a
+cada processo, pelo inicializador do pool; cada tarefa leva só o cenário.
+Todos os cenários usam a mesma semente, então a diferença entre eles vem
+dos resultados fixados e não do sorteio.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product, repeat
+from typing import Optional, Dict, List, Tuple, Any
+
+from config.settings import (
+    CENARIOS_PROCESSOS, CENARIOS_TEMPORADAS, CENARIOS_JOGOS, SIMULACAO_SEMENTE,
+    SIMULACAO_EMPATE
+)
+from src.tabela import Tabela
+from src.simulacao import preparar, simular_base, _probabilidades_jogo
+
+logger = logging.getLogger(__name__)
+
+RESULTADOS = ("V", "E", "D")
+# Pontos e vitórias (mandante, visitante) de cada resultado
+PONTOS = {"V": (3, 0), "E": (1, 1), "D": (0, 3)}
+
+# Objetivos em que a probabilidade menor é a melhor
+OBJETIVOS_EVITAR = {"rebaixamento"}
+
+Jogo = Tuple[str, str]
+Cenario = Tuple[Tuple[str, str, str], ...]
+
+# Base da simulação de cada processo do pool (preenchida por _iniciar_processo)
+_base: Optional[Dict[str, Any]] = None
+
+
+def combinacoes(jogos: List[Jogo]) -> List[Cenario]:
+    """
+    Gera todos os cenários de uma lista de jogos
+
+    Args:
+        jogos: Jogos (mandante, visitante) normalizados
+
+    Returns:
+        Os 3^n cenários, cada um com (mandante, visitante, resultado) por jogo
+    """
+    return [
+        tuple((m, v, r) for (m, v), r in zip(jogos, resultados))
+        for resultados in product(RESULTADOS, repeat=len(jogos))
+    ]
+
+
+def aplicar(base: Dict[str, Any], cenario: Cenario) -> Dict[str, Any]:
+    """
+    Fixa os resultados de um cenário numa cópia da base
+
+    Com a tabela de jogos, cada jogo do cenário vira um jogo com resultado
+    certo (base["fixados"]). Sem ela, o resultado entra direto na
+    classificação e os dois clubes passam a ter um jogo a menos. As forças
+    dos clubes não mudam.
+
+    Args:
+        base: Retorno de src.simulacao.preparar
+        cenario: Jogos com resultado fixo
+
+    Returns:
+        Nova base (os vetores da original não são alterados)
+
+    Raises:
+        ValueError: Se um clube, jogo ou resultado não existir
+    """
+    indice = base["indice"]
+    nova = dict(base)
+
+    if base["mandantes"] is not None:
+        fixados = dict(base.get("fixados", {}))
+        for mandante, visitante, resultado in cenario:
+            if resultado not in PONTOS or mandante not in indice or visitante not in indice:
+                raise ValueError(f"Cenário inválido: {mandante} x {visitante} ({resultado})")
+            jogo = next((
+                i for i, (m, v) in enumerate(zip(base["mandantes"], base["visitantes"]))
+                if m == indice[mandante] and v == indice[visitante] and i not in fixados
+            ), None)
+            if jogo is None:
+                raise ValueError(f"{mandante} x {visitante} não está entre os jogos restantes")
+            fixados[jogo] = resultado
+        nova["fixados"] = fixados
+        return nova
+
+    pontos, jogos, vitorias = base["pontos"].copy(), base["jogos"].copy(), base["vitorias"].copy()
+    for mandante, visitante, resultado in cenario:
+        if resultado not in PONTOS or mandante not in indice or visitante not in indice:
+            raise ValueError(f"Cenário inválido: {mandante} x {visitante} ({resultado})")
+        for time, ganhos in zip((indice[mandante], indice[visitante]), PONTOS[resultado]):
+            pontos[time] += ganhos
+            jogos[time] += 1
+            vitorias[time] += ganhos == 3
+    nova.update(pontos=pontos, jogos=jogos, vitorias=vitorias)
+    return nova
+
+
+def chance(base: Dict[str, Any], cenario: Cenario) -> float:
+    """Probabilidade do cenário pelo modelo da simulação (jogos independentes)"""
+    forcas, indice = base["forcas"], base["indice"]
+    total = 1.0
+    for mandante, visitante, resultado in cenario:
+        vitoria, derrota = _probabilidades_jogo(forcas[indice[mandante]], forcas[indice[visitante]])
+        total *= {"V": vitoria, "E": SIMULACAO_EMPATE, "D": derrota}[resultado]
+    return float(total)
+
+
+def _iniciar_processo(base: Dict[str, Any]) -> None:
+    """Inicializador do pool: guarda a base no processo"""
+    global _base
+    _base = base
+
+
+def _simular_cenario(cenario: Cenario, temporadas: int, semente: Optional[int]) -> Dict[str, Dict[str, float]]:
+    """Tarefa do pool: simula um cenário sobre a base do processo"""
+    return simular_base(aplicar(_base, cenario), temporadas, semente)
+
+
+def simular_cenarios(
+    classificacao: Tabela,
+    cenarios: List[Cenario],
+    partidas: Optional[List[Jogo]] = None,
+    temporadas: int = CENARIOS_TEMPORADAS,
+    semente: Optional[int] = SIMULACAO_SEMENTE,
+    processos: int = CENARIOS_PROCESSOS
+) -> List[Dict[str, Any]]:
+    """
+    Simula cada cenário e calcula as probabilidades de todos os clubes
+
+    Args:
+        classificacao: Tabela da classificação geral
+        cenarios: Cenários a simular (ex: retorno de combinacoes)
+        partidas: Jogos restantes (mandante, visitante) ou None
+        temporadas: Temporadas simuladas por cenário
+        semente: Semente usada em todos os cenários
+        processos: Processos do pool (0 = um por CPU, 1 = no próprio processo)
+
+    Returns:
+        Lista na ordem de cenarios com {"cenario", "chance", "probabilidades"},
+        onde probabilidades é {time: {objetivo: %}} como em simular
+
+    Raises:
+        ImportError: Se o numpy não estiver instalado
+        ValueError: Se a classificação estiver vazia ou um cenário for inválido
+    """
+    base = preparar(classificacao, partidas)
+    for cenario in cenarios:
+        aplicar(base, cenario)  # Valida antes de abrir o pool
+
+    processos = min(processos or os.cpu_count() or 1, len(cenarios))
+    if processos <= 1:
+        resultados = [simular_base(aplicar(base, c), temporadas, semente) for c in cenarios]
+    else:
+        with ProcessPoolExecutor(processos, initializer=_iniciar_processo, initargs=(base,)) as pool:
+            resultados = list(pool.map(
+                _simular_cenario, cenarios, repeat(temporadas), repeat(semente),
+                chunksize=max(1, len(cenarios) // (processos * 4))
+            ))
+
+    logger.info("%s cenários simulados em %s processo(s)", len(cenarios), processos)
+    return [
+        {"cenario": cenario, "chance": chance(base, cenario), "probabilidades": resultado}
+        for cenario, resultado in zip(cenarios, resultados)
+    ]
+
+
+def jogos_chave(
+    classificacao: Tabela,
+    partidas: List[Jogo],
+    time: str,
+    quantidade: int = CENARIOS_JOGOS
+) -> List[Jogo]:
+    """
+    Escolhe os jogos que mais pesam para um clube
+
+    O próximo jogo do clube e os próximos jogos dos clubes mais próximos
+    dele em pontos, sem repetir jogos.
+
+    Args:
+        classificacao: Tabela da classificação geral
+        partidas: Jogos restantes em ordem (mandante, visitante)
+        time: Nome normalizado do clube
+        quantidade: Número máximo de jogos
+
+    Returns:
+        Jogos (mandante, visitante) escolhidos
+    """
+    base = preparar(classificacao)
+    if time not in base["indice"]:
+        return []
+    pontos = base["pontos"][base["indice"][time]]
+    rivais = sorted(
+        (t for t in base["times"] if t != time),
+        key=lambda t: abs(base["pontos"][base["indice"][t]] - pontos)
+    )
+
+    escolhidos: List[Jogo] = []
+    for clube in [time] + rivais:
+        if len(escolhidos) >= quantidade:
+            break
+        proximo = next((j for j in partidas if clube in j), None)
+        if proximo is not None and proximo not in escolhidos:
+            escolhidos.append(proximo)
+    return escolhidos
+
+
+def o_que_precisa(
+    resultados: List[Dict[str, Any]],
+    time: str,
+    objetivo: str
+) -> Dict[str, Any]:
+    """
+    Ordena os cenários do melhor para o pior para um clube
+
+    Args:
+        resultados: Retorno de simular_cenarios
+        time: Nome normalizado do clube
+        objetivo: Chave de SIMULACAO_ZONAS
+
+    Returns:
+        Dicionário com time, objetivo, atual (média dos cenários ponderada
+        pela chance de cada um) e cenarios: lista de {"cenario",
+        "probabilidade", "variacao" (em relação a atual), "chance"}
+    """
+    linhas = [
+        {"cenario": r["cenario"], "probabilidade": r["probabilidades"][time][objetivo], "chance": r["chance"]}
+        for r in resultados
+        if time in r["probabilidades"]
+    ]
+    total = sum(linha["chance"] for linha in linhas)
+    atual = sum(linha["chance"] * linha["probabilidade"] for linha in linhas) / total if total else None
+    for linha in linhas:
+        linha["variacao"] = linha["probabilidade"] - atual if atual is not None else None
+
+    linhas.sort(key=lambda linha: linha["probabilidade"], reverse=objetivo not in OBJETIVOS_EVITAR)
+    return {"time": time, "objetivo": objetivo, "atual": atual, "cenarios": linhas}
@@ -0,0 +1,86 @@
+"""
+Módulo para carregar a configuração de vários clubes (um bot por clube)
+"""
+import json
+import os
+import logging
+from typing import Dict, List, Optional
+from pathlib import Path
+
+from config.settings import CLUBES_FILE, TWITTER_CONFIG, COMPETICOES, COMPETICAO_PADRAO
+from src.tabela import normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+# Sufixos das variáveis de ambiente de credenciais para cada chave do tweepy
+VARIAVEIS_CREDENCIAIS = {
+    "consumer_key": "API_KEY",
+    "consumer_secret": "API_SECRET",
+    "access_token": "ACCESS_TOKEN",
+    "access_token_secret": "ACCESS_TOKEN_SECRET"
+}
+
+
+def credenciais_do_ambiente(prefixo: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Lê as credenciais do Twitter de um clube a partir das variáveis de ambiente
+
+    Args:
+        prefixo: Prefixo das variáveis (ex: "VITORIA" lê VITORIA_API_KEY).
+            Se None, usa as credenciais padrão de TWITTER_CONFIG
+
+    Returns:
+        Dicionário no formato de TWITTER_CONFIG
+    """
+    if not prefixo:
+        return dict(TWITTER_CONFIG)
+
+    return {
+        chave: os.getenv(f"{prefixo}_{variavel}")
+        for chave, variavel in VARIAVEIS_CREDENCIAIS.items()
+    }
+
+
+def carregar_clubes(caminho: str = CLUBES_FILE) -> List[Dict]:
+    """
+    Carrega a lista de clubes configurados
+
+    Args:
+        caminho: Caminho do arquivo JSON com a lista de clubes
+
+    Returns:
+        Lista de dicionários com nome, emoji, competição, credenciais e cache de cada clube
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+        ValueError: Se algum clube estiver sem nome, repetido ou em competição desconhecida
+    """
+    with open(Path(caminho), 'r', encoding='utf-8') as f:
+        entradas = json.load(f)
+
+    clubes = []
+    nomes = set()
+
+    for entrada in entradas:
+        if not entrada.get("nome"):
+            raise ValueError(f"Clube sem nome em {caminho}: {entrada}")
+
+        nome = normalizar_texto(entrada["nome"])
+        if nome in nomes:
+            raise ValueError(f"Clube repetido em {caminho}: {nome}")
+        nomes.add(nome)
+
+        competicao = entrada.get("competicao", COMPETICAO_PADRAO)
+        if competicao not in COMPETICOES:
+            raise ValueError(f"Competição desconhecida em {caminho}: {competicao} ({nome})")
+
+        clubes.append({
+            "nome": nome,
+            "emoji": entrada.get("emoji", ""),
+            "competicao": competicao,
+            "credenciais": credenciais_do_ambiente(entrada.get("prefixo_env")),
+            "cache": entrada.get("cache", f"cache/{nome.lower().replace(' ', '_')}.json")
+        })
+
+    logger.info("%s clubes carregados de %s", len(clubes), caminho)
+    return clubes
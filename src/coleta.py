@@ -0,0 +1,106 @@
+"""
+Plano de coleta das competições e limite de requisições por host
+
+planejar junta as páginas de todas as competições pedidas (COMPETICOES em
+config/settings.py) em uma lista sem URLs repetidas: cada página é baixada
+uma vez por execução, por mais clubes e competições que dependam dela, e
+o cache HTTP (src/http_cache.py) é o mesmo para todas.
+
+BaldeDeFichas limita a taxa de requisições a um mesmo host; o scraper
+mantém um balde por host e espera uma ficha antes de cada requisição.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Any
+
+from config.settings import COMPETICOES, COMPETICAO_PADRAO
+
+logger = logging.getLogger(__name__)
+
+
+class BaldeDeFichas:
+    """Token bucket: até capacidade requisições seguidas e depois taxa por segundo"""
+
+    def __init__(
+        self,
+        taxa: float,
+        capacidade: int,
+        relogio: Callable[[], float] = time.monotonic,
+        dormir: Callable[[float], None] = time.sleep
+    ):
+        """
+        Cria o balde cheio
+
+        Args:
+            taxa: Fichas repostas por segundo
+            capacidade: Máximo de fichas acumuladas (tamanho da rajada)
+            relogio: Fonte de tempo (injetável nos testes)
+            dormir: Função de espera (injetável nos testes)
+        """
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._relogio = relogio
+        self._dormir = dormir
+        self._fichas = float(capacidade)
+        self._atualizado = relogio()
+        self._lock = threading.Lock()
+
+    def aguardar(self) -> float:
+        """
+        Retira uma ficha, esperando a reposição se o balde estiver vazio
+
+        A ficha é reservada antes da espera, então threads simultâneas saem
+        espaçadas de 1/taxa segundos em vez de acordarem juntas.
+
+        Returns:
+            Segundos esperados
+        """
+        with self._lock:
+            agora = self._relogio()
+            self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado) * self.taxa)
+            self._atualizado = agora
+            self._fichas -= 1
+            espera = -self._fichas / self.taxa if self._fichas < 0 else 0.0
+
+        if espera > 0:
+            self._dormir(espera)
+        return espera
+
+
+def competicao_do_clube(clube: Dict) -> str:
+    """Competição de um clube (COMPETICAO_PADRAO se não informada)"""
+    return clube.get("competicao") or COMPETICAO_PADRAO
+
+
+def planejar(competicoes: Iterable[str]) -> Dict[str, Any]:
+    """
+    Monta a lista de páginas necessárias para um conjunto de competições
+
+    Args:
+        competicoes: Chaves de COMPETICOES (repetições são ignoradas)
+
+    Returns:
+        Dicionário com "urls" (cada URL uma vez, na ordem do registro) e
+        "paginas" ({competição: {chave da página: URL}})
+
+    Raises:
+        ValueError: Se uma competição não existir em COMPETICOES
+    """
+    paginas: Dict[str, Dict[str, str]] = {}
+    urls: List[str] = []
+    vistas = set()
+
+    for competicao in competicoes:
+        if competicao in paginas:
+            continue
+        if competicao not in COMPETICOES:
+            raise ValueError(f"Competição desconhecida: {competicao}")
+        paginas[competicao] = dict(COMPETICOES[competicao]["paginas"])
+        for url in paginas[competicao].values():
+            if url not in vistas:
+                vistas.add(url)
+                urls.append(url)
+
+    logger.info("Plano de coleta: %s competições, %s páginas", len(paginas), len(urls))
+    return {"urls": urls, "paginas": paginas}
@@ -0,0 +1,147 @@
+"""
+Modo daemon: mantém o bot em execução verificando o UFMG em intervalos adaptativos
+"""
+import os
+import signal
+import threading
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from config.settings import (
+    DAEMON_INTERVALO_JOGO, DAEMON_INTERVALO_NORMAL, DAEMON_JANELAS_JOGO,
+    DAEMON_MAX_MEMORIA_MB
+)
+
+logger = logging.getLogger(__name__)
+
+# Horário de Brasília (sem horário de verão desde 2019)
+BRT = timezone(timedelta(hours=-3))
+
+
+def em_janela_de_jogo(agora: datetime) -> bool:
+    """
+    Indica se o horário está dentro de uma janela de jogo
+
+    Args:
+        agora: Data e hora (convertida para o horário de Brasília)
+
+    Returns:
+        True se estiver em uma das DAEMON_JANELAS_JOGO
+    """
+    agora = agora.astimezone(BRT)
+    return any(
+        agora.weekday() == dia and inicio <= agora.hour < fim
+        for dia, inicio, fim in DAEMON_JANELAS_JOGO
+    )
+
+
+def intervalo_polling(agora: datetime, falhou: bool = False) -> float:
+    """
+    Calcula quanto esperar até a próxima verificação
+
+    Verifica com frequência nas janelas de jogo e raramente fora delas.
+    Depois de uma falha, a próxima tentativa usa o intervalo curto.
+
+    Args:
+        agora: Data e hora atual
+        falhou: Se a última execução falhou
+
+    Returns:
+        Intervalo em segundos
+    """
+    if falhou or em_janela_de_jogo(agora):
+        return DAEMON_INTERVALO_JOGO
+    return DAEMON_INTERVALO_NORMAL
+
+
+def memoria_mb(statm: str = "/proc/self/statm") -> Optional[float]:
+    """
+    Retorna a memória residente atual do processo em MB
+
+    Lê o RSS de agora, e não o pico (ru_maxrss, que só cresce): a memória
+    devolvida ao sistema entre os ciclos volta a ser descontada.
+
+    Args:
+        statm: Arquivo statm do processo (Linux)
+
+    Returns:
+        RSS em MB, ou None onde /proc não existe (o limite fica desativado)
+    """
+    try:
+        with open(statm, 'r', encoding='ascii') as f:
+            paginas = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def instalar_sinais(parar: threading.Event) -> None:
+    """Faz SIGINT/SIGTERM pedirem o encerramento do daemon ao fim do ciclo atual"""
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    def tratar(sinal, _frame):
+        logger.info("Sinal %s recebido - encerrando após o ciclo atual", signal.Signals(sinal).name)
+        parar.set()
+
+    signal.signal(signal.SIGINT, tratar)
+    signal.signal(signal.SIGTERM, tratar)
+
+
+def executar_daemon(
+    executar: Callable[[], bool],
+    parar: Optional[threading.Event] = None,
+    max_ciclos: Optional[int] = None,
+    relogio: Callable[[], datetime] = lambda: datetime.now(BRT)
+) -> bool:
+    """
+    Executa o bot em loop até receber sinal de parada
+
+    A sessão HTTP, o cache HTTP (com as tabelas parseadas) e os clientes do
+    Twitter ficam em memória entre os ciclos; as impressões digitais fazem
+    cada ciclo sem mudança terminar antes do parse.
+
+    Args:
+        executar: Função que executa um ciclo do bot e retorna sucesso
+        parar: Evento que encerra o loop (padrão: acionado por SIGINT/SIGTERM)
+        max_ciclos: Número máximo de ciclos (None = sem limite)
+        relogio: Função que retorna o horário atual
+
+    Returns:
+        True se encerrou normalmente, False se parou pelo limite de memória
+    """
+    if parar is None:
+        parar = threading.Event()
+        instalar_sinais(parar)
+
+    ciclos = 0
+    logger.info("Daemon iniciado")
+
+    while not parar.is_set():
+        ciclos += 1
+        logger.info("Ciclo %s do daemon", ciclos)
+
+        try:
+            sucesso = executar()
+        except Exception as e:
+            logger.error("Erro no ciclo %s do daemon: %s", ciclos, e, exc_info=True)
+            sucesso = False
+
+        memoria = memoria_mb()
+        if memoria is not None and memoria > DAEMON_MAX_MEMORIA_MB:
+            logger.error(
+                "Memória do daemon (%.0f MB) acima do limite (%s MB) - encerrando para reinício",
+                memoria, DAEMON_MAX_MEMORIA_MB
+            )
+            return False
+
+        if max_ciclos is not None and ciclos >= max_ciclos:
+            break
+
+        intervalo = intervalo_polling(relogio(), falhou=not sucesso)
+        logger.info("Próxima verificação em %.0f min", intervalo / 60)
+        parar.wait(intervalo)
+
+    logger.info("Daemon encerrado após %s ciclos", ciclos)
+    return True
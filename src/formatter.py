@@ -1,17 +1,426 @@
 """
 Módulo responsável por formatar tweets com os dados coletados
+
+As partes fixas do tweet (cabeçalho, rótulos, emojis e rodapé) são
+pré-compiladas uma vez por clube e idioma em um ModeloTweet; renderizar
+só preenche os valores. renderizar_lote gera os tweets de vários clubes
+(ou de vários snapshots do histórico) calculando cada data uma única vez.
+
+O tamanho é o peso do Twitter (peso_tweet): emojis e a maioria dos
+caracteres fora do latim contam 2. gerar_thread divide em vários tweets,
+sempre entre seções, o conteúdo que não cabe em um só.
 """
 from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Iterable, Iterator, List, Tuple, Any
 import logging
+import re
 
 from config.settings import (
     EMOJIS, LABELS, MAX_TWEET_LENGTH, 
-    TIME_ALVO, EMOJI_TIME
+    TIME_ALVO, EMOJI_TIME, COMPETICOES
 )
 
 logger = logging.getLogger(__name__)
 
+# Textos fixos de cada idioma
+TEXTOS: Dict[str, Dict[str, Any]] = {
+    "pt_BR": {
+        "data": "%d/%m/%y",
+        "serie": "Serie A",
+        "posicao": "Posicao",
+        "pontos": "Pnts",
+        "jogos": "Jogos",
+        "vitorias": "V",
+        "empates": "E",
+        "derrotas": "D",
+        "saldo": "SG",
+        "rendimento": "Rendimento",
+        "indisponivel": "Dados indisponíveis",
+        "fonte": "Fonte: UFMG",
+        "fonte_obsoleta": "Fonte: UFMG (dados de {data}, site fora do ar)",
+        "fonte_simulacao": "{tipos}: simulação do bot, não do UFMG",
+        "data_hora": "%d/%m %H:%M",
+        "variacoes": "Maiores variações da rodada",
+        "cenarios": "O que o {time} precisa",
+        "hoje": "hoje",
+        "fonte_cenarios": "Fonte: simulação sobre a classificação do UFMG",
+        "vitoria": "{vencedor} vence {perdedor}",
+        "empate": "{mandante} e {visitante} empatam",
+        "labels": LABELS,
+    },
+}
+
+
+# Faixas de code points com peso 1 no Twitter (twitter-text v3); o resto pesa 2
+_FAIXAS_PESO_1 = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+# Caracteres que pesam 2 e os que podem formar uma sequência de emoji
+_ESPECIAIS = re.compile("[^\u0000-\u10ff\u2000-\u200c\u2010-\u201f\u2032-\u2037]")
+# ZWJ, keycap, seletores de variação, bandeiras, tons de pele e tags
+_SEQUENCIAS = re.compile(
+    "[\u200d\u20e3\ufe00-\ufe0f\U0001F1E6-\U0001F1FF\U0001F3FB-\U0001F3FF\U000E0020-\U000E007F]"
+)
+
+_pesos: Dict[str, int] = {}
+
+
+def _peso_caractere(ponto: int) -> int:
+    """Peso de um code point isolado"""
+    for inicio, fim in _FAIXAS_PESO_1:
+        if inicio <= ponto <= fim:
+            return 1
+    return 2
+
+
+def _sem_peso(ponto: int) -> bool:
+    """Seletores de variação, tons de pele e tags: fazem parte do emoji anterior"""
+    return 0xFE00 <= ponto <= 0xFE0F or 0x1F3FB <= ponto <= 0x1F3FF or 0xE0020 <= ponto <= 0xE007F
+
+
+def peso_tweet(texto: str) -> int:
+    """
+    Calcula o tamanho de um texto como o Twitter conta (limite MAX_TWEET_LENGTH)
+    
+    Cada emoji, inclusive sequências unidas por ZWJ, bandeiras e emojis
+    com tom de pele, pesa 2; caracteres latinos pesam 1. URLs não recebem
+    o peso fixo de 23 (os tweets do bot não têm links). Os pesos são
+    memorizados: cabeçalhos, rótulos e rodapés se repetem entre tweets.
+    
+    Args:
+        texto: Texto do tweet
+        
+    Returns:
+        Peso do texto
+    """
+    if texto.isascii():
+        return len(texto)
+    try:
+        return _pesos[texto]
+    except KeyError:
+        pass
+    especiais = _ESPECIAIS.findall(texto)
+    if _SEQUENCIAS.search("".join(especiais)):
+        peso = _peso_sequencias(texto)
+    else:
+        peso = len(texto) + len(especiais)
+    if len(_pesos) >= 4096:
+        _pesos.clear()
+    _pesos[texto] = peso
+    return peso
+
+
+def _peso_sequencias(texto: str) -> int:
+    """Peso de um texto com sequências de emoji, caractere a caractere"""
+    peso = 0
+    unido = False  # Caractere anterior foi um ZWJ
+    bandeira = False  # Primeiro indicador regional de uma bandeira já contado
+    for caractere in texto:
+        ponto = ord(caractere)
+        if ponto == 0x200D:
+            unido = True
+            continue
+        if unido or _sem_peso(ponto):
+            unido = False
+            continue
+        if ponto == 0x20E3:  # Keycap: o dígito anterior (peso 1) vira um emoji
+            peso += 1
+            continue
+        if 0x1F1E6 <= ponto <= 0x1F1FF:
+            bandeira = not bandeira
+            if not bandeira:
+                continue
+        else:
+            bandeira = False
+        peso += _peso_caractere(ponto)
+    return peso
+
+
+def _cortar(texto: str, limite: int) -> str:
+    """Corta o texto para caber no peso limite, terminando em reticências"""
+    peso = 0
+    for posicao, caractere in enumerate(texto):
+        peso += _peso_caractere(ord(caractere))
+        if peso > limite - 3:
+            return texto[:posicao] + "..."
+    return texto
+
+
+def _escapar(texto: str) -> str:
+    """Escapa chaves de um texto fixo usado em str.format"""
+    return texto.replace("{", "{{").replace("}", "}}")
+
+
+class ModeloTweet:
+    """Tweet pré-compilado para um clube e um idioma"""
+    
+    def __init__(
+        self,
+        time: str = TIME_ALVO,
+        emoji_time: str = EMOJI_TIME,
+        idioma: str = "pt_BR",
+        serie: Optional[str] = None
+    ):
+        """
+        Monta as partes fixas do tweet
+        
+        Args:
+            time: Nome do time exibido no cabeçalho
+            emoji_time: Emojis do time exibidos no cabeçalho
+            idioma: Chave de TEXTOS
+            serie: Nome da competição na seção da classificação (padrão: o do idioma)
+            
+        Raises:
+            KeyError: Se o idioma não existir em TEXTOS
+        """
+        textos = TEXTOS[idioma]
+        self.formato_data = textos["data"]
+        self._labels = textos["labels"]
+        self._cabecalho = f"{time} {emoji_time}\n{EMOJIS['calendario']} "
+        self._classificacao = (
+            f"\n{_escapar(EMOJIS['classificacao'])} {_escapar(serie or textos['serie'])}\n"
+            f"{_escapar(textos['posicao'])}: {{Posicao}}\n"
+            f"{_escapar(textos['pontos'])}: {{Pnts}}\n"
+            f"{_escapar(textos['jogos'])}: {{Jogos}}\n"
+            f"{_escapar(EMOJIS['gols'])} {_escapar(textos['vitorias'])}: {{Vitorias}} | "
+            f"{_escapar(textos['empates'])}: {{Empates}} | {_escapar(textos['derrotas'])}: {{Derrotas}}\n"
+            f"{_escapar(textos['saldo'])}: {{SG}}\n"
+            f"{_escapar(textos['rendimento'])}: {{Rendimento}}"
+        )
+        self._indisponivel = f"\n{EMOJIS['classificacao']} {textos['indisponivel']}"
+        self._rodape = f"\n{textos['fonte']}"
+        self._rodape_obsoleto = f"\n{textos['fonte_obsoleta']}"
+        self._rodape_simulacao = f"\n{textos['fonte_simulacao']}"
+        self.formato_data_hora = textos["data_hora"]
+        self._probabilidades: Dict[str, Tuple[str, str]] = {}
+    
+    def _prefixos(self, tipo: str) -> Tuple[str, str]:
+        """Prefixos da linha de um tipo de probabilidade (valor numérico, valor inválido)"""
+        prefixos = self._probabilidades.get(tipo)
+        if prefixos is None:
+            emoji = EMOJIS.get(tipo, "")
+            prefixos = (
+                f"{emoji} {self._labels.get(tipo, tipo.capitalize())}\n(%): ",
+                f"{emoji} {self._labels.get(tipo, tipo)}: "
+            )
+            self._probabilidades[tipo] = prefixos
+        return prefixos
+    
+    def data(self, quando: Optional[datetime] = None) -> str:
+        """Formata a data do cabeçalho (padrão: agora)"""
+        return (quando or datetime.now()).strftime(self.formato_data)
+    
+    def classificacao(self, dados: Dict[str, str]) -> str:
+        """Formata a seção da classificação geral"""
+        return self._classificacao.format(
+            Posicao=dados["Posicao"],
+            Pnts=dados["Pnts"],
+            Jogos=dados["Jogos"],
+            Vitorias=dados.get("Vitorias", "0"),
+            Empates=dados.get("Empates", "0"),
+            Derrotas=dados.get("Derrotas", "0"),
+            SG=dados["SG"],
+            Rendimento=dados["Rendimento"]
+        )
+    
+    def probabilidade(self, tipo: str, probabilidade: str) -> str:
+        """Formata a linha de uma probabilidade"""
+        numerico, invalido = self._probabilidades.get(tipo) or self._prefixos(tipo)
+        percentual = _percentual(probabilidade)
+        if percentual is None:
+            logger.warning("Erro ao converter probabilidade: %s", probabilidade)
+            return invalido + probabilidade
+        return numerico + percentual
+    
+    def secoes(
+        self,
+        classificacao: Optional[Dict[str, str]],
+        probabilidades: Dict[str, Optional[str]],
+        data: str,
+        obsoleto: Optional[str] = None,
+        simulados: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Monta as seções do tweet (cabeçalho, classificação, cada probabilidade, rodapé)
+        
+        Unidas por "\n" formam o tweet completo; uma thread só é dividida
+        entre elas.
+        
+        Args:
+            classificacao: Dados da classificação geral
+            probabilidades: Dicionário com probabilidades de cada objetivo
+            data: Data já formatada (ModeloTweet.data)
+            obsoleto: Data e hora (já formatadas) dos dados servidos do cache
+                com o UFMG fora do ar; o rodapé avisa que são antigos
+            simulados: Tipos de probabilidade calculados pela simulação local;
+                o rodapé não os atribui ao UFMG
+            
+        Returns:
+            Lista de seções na ordem do tweet
+        """
+        partes = [self._cabecalho + data]
+        
+        if classificacao:
+            partes.append(self.classificacao(classificacao))
+        else:
+            logger.warning("Dados de classificação não disponíveis")
+            partes.append(self._indisponivel)
+        
+        probabilidade = self.probabilidade
+        for tipo, prob in probabilidades.items():
+            if prob:
+                partes.append(probabilidade(tipo, prob))
+            else:
+                logger.warning("Probabilidade de %s não disponível", tipo)
+        
+        rodape = self._rodape if obsoleto is None else self._rodape_obsoleto.format(data=obsoleto)
+        simulados = [self._labels.get(tipo, tipo) for tipo in simulados if probabilidades.get(tipo)]
+        if simulados:
+            rodape += self._rodape_simulacao.format(tipos=", ".join(simulados))
+        partes.append(rodape)
+        return partes
+    
+    def renderizar(
+        self,
+        classificacao: Optional[Dict[str, str]],
+        probabilidades: Dict[str, Optional[str]],
+        data: str
+    ) -> str:
+        """
+        Gera o texto de um único tweet (cortado se passar de MAX_TWEET_LENGTH)
+        
+        Args:
+            classificacao: Dados da classificação geral
+            probabilidades: Dicionário com probabilidades de cada objetivo
+            data: Data já formatada (ModeloTweet.data)
+            
+        Returns:
+            String com o tweet formatado
+        """
+        return _limitar("\n".join(self.secoes(classificacao, probabilidades, data)))
+    
+    def thread(
+        self,
+        classificacao: Optional[Dict[str, str]],
+        probabilidades: Dict[str, Optional[str]],
+        data: str,
+        limite: int = MAX_TWEET_LENGTH,
+        obsoleto: Optional[str] = None,
+        simulados: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Gera o conteúdo completo, dividido em quantos tweets forem necessários
+        
+        Args:
+            classificacao: Dados da classificação geral
+            probabilidades: Dicionário com probabilidades de cada objetivo
+            data: Data já formatada (ModeloTweet.data)
+            limite: Peso máximo de cada tweet
+            obsoleto: Data e hora dos dados servidos do cache (ver secoes)
+            simulados: Tipos calculados pela simulação local (ver secoes)
+            
+        Returns:
+            Tweets da thread (um só se o conteúdo couber)
+        """
+        return dividir_em_partes(self.secoes(classificacao, probabilidades, data, obsoleto, simulados), limite)
+
+
+@lru_cache(maxsize=64)
+def modelo_tweet(
+    time: str = TIME_ALVO,
+    emoji_time: str = EMOJI_TIME,
+    idioma: str = "pt_BR",
+    serie: Optional[str] = None
+) -> ModeloTweet:
+    """Retorna o modelo compilado de um clube, idioma e competição, reaproveitado entre chamadas"""
+    return ModeloTweet(time, emoji_time, idioma, serie)
+
+
+_percentuais: Dict[str, Optional[str]] = {}
+
+
+def _percentual(probabilidade: str) -> Optional[str]:
+    """
+    Converte "45,6" em "45.60%", memorizando o resultado
+    
+    As páginas repetem os mesmos valores entre clubes e snapshots, então a
+    conversão de cada valor distinto é feita uma vez só.
+    
+    Returns:
+        Percentual formatado ou None se o valor não for numérico
+    """
+    try:
+        return _percentuais[probabilidade]
+    except KeyError:
+        pass
+    try:
+        percentual = f"{float(probabilidade.replace(',', '.')):.2f}%"
+    except ValueError:
+        percentual = None
+    if len(_percentuais) >= 4096:
+        _percentuais.clear()
+    _percentuais[probabilidade] = percentual
+    return percentual
+
+
+def _limitar(tweet: str) -> str:
+    """Corta o tweet no peso MAX_TWEET_LENGTH"""
+    peso = peso_tweet(tweet)
+    if peso > MAX_TWEET_LENGTH:
+        logger.warning("Tweet excedeu %s caracteres (%s)", MAX_TWEET_LENGTH, peso)
+        tweet = _cortar(tweet, MAX_TWEET_LENGTH)
+    return tweet
+
+
+def _linhas(secao: str, limite: int) -> Iterator[Tuple[str, int]]:
+    """Linhas de uma seção maior que o limite, com seus pesos (linhas maiores são cortadas)"""
+    logger.warning("Seção com %s caracteres dividida por linhas", peso_tweet(secao))
+    for linha in secao.split("\n"):
+        peso = peso_tweet(linha)
+        if peso > limite:
+            logger.warning("Linha excedeu %s caracteres (%s)", limite, peso)
+            linha = _cortar(linha, limite)
+            peso = peso_tweet(linha)
+        yield linha, peso
+
+
+def dividir_em_partes(secoes: Iterable[str], limite: int = MAX_TWEET_LENGTH) -> List[str]:
+    """
+    Agrupa seções em tweets de até limite de peso, sem quebrar nenhuma seção
+    
+    As seções são unidas por "\n" como no tweet completo; quebras de linha
+    no início de uma parte nova são descartadas. O peso de cada seção é
+    calculado uma só vez (tempo linear no tamanho do texto).
+    
+    Args:
+        secoes: Seções do conteúdo, na ordem
+        limite: Peso máximo de cada tweet (peso_tweet)
+        
+    Returns:
+        Lista de tweets; vazia se não houver conteúdo
+    """
+    partes: List[str] = []
+    atual: List[str] = []
+    peso_atual = 0
+    
+    for secao in secoes:
+        peso = len(secao) if secao.isascii() else peso_tweet(secao)
+        blocos = ((secao, peso),) if peso <= limite else _linhas(secao, limite)
+        for bloco, peso in blocos:
+            if atual and peso_atual + 1 + peso <= limite:
+                atual.append(bloco)
+                peso_atual += 1 + peso
+                continue
+            if atual:
+                partes.append("\n".join(atual))
+            # Quebras de linha pesam 1: tirar as do início só reduz o peso
+            inicio = bloco.lstrip("\n")
+            atual = [inicio] if inicio else []
+            peso_atual = peso - (len(bloco) - len(inicio))
+    
+    if atual:
+        partes.append("\n".join(atual))
+    return partes
+
 
 def formatar_classificacao(dados: Dict[str, str]) -> str:
     """
@@ -23,19 +432,7 @@ def formatar_classificacao(dados: Dict[str, str]) -> str:
     Returns:
         String formatada com dados da classificação
     """
-    vitorias = dados.get("Vitorias", "0")
-    empates = dados.get("Empates", "0")
-    derrotas = dados.get("Derrotas", "0")
-    
-    return (
-        f"\n{EMOJIS['classificacao']} Serie A\n"
-        f"Posicao: {dados['Posicao']}\n"
-        f"Pnts: {dados['Pnts']}\n"
-        f"Jogos: {dados['Jogos']}\n"
-        f"{EMOJIS['gols']} V: {vitorias} | E: {empates} | D: {derrotas}\n"
-        f"SG: {dados['SG']}\n"
-        f"Rendimento: {dados['Rendimento']}"
-    )
+    return modelo_tweet().classificacao(dados)
 
 
 def formatar_probabilidade(tipo: str, probabilidade: str) -> str:
@@ -49,19 +446,15 @@ def formatar_probabilidade(tipo: str, probabilidade: str) -> str:
     Returns:
         String formatada com emoji, label e probabilidade
     """
-    try:
-        prob_float = float(probabilidade.replace(",", "."))
-        emoji = EMOJIS.get(tipo, "")
-        label = LABELS.get(tipo, tipo.capitalize())
-        return f"{emoji} {label}\n(%): {prob_float:.2f}%"
-    except ValueError:
-        logger.warning(f"Erro ao converter probabilidade: {probabilidade}")
-        return f"{EMOJIS.get(tipo, '')} {LABELS.get(tipo, tipo)}: {probabilidade}"
+    return modelo_tweet().probabilidade(tipo, probabilidade)
 
 
 def gerar_tweet(
     classificacao: Optional[Dict[str, str]],
-    probabilidades: Dict[str, Optional[str]]
+    probabilidades: Dict[str, Optional[str]],
+    time: str = TIME_ALVO,
+    emoji_time: str = EMOJI_TIME,
+    serie: Optional[str] = None
 ) -> str:
     """
     Gera o texto completo do tweet
@@ -69,68 +462,212 @@ def gerar_tweet(
     Args:
         classificacao: Dados da classificação geral
         probabilidades: Dicionário com probabilidades de cada objetivo
+        time: Nome do time exibido no cabeçalho
+        emoji_time: Emojis do time exibidos no cabeçalho
+        serie: Nome da competição (padrão: o de TEXTOS)
         
     Returns:
-        String com o tweet formatado
+        String com o tweet formatado (cortado se passar do limite; gerar_thread
+        mantém todo o conteúdo)
     """
-    # Cabeçalho
-    partes = [
-        f"{TIME_ALVO} {EMOJI_TIME}",
-        f"{EMOJIS['calendario']} {datetime.now().strftime('%d/%m/%y')}"
-    ]
+    modelo = modelo_tweet(time, emoji_time, serie=serie)
+    return modelo.renderizar(classificacao, probabilidades, modelo.data())
 
-    # Classificação Geral
-    if classificacao:
-        partes.append(formatar_classificacao(classificacao))
-    else:
-        logger.warning("Dados de classificação não disponíveis")
-        partes.append(f"\n{EMOJIS['classificacao']} Dados indisponíveis")
 
-    # Probabilidades
-    for tipo, prob in probabilidades.items():
-        if prob:
-            partes.append(formatar_probabilidade(tipo, prob))
-        else:
-            logger.warning(f"Probabilidade de {tipo} não disponível")
+def gerar_thread(
+    classificacao: Optional[Dict[str, str]],
+    probabilidades: Dict[str, Optional[str]],
+    time: str = TIME_ALVO,
+    emoji_time: str = EMOJI_TIME,
+    serie: Optional[str] = None,
+    obsoleto: Optional[datetime] = None,
+    simulados: Iterable[str] = ()
+) -> List[str]:
+    """
+    Gera o post completo, dividido em uma thread se não couber em um tweet
+    
+    Args:
+        classificacao: Dados da classificação geral
+        probabilidades: Dicionário com probabilidades de cada objetivo
+        time: Nome do time exibido no cabeçalho
+        emoji_time: Emojis do time exibidos no cabeçalho
+        serie: Nome da competição (padrão: o de TEXTOS)
+        obsoleto: Quando os dados foram validados, se vieram do cache com o
+            UFMG fora do ar (o rodapé avisa)
+        simulados: Tipos de probabilidade que vieram da simulação local, e
+            não do UFMG (o rodapé avisa)
+        
+    Returns:
+        Tweets do post, na ordem em que devem ser publicados
+    """
+    modelo = modelo_tweet(time, emoji_time, serie=serie)
+    tweets = modelo.thread(
+        classificacao, probabilidades, modelo.data(),
+        obsoleto=obsoleto.strftime(modelo.formato_data_hora) if obsoleto else None,
+        simulados=simulados
+    )
+    if len(tweets) > 1:
+        logger.info("Post de %s não coube em um tweet - thread com %s partes", time, len(tweets))
+    return tweets
 
-    # Rodapé
-    partes.append("\nFonte: UFMG")
 
-    tweet = "\n".join(partes)
+def renderizar_lote(
+    itens: Iterable[Dict[str, Any]],
+    quando: Optional[datetime] = None,
+    idioma: str = "pt_BR"
+) -> List[str]:
+    """
+    Gera os tweets de vários clubes ou snapshots em uma única chamada
+    
+    Cada clube usa seu modelo compilado e cada data do cabeçalho é
+    formatada uma só vez para todo o lote.
+    
+    Args:
+        itens: Dicionários com classificacao, probabilidades e, opcionais,
+            time, emoji_time, quando (data do snapshot) e a competição: serie
+            (nome exibido) ou competicao (chave de COMPETICOES, como nos clubes)
+        quando: Data dos itens sem "quando" (padrão: agora)
+        idioma: Chave de TEXTOS
+        
+    Returns:
+        Lista de tweets na ordem dos itens
+    """
+    datas: Dict[Any, str] = {}
+    tweets = []
+    
+    for item in itens:
+        serie = item.get("serie")
+        if serie is None and item.get("competicao"):
+            serie = COMPETICOES[item["competicao"]]["nome"]
+        modelo = modelo_tweet(item.get("time", TIME_ALVO), item.get("emoji_time", EMOJI_TIME), idioma, serie)
+        momento = item.get("quando") or quando
+        dia = momento.date() if momento else None
+        if dia not in datas:
+            datas[dia] = modelo.data(momento)
+        tweets.append(modelo.renderizar(item["classificacao"], item["probabilidades"], datas[dia]))
+    
+    return tweets
 
-    # Limitar tamanho
-    if len(tweet) > MAX_TWEET_LENGTH:
-        logger.warning(f"Tweet excedeu {MAX_TWEET_LENGTH} caracteres ({len(tweet)})")
-        tweet = tweet[:MAX_TWEET_LENGTH - 3] + "..."
 
-    return tweet
+def _linha_variacao(variacao: Dict[str, Any], textos: Dict[str, Any]) -> str:
+    """Linha do clube com a mudança de posição e os pontos somados"""
+    linha = variacao["time"]
+    posicao, anterior, subiu = variacao["posicao"], variacao["posicao_anterior"], variacao["subiu"]
+    if posicao is not None:
+        seta = "=" if not subiu else ("▲" if subiu > 0 else "▼") + str(abs(subiu))
+        linha += f": {anterior}º → {posicao}º ({seta})" if anterior is not None else f": {posicao}º"
+    if variacao["pontos"] is not None:
+        linha += f" | {textos['pontos']}: {variacao['pontos']}"
+        if variacao["pontos_ganhos"]:
+            linha += f" ({variacao['pontos_ganhos']:+d})"
+    return linha
 
 
-def criar_thread(texto_longo: str, max_length: int = 280) -> list[str]:
+def gerar_variacoes(
+    variacoes: List[Dict[str, Any]],
+    quando: Optional[datetime] = None,
+    idioma: str = "pt_BR"
+) -> List[str]:
     """
-    Divide texto longo em múltiplos tweets para thread
+    Gera o post dos clubes que mais se moveram desde a coleta anterior
+    
+    Cada clube é uma seção: se o post não couber em um tweet, vira thread
+    sem separar as linhas de um mesmo clube.
     
     Args:
-        texto_longo: Texto completo a ser dividido
-        max_length: Tamanho máximo de cada tweet
+        variacoes: Variações de src.variacoes.maiores_variacoes
+        quando: Data do cabeçalho (padrão: agora)
+        idioma: Chave de TEXTOS
         
     Returns:
-        Lista de strings, cada uma representando um tweet
+        Tweets do post (lista vazia se não houver variações)
     """
-    # Implementação futura para threads
-    linhas = texto_longo.split("\n")
-    tweets = []
-    tweet_atual = ""
+    if not variacoes:
+        return []
     
-    for linha in linhas:
-        if len(tweet_atual) + len(linha) + 1 <= max_length:
-            tweet_atual += linha + "\n"
+    textos = TEXTOS[idioma]
+    secoes = [
+        f"{EMOJIS['variacoes']} {textos['variacoes']}\n"
+        f"{EMOJIS['calendario']} {(quando or datetime.now()).strftime(textos['data'])}"
+    ]
+    for variacao in variacoes:
+        linhas = [_linha_variacao(variacao, textos)]
+        for tipo, prob in variacao["probabilidades"].items():
+            if prob["variacao"] is None or round(prob["variacao"], 2) == 0:
+                continue
+            linhas.append(
+                f"{EMOJIS.get(tipo, '')} {textos['labels'].get(tipo, tipo)}: "
+                f"{prob['anterior']:.2f}% → {prob['atual']:.2f}% ({prob['variacao']:+.2f})"
+            )
+        secoes.append("\n" + "\n".join(linhas))
+    secoes.append(f"\n{textos['fonte']}")
+    
+    return dividir_em_partes(secoes)
+
+
+def _descrever_cenario(cenario: Iterable[Tuple[str, str, str]], textos: Dict[str, Any]) -> str:
+    """Resultados fixos de um cenário em uma linha"""
+    partes = []
+    for mandante, visitante, resultado in cenario:
+        if resultado == "E":
+            partes.append(textos["empate"].format(mandante=mandante, visitante=visitante))
         else:
-            if tweet_atual:
-                tweets.append(tweet_atual.strip())
-            tweet_atual = linha + "\n"
+            vencedor, perdedor = (mandante, visitante) if resultado == "V" else (visitante, mandante)
+            partes.append(textos["vitoria"].format(vencedor=vencedor, perdedor=perdedor))
+    return ", ".join(partes)
+
+
+def gerar_cenarios(
+    precisa: Dict[str, Any],
+    quantidade: int = 5,
+    quando: Optional[datetime] = None,
+    idioma: str = "pt_BR"
+) -> List[str]:
+    """
+    Gera o post do "o que o time precisa" a partir dos cenários simulados
     
-    if tweet_atual:
-        tweets.append(tweet_atual.strip())
+    Cada cenário é uma seção: se o post não couber em um tweet, vira thread.
     
-    return tweets
\ No newline at end of file
+    Args:
+        precisa: Retorno de src.cenarios.o_que_precisa
+        quantidade: Número máximo de cenários (os melhores para o clube)
+        quando: Data do cabeçalho (padrão: agora)
+        idioma: Chave de TEXTOS
+        
+    Returns:
+        Tweets do post (lista vazia se não houver cenários)
+    """
+    if not precisa["cenarios"]:
+        return []
+    
+    textos = TEXTOS[idioma]
+    objetivo = precisa["objetivo"]
+    rotulo = f"{EMOJIS.get(objetivo, '')} {textos['labels'].get(objetivo, objetivo)}"
+    secoes = [
+        f"{EMOJIS['cenarios']} {textos['cenarios'].format(time=precisa['time'])}\n"
+        f"{EMOJIS['calendario']} {(quando or datetime.now()).strftime(textos['data'])}\n"
+        f"{rotulo} {textos['hoje']}: {precisa['atual']:.2f}%"
+    ]
+    for posicao, linha in enumerate(precisa["cenarios"][:quantidade], 1):
+        secoes.append(
+            f"\n{posicao}. {_descrever_cenario(linha['cenario'], textos)}\n"
+            f"{rotulo}: {linha['probabilidade']:.2f}% ({linha['variacao']:+.2f})"
+        )
+    secoes.append(f"\n{textos['fonte_cenarios']}")
+    
+    return dividir_em_partes(secoes)
+
+
+def criar_thread(texto_longo: str, max_length: int = MAX_TWEET_LENGTH) -> list[str]:
+    """
+    Divide texto longo em múltiplos tweets para thread
+    
+    Args:
+        texto_longo: Texto completo a ser dividido (quebrado só entre linhas)
+        max_length: Peso máximo de cada tweet
+        
+    Returns:
+        Lista de strings, cada uma representando um tweet
+    """
+    tweets = (parte.strip() for parte in dividir_em_partes(texto_longo.split("\n"), max_length))
+    return [tweet for tweet in tweets if tweet]
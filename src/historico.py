@@ -0,0 +1,329 @@
+"""
+Módulo de histórico das coletas em SQLite (append-only)
+
+Cada coleta grava uma linha em "coletas" e uma linha por clube em
+"snapshots". A tabela "ultimos_posts" guarda, por clube, o último
+snapshot postado, lido por chave primária.
+
+Um "retrato" é o conteúdo numérico de uma coleta: {time: {coluna: valor}},
+com as colunas de snapshots. É o formato comparado por src/variacoes.py.
+"""
+import json
+import sqlite3
+import time
+import logging
+from typing import Optional, Dict, List, Tuple, Any
+from pathlib import Path
+
+from config.settings import HISTORICO_DB, COMPETICAO_PADRAO
+from src.tabela import Tabela, normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS coletas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    coletado_em REAL NOT NULL,
+    rodada INTEGER,
+    impressoes TEXT,
+    competicao TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_coletas_coletado_em ON coletas (coletado_em);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    coleta_id INTEGER NOT NULL REFERENCES coletas (id),
+    time TEXT NOT NULL,
+    posicao INTEGER,
+    pontos INTEGER,
+    jogos INTEGER,
+    vitorias INTEGER,
+    empates INTEGER,
+    derrotas INTEGER,
+    gols_pro INTEGER,
+    gols_contra INTEGER,
+    saldo INTEGER,
+    rendimento REAL,
+    rebaixamento REAL,
+    sulamericana REAL,
+    libertadores REAL,
+    PRIMARY KEY (time, coleta_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_coleta_id ON snapshots (coleta_id);
+
+CREATE TABLE IF NOT EXISTS ultimos_posts (
+    clube TEXT PRIMARY KEY,
+    coleta_id INTEGER REFERENCES coletas (id),
+    postado_em REAL NOT NULL,
+    dados TEXT NOT NULL
+);
+"""
+
+COLUNAS_CLASSIFICACAO = [
+    "posicao", "pontos", "jogos", "vitorias", "empates", "derrotas",
+    "gols_pro", "gols_contra", "saldo", "rendimento",
+]
+COLUNAS_PROBABILIDADE = ["rebaixamento", "sulamericana", "libertadores"]
+COLUNAS_SERIE = set(COLUNAS_CLASSIFICACAO + COLUNAS_PROBABILIDADE)
+
+
+def _numero(texto: Optional[str]) -> Optional[float]:
+    """Converte "45,6", "39.47%" ou "-17" em número (None se vazio/inválido)"""
+    if texto is None:
+        return None
+    try:
+        return float(texto.replace("%", "").replace("º", "").replace(",", ".").strip())
+    except ValueError:
+        return None
+
+
+def _inteiro(texto: Optional[str]) -> Optional[int]:
+    numero = _numero(texto)
+    return None if numero is None else int(numero)
+
+
+def retrato(tabelas: Dict[str, Optional[Tabela]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Converte as tabelas de uma coleta nos valores numéricos de cada clube
+
+    Probabilidades simuladas pelo bot (origem "simulacao") ficam de fora:
+    o histórico só guarda o que o UFMG publicou, e as variações entre
+    coletas não misturam as duas fontes.
+
+    Args:
+        tabelas: Tabelas por chave de URLS (como em main.coletar_tabelas)
+
+    Returns:
+        Dicionário {time normalizado: {coluna de snapshots: valor}}
+    """
+    classificacao = tabelas.get("classificacao_geral")
+    linhas: Dict[str, Dict[str, Any]] = {}
+
+    if classificacao is not None:
+        for linha in classificacao:
+            linhas[normalizar_texto(linha["time"])] = {
+                coluna: (_numero if coluna == "rendimento" else _inteiro)(linha.get(coluna))
+                for coluna in COLUNAS_CLASSIFICACAO
+            }
+
+    for tipo in COLUNAS_PROBABILIDADE:
+        tabela = tabelas.get(tipo)
+        if tabela is None or tabela.origem != "ufmg":
+            continue
+        for linha in tabela:
+            time_ = normalizar_texto(linha["time"])
+            linhas.setdefault(time_, {})[tipo] = _numero(linha.get("probabilidade"))
+
+    return linhas
+
+
+class Historico:
+    """Histórico de todas as coletas e dos últimos posts de cada clube"""
+
+    def __init__(self, caminho: str = HISTORICO_DB):
+        """
+        Abre (ou cria) o banco de histórico
+
+        Args:
+            caminho: Arquivo SQLite (":memory:" para testes)
+        """
+        if caminho != ":memory:":
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript(ESQUEMA)
+        colunas = {linha[1] for linha in self.conexao.execute("PRAGMA table_info(coletas)")}
+        if "competicao" not in colunas:
+            # Bancos anteriores ao registro de competições só tinham a competição padrão
+            self.conexao.execute(f"ALTER TABLE coletas ADD COLUMN competicao TEXT DEFAULT '{COMPETICAO_PADRAO}'")
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco"""
+        self.conexao.close()
+
+    def registrar_coleta(
+        self,
+        tabelas: Dict[str, Optional[Tabela]],
+        impressoes: Optional[Dict[str, Optional[str]]] = None,
+        coletado_em: Optional[float] = None,
+        competicao: str = COMPETICAO_PADRAO
+    ) -> int:
+        """
+        Grava uma coleta com os dados de todos os clubes
+
+        Args:
+            tabelas: Tabelas por chave de URLS (como em main.coletar_tabelas)
+            impressoes: Impressões digitais das páginas
+            coletado_em: Timestamp da coleta (padrão: agora)
+            competicao: Chave de COMPETICOES das tabelas
+
+        Returns:
+            Id da coleta gravada
+        """
+        linhas = retrato(tabelas)
+
+        jogos = [dados.get("jogos") for dados in linhas.values() if dados.get("jogos") is not None]
+        rodada = max(jogos) if jogos else None
+
+        with self.conexao:
+            cursor = self.conexao.execute(
+                "INSERT INTO coletas (coletado_em, rodada, impressoes, competicao) VALUES (?, ?, ?, ?)",
+                (coletado_em or time.time(), rodada, json.dumps(impressoes) if impressoes else None, competicao)
+            )
+            coleta_id = cursor.lastrowid
+            colunas = COLUNAS_CLASSIFICACAO + COLUNAS_PROBABILIDADE
+            self.conexao.executemany(
+                f"INSERT INTO snapshots (coleta_id, time, {', '.join(colunas)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(colunas))})",
+                [
+                    (coleta_id, time_, *(dados.get(coluna) for coluna in colunas))
+                    for time_, dados in linhas.items()
+                ]
+            )
+
+        logger.info("Coleta %s gravada no histórico (%s, %s clubes, rodada %s)", coleta_id, competicao, len(linhas), rodada)
+        return coleta_id
+
+    def _retrato(self, consulta: str, parametros: tuple) -> Dict[str, Dict[str, Any]]:
+        """Executa uma consulta de snapshots (time + colunas) e monta o retrato"""
+        colunas = COLUNAS_CLASSIFICACAO + COLUNAS_PROBABILIDADE
+        return {
+            linha[0]: dict(zip(colunas, linha[1:]))
+            for linha in self.conexao.execute(consulta.format(", ".join(f"s.{c}" for c in colunas)), parametros)
+        }
+
+    def snapshot(self, coleta_id: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna os dados de todos os clubes em uma coleta
+
+        Args:
+            coleta_id: Id da coleta
+
+        Returns:
+            Retrato da coleta (vazio se ela não gravou clubes)
+        """
+        return self._retrato("SELECT s.time, {} FROM snapshots s WHERE s.coleta_id = ?", (coleta_id,))
+
+    def coleta_anterior(self, coleta_id: int) -> Optional[int]:
+        """
+        Retorna a última coleta com dados da mesma competição antes de coleta_id
+
+        Coletas encerradas antes do parse (páginas inalteradas) não gravam
+        clubes e são puladas.
+
+        Args:
+            coleta_id: Id da coleta atual
+
+        Returns:
+            Id da coleta anterior ou None
+        """
+        return self.conexao.execute(
+            "SELECT MAX(s.coleta_id) FROM snapshots s JOIN coletas c ON c.id = s.coleta_id "
+            "WHERE s.coleta_id < ? AND c.competicao IS (SELECT competicao FROM coletas WHERE id = ?)",
+            (coleta_id, coleta_id)
+        ).fetchone()[0]
+
+    def snapshots_postados(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna, para cada clube, os dados da coleta de seu último post
+
+        Returns:
+            Retrato com os clubes que já postaram a partir de uma coleta gravada
+        """
+        return self._retrato(
+            "SELECT s.time, {} FROM ultimos_posts u "
+            "JOIN snapshots s ON s.time = u.clube AND s.coleta_id = u.coleta_id",
+            ()
+        )
+
+    def registrar_post(
+        self,
+        clube: str,
+        dados: Dict[str, Any],
+        coleta_id: Optional[int] = None
+    ) -> None:
+        """
+        Guarda o snapshot postado de um clube (substitui o anterior)
+
+        Args:
+            clube: Nome normalizado do clube
+            dados: Dados no formato do cache (classificacao, probabilidades, ...)
+            coleta_id: Coleta de onde os dados vieram
+        """
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO ultimos_posts (clube, coleta_id, postado_em, dados) "
+                "VALUES (?, ?, ?, ?)",
+                (normalizar_texto(clube), coleta_id, time.time(), json.dumps(dados, ensure_ascii=False))
+            )
+
+    def ultimo_post(self, clube: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o último snapshot postado de um clube (busca por chave primária)
+
+        Args:
+            clube: Nome do clube
+
+        Returns:
+            Dados no formato de carregar_dados_cache ou None
+        """
+        linha = self.conexao.execute(
+            "SELECT dados FROM ultimos_posts WHERE clube = ?",
+            (normalizar_texto(clube),)
+        ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def serie(
+        self,
+        clube: str,
+        coluna: str,
+        inicio: Optional[float] = None,
+        fim: Optional[float] = None
+    ) -> List[Tuple[float, Optional[int], Optional[float]]]:
+        """
+        Retorna a evolução de uma coluna de um clube ao longo do tempo
+
+        Ex: serie("VITORIA", "rebaixamento") dá o risco de rebaixamento na temporada.
+
+        Args:
+            clube: Nome do clube
+            coluna: Coluna de snapshots (ex: "rebaixamento", "pontos")
+            inicio: Timestamp inicial (inclusivo)
+            fim: Timestamp final (inclusivo)
+
+        Returns:
+            Lista de (coletado_em, rodada, valor) em ordem cronológica
+
+        Raises:
+            ValueError: Se a coluna não existir
+        """
+        if coluna not in COLUNAS_SERIE:
+            raise ValueError(f"Coluna inválida: {coluna}")
+
+        return self.conexao.execute(
+            f"SELECT c.coletado_em, c.rodada, s.{coluna} "
+            "FROM snapshots s JOIN coletas c ON c.id = s.coleta_id "
+            "WHERE s.time = ? AND c.coletado_em BETWEEN ? AND ? "
+            "ORDER BY c.coletado_em",
+            (normalizar_texto(clube), inicio or 0, fim or float("inf"))
+        ).fetchall()
+
+
+_historico_padrao: Optional[Historico] = None
+
+
+def historico_padrao() -> Optional[Historico]:
+    """
+    Retorna o histórico configurado em config/settings.py
+
+    Returns:
+        Instância compartilhada de Historico ou None se o histórico estiver desativado
+    """
+    global _historico_padrao
+
+    if not HISTORICO_DB:
+        return None
+
+    if _historico_padrao is None:
+        _historico_padrao = Historico(HISTORICO_DB)
+    return _historico_padrao
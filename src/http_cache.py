@@ -0,0 +1,255 @@
+"""
+Módulo de cache HTTP em disco (ETag / Last-Modified) para as páginas do UFMG
+"""
+import hashlib
+import json
+import threading
+import time
+import logging
+from typing import Optional, Dict
+from pathlib import Path
+
+from config.settings import (
+    HTTP_CACHE_ATIVO, HTTP_CACHE_DIR, HTTP_CACHE_TTL,
+    HTTP_CACHE_MAX_BYTES, HTTP_CACHE_FRESCOR
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheHTTP:
+    """
+    Cache em disco de respostas HTTP por URL
+
+    Guarda corpo, ETag, Last-Modified e a tabela já parseada de cada URL.
+    Entradas expiram pelo TTL e as mais antigas são removidas quando o
+    tamanho total passa do limite.
+    """
+
+    def __init__(
+        self,
+        diretorio: str,
+        ttl: float,
+        max_bytes: int,
+        frescor: float = 0
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            diretorio: Diretório onde as entradas são gravadas
+            ttl: Tempo máximo (segundos) que uma entrada fica no cache
+            max_bytes: Tamanho máximo total das entradas em disco
+            frescor: Tempo (segundos) em que a entrada é usada sem nem revalidar
+        """
+        self.diretorio = Path(diretorio)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.frescor = frescor
+        self.estatisticas = {"acertos": 0, "falhas": 0, "revalidacoes": 0, "remocoes": 0, "obsoletos": 0}
+        self._lock = threading.Lock()
+
+    def _caminho(self, url: str) -> Path:
+        """Retorna o arquivo da entrada de uma URL"""
+        return self.diretorio / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _contar(self, estatistica: str) -> None:
+        with self._lock:
+            self.estatisticas[estatistica] += 1
+
+    def obter(self, url: str) -> Optional[Dict]:
+        """
+        Retorna a entrada de uma URL, descartando-a se expirada
+
+        Args:
+            url: URL da página
+
+        Returns:
+            Dicionário com corpo, etag, last_modified, tabela e salvo_em, ou None
+        """
+        caminho = self._caminho(url)
+
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                entrada = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Entrada de cache HTTP inválida para %s: %s", url, e)
+            caminho.unlink(missing_ok=True)
+            return None
+
+        if time.time() - entrada.get("salvo_em", 0) > self.ttl:
+            logger.info("Entrada de cache HTTP expirada para %s", url)
+            caminho.unlink(missing_ok=True)
+            self._contar("remocoes")
+            return None
+
+        return entrada
+
+    def esta_fresca(self, entrada: Dict) -> bool:
+        """Indica se a entrada pode ser usada sem revalidar com o servidor"""
+        return time.time() - entrada.get("validado_em", 0) <= self.frescor
+
+    def cabecalhos_condicionais(self, entrada: Optional[Dict]) -> Dict[str, str]:
+        """
+        Monta os cabeçalhos If-None-Match / If-Modified-Since de uma entrada
+
+        Args:
+            entrada: Entrada retornada por obter (ou None)
+
+        Returns:
+            Dicionário de cabeçalhos HTTP
+        """
+        cabecalhos = {}
+        if entrada:
+            if entrada.get("etag"):
+                cabecalhos["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+        return cabecalhos
+
+    def salvar(
+        self,
+        url: str,
+        corpo: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        tabela: Optional[Dict] = None,
+        impressao: Optional[str] = None
+    ) -> None:
+        """
+        Grava uma nova resposta (status 200) no cache
+
+        Args:
+            url: URL da página
+            corpo: Corpo da resposta
+            etag: Cabeçalho ETag da resposta
+            last_modified: Cabeçalho Last-Modified da resposta
+            tabela: Tabela parseada serializada (Tabela.para_dict)
+            impressao: Impressão digital da tabela da página
+        """
+        agora = time.time()
+        entrada = {
+            "url": url,
+            "corpo": corpo,
+            "etag": etag,
+            "last_modified": last_modified,
+            "tabela": tabela,
+            "impressao": impressao,
+            "salvo_em": agora,
+            "validado_em": agora
+        }
+        self._gravar(url, entrada)
+        self._aplicar_limite(manter=self._caminho(url))
+
+    def anexar_tabela(self, url: str, tabela: Dict) -> None:
+        """
+        Guarda a tabela parseada em uma entrada já gravada
+
+        Args:
+            url: URL da página
+            tabela: Tabela parseada serializada (Tabela.para_dict)
+        """
+        entrada = self.obter(url)
+        if entrada is not None:
+            entrada["tabela"] = tabela
+            self._gravar(url, entrada)
+
+    def renovar(self, url: str, entrada: Dict) -> None:
+        """
+        Marca uma entrada como revalidada (resposta 304)
+
+        Args:
+            url: URL da página
+            entrada: Entrada retornada por obter
+        """
+        entrada["salvo_em"] = entrada["validado_em"] = time.time()
+        self._gravar(url, entrada)
+
+    def registrar_acerto(self) -> None:
+        """Contabiliza uma entrada usada sem requisição"""
+        self._contar("acertos")
+
+    def registrar_revalidacao(self) -> None:
+        """Contabiliza uma resposta 304"""
+        self._contar("revalidacoes")
+
+    def registrar_falha(self) -> None:
+        """Contabiliza uma página baixada por completo"""
+        self._contar("falhas")
+
+    def registrar_obsoleto(self) -> None:
+        """Contabiliza uma entrada usada porque o servidor não respondeu"""
+        self._contar("obsoletos")
+
+    def _gravar(self, url: str, entrada: Dict) -> None:
+        """Grava a entrada em disco"""
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            with open(self._caminho(url), 'w', encoding='utf-8') as f:
+                json.dump(entrada, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error("Erro ao gravar cache HTTP de %s: %s", url, e)
+
+    def _aplicar_limite(self, manter: Optional[Path] = None) -> None:
+        """
+        Remove as entradas mais antigas até o total caber em max_bytes
+
+        Args:
+            manter: Arquivo que nunca é removido (a entrada recém-gravada)
+        """
+        with self._lock:
+            try:
+                arquivos = [
+                    (arquivo.stat().st_mtime_ns, arquivo.stat().st_size, arquivo)
+                    for arquivo in self.diretorio.glob("*.json")
+                ]
+            except OSError as e:
+                logger.error("Erro ao listar cache HTTP: %s", e)
+                return
+
+            total = sum(tamanho for _, tamanho, _ in arquivos)
+            for _, tamanho, arquivo in sorted(arquivos, key=lambda a: a[0]):
+                if total <= self.max_bytes:
+                    break
+                if arquivo == manter:
+                    continue
+                arquivo.unlink(missing_ok=True)
+                total -= tamanho
+                self.estatisticas["remocoes"] += 1
+
+    def limpar(self) -> None:
+        """Remove todas as entradas do cache"""
+        for arquivo in self.diretorio.glob("*.json"):
+            arquivo.unlink(missing_ok=True)
+
+    def resumo(self) -> str:
+        """Retorna as estatísticas do cache em uma linha"""
+        e = self.estatisticas
+        return (
+            f"acertos={e['acertos']} revalidacoes={e['revalidacoes']} "
+            f"falhas={e['falhas']} remocoes={e['remocoes']} obsoletos={e['obsoletos']}"
+        )
+
+
+_cache_padrao: Optional[CacheHTTP] = None
+
+
+def cache_http_padrao() -> Optional[CacheHTTP]:
+    """
+    Retorna o cache HTTP configurado em config/settings.py
+
+    Returns:
+        Instância compartilhada de CacheHTTP ou None se o cache estiver desativado
+    """
+    global _cache_padrao
+
+    if not HTTP_CACHE_ATIVO:
+        return None
+
+    if _cache_padrao is None:
+        _cache_padrao = CacheHTTP(
+            HTTP_CACHE_DIR, HTTP_CACHE_TTL, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_FRESCOR
+        )
+    return _cache_padrao
@@ -0,0 +1,117 @@
+"""
+Configuração do logging sem I/O no caminho da coleta e da postagem
+
+Os loggers só colocam os registros em uma fila (QueueHandler); uma thread
+(QueueListener) grava no arquivo rotacionado por tamanho e no console.
+Mensagens usam argumentos % preguiçosos: registros abaixo do nível
+configurado nem chegam a ser formatados.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from config.settings import (
+    LOG_DIR, LOG_FILE, LOG_FORMAT, LOG_NIVEL, LOG_JSON, LOG_MAX_BYTES, LOG_BACKUPS
+)
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        registro = {
+            "momento": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            registro["excecao"] = record.exc_text
+        return json.dumps(registro, ensure_ascii=False)
+
+
+class _ManipuladorFila(QueueHandler):
+    """QueueHandler que mantém a exceção separada da mensagem"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A mensagem é resolvida aqui (os argumentos podem mudar depois), mas a
+        # formatação final fica com os handlers da thread do QueueListener
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_ouvinte: Optional[QueueListener] = None
+
+
+def configurar_logging(
+    diretorio: str = LOG_DIR,
+    arquivo: str = LOG_FILE,
+    nivel: str = LOG_NIVEL,
+    formato_json: bool = LOG_JSON
+) -> QueueListener:
+    """
+    Liga o logger raiz a uma fila gravada em segundo plano
+
+    Chamadas repetidas substituem a configuração anterior (a fila antiga é
+    esvaziada antes).
+
+    Args:
+        diretorio: Diretório do arquivo de log
+        arquivo: Nome do arquivo de log (rotacionado a cada LOG_MAX_BYTES)
+        nivel: Nível mínimo (ex: "INFO", "DEBUG")
+        formato_json: Se True, o arquivo recebe JSON lines; o console continua em texto
+
+    Returns:
+        QueueListener em execução (parado automaticamente ao sair)
+    """
+    global _ouvinte
+
+    parar_logging()
+    os.makedirs(diretorio, exist_ok=True)
+
+    texto = logging.Formatter(LOG_FORMAT)
+    manipulador_arquivo = RotatingFileHandler(
+        os.path.join(diretorio, arquivo),
+        maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8'
+    )
+    manipulador_arquivo.setFormatter(FormatadorJSON() if formato_json else texto)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(texto)
+
+    fila: queue.SimpleQueue = queue.SimpleQueue()
+    raiz = logging.getLogger()
+    for manipulador in list(raiz.handlers):
+        raiz.removeHandler(manipulador)
+    raiz.addHandler(_ManipuladorFila(fila))
+    raiz.setLevel(nivel.upper())
+
+    _ouvinte = QueueListener(fila, manipulador_arquivo, console, respect_handler_level=True)
+    _ouvinte.start()
+    return _ouvinte
+
+
+def parar_logging() -> None:
+    """Esvazia a fila e para a thread de gravação (registrado no atexit)"""
+    global _ouvinte
+
+    if _ouvinte is not None:
+        _ouvinte.stop()
+        for manipulador in _ouvinte.handlers:
+            manipulador.close()
+        _ouvinte = None
+
+
+atexit.register(parar_logging)
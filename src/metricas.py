@@ -0,0 +1,227 @@
+"""
+Métricas de cada execução do bot
+
+Uma execução (Metricas) acumula o tempo de cada etapa (coleta, parse,
+detecção de mudança, formatação, postagem e gravação do cache), cada
+download (tempo, bytes e origem: rede, 304 ou cache) e o resultado dos
+posts de cada clube. No fim é exportada como textfile do Prometheus (lido
+pelo collector textfile do node_exporter) e como resumo JSON.
+"""
+import json
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Any, Iterator
+from pathlib import Path
+
+from config.settings import METRICAS_PROM, METRICAS_JSON
+from src.cache import escrever_atomico
+
+logger = logging.getLogger(__name__)
+
+PREFIXO = "vitoria_bot"
+MODO_ARQUIVOS = 0o644  # O node_exporter costuma rodar com outro usuário
+
+
+def _rotulos(**rotulos: str) -> str:
+    """Formata os rótulos de uma amostra do Prometheus"""
+    if not rotulos:
+        return ""
+    escapados = []
+    for nome, valor in sorted(rotulos.items()):
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escapados.append(f'{nome}="{valor}"')
+    return "{" + ",".join(escapados) + "}"
+
+
+class Metricas:
+    """Métricas de uma execução do bot (seguras entre threads)"""
+
+    def __init__(self):
+        self.inicio = time.time()
+        self._inicio_relogio = time.perf_counter()
+        self._trava = threading.Lock()
+        self.etapas: Dict[str, Dict[str, float]] = {}
+        self.requisicoes: List[Dict[str, Any]] = []
+        self.posts: List[Dict[str, str]] = []
+        self.duracao: Optional[float] = None
+        self.sucesso: Optional[bool] = None
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        """
+        Mede o tempo de parede de um bloco
+
+        Args:
+            nome: Nome da etapa (o tempo de chamadas repetidas é somado)
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_etapa(nome, time.perf_counter() - inicio)
+
+    def registrar_etapa(self, nome: str, segundos: float) -> None:
+        """Soma o tempo de uma etapa"""
+        with self._trava:
+            etapa = self.etapas.setdefault(nome, {"segundos": 0.0, "vezes": 0})
+            etapa["segundos"] += segundos
+            etapa["vezes"] += 1
+
+    def registrar_requisicao(self, pagina: str, segundos: float, origem: str, bytes_baixados: int) -> None:
+        """
+        Registra o download de uma página
+
+        Args:
+            pagina: Chave da página em URLS
+            segundos: Tempo de parede do download
+            origem: "rede", "304", "cache" (cache HTTP fresco) ou "erro"
+            bytes_baixados: Bytes do corpo lido da rede
+        """
+        with self._trava:
+            self.requisicoes.append({
+                "pagina": pagina,
+                "segundos": segundos,
+                "origem": origem,
+                "bytes": bytes_baixados,
+            })
+
+    def registrar_post(self, clube: str, resultado: str) -> None:
+        """
+        Registra o resultado do post de um clube
+
+        Args:
+            clube: Nome do clube
+            resultado: "publicado", "parcial", "pendente", "falhou", "erro",
+                "inalterado" ou "teste"
+        """
+        with self._trava:
+            self.posts.append({"clube": clube, "resultado": resultado})
+
+    def finalizar(self, sucesso: bool) -> None:
+        """Fecha a execução com o resultado geral"""
+        self.duracao = time.perf_counter() - self._inicio_relogio
+        self.sucesso = sucesso
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Resumo da execução
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        with self._trava:
+            origens: Dict[str, int] = {}
+            for requisicao in self.requisicoes:
+                origens[requisicao["origem"]] = origens.get(requisicao["origem"], 0) + 1
+            return {
+                "inicio": self.inicio,
+                "duracao_segundos": self.duracao,
+                "sucesso": self.sucesso,
+                "etapas": {nome: dict(etapa) for nome, etapa in self.etapas.items()},
+                "requisicoes": [dict(r) for r in self.requisicoes],
+                "paginas_por_origem": origens,
+                "bytes_baixados": sum(r["bytes"] for r in self.requisicoes),
+                "posts": [dict(p) for p in self.posts],
+            }
+
+    def para_prometheus(self) -> str:
+        """
+        Formata a execução no formato texto do Prometheus
+
+        Todas as métricas são gauges com os valores da última execução.
+
+        Returns:
+            Conteúdo do textfile
+        """
+        resumo = self.resumo()
+        linhas: List[str] = []
+
+        def metrica(nome: str, ajuda: str, amostras: List[tuple]) -> None:
+            # Amostras com os mesmos rótulos são somadas: séries repetidas invalidam o arquivo
+            somas: Dict[str, float] = {}
+            for rotulos, valor in amostras:
+                chave = _rotulos(**rotulos)
+                somas[chave] = somas.get(chave, 0) + valor
+            linhas.append(f"# HELP {PREFIXO}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {PREFIXO}_{nome} gauge")
+            for rotulos, valor in somas.items():
+                linhas.append(f"{PREFIXO}_{nome}{rotulos} {round(valor, 6)}")
+
+        metrica("execucao_inicio_timestamp_segundos", "Início da última execução (Unix)",
+                [({}, resumo["inicio"])])
+        if resumo["duracao_segundos"] is not None:
+            metrica("execucao_duracao_segundos", "Duração total da última execução",
+                    [({}, resumo["duracao_segundos"])])
+        if resumo["sucesso"] is not None:
+            metrica("execucao_sucesso", "1 se a última execução terminou sem erros",
+                    [({}, int(resumo["sucesso"]))])
+        metrica("etapa_duracao_segundos", "Tempo de parede de cada etapa na última execução",
+                [({"etapa": nome}, e["segundos"]) for nome, e in sorted(resumo["etapas"].items())])
+        metrica("requisicao_duracao_segundos", "Tempo de download de cada página do UFMG",
+                [({"pagina": r["pagina"], "origem": r["origem"]}, r["segundos"])
+                 for r in resumo["requisicoes"]])
+        metrica("requisicao_bytes", "Bytes lidos da rede para cada página",
+                [({"pagina": r["pagina"]}, r["bytes"]) for r in resumo["requisicoes"]])
+        metrica("paginas", "Páginas por origem (rede, 304, cache ou erro)",
+                [({"origem": origem}, total) for origem, total in sorted(resumo["paginas_por_origem"].items())])
+        metrica("posts", "Posts da última execução por clube e resultado",
+                [({"clube": p["clube"], "resultado": p["resultado"]}, 1) for p in resumo["posts"]])
+
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho_prom: Optional[str] = METRICAS_PROM,
+                 caminho_json: Optional[str] = METRICAS_JSON) -> None:
+        """
+        Grava o textfile do Prometheus e o resumo JSON (de forma atômica)
+
+        Os arquivos ficam legíveis por todos (MODO_ARQUIVOS), para o collector
+        textfile do node_exporter. Um erro na exportação é registrado no log
+        sem interromper o bot.
+
+        Args:
+            caminho_prom: Arquivo .prom (vazio desativa)
+            caminho_json: Arquivo JSON (vazio desativa)
+        """
+        try:
+            if caminho_prom:
+                escrever_atomico(Path(caminho_prom), self.para_prometheus(), MODO_ARQUIVOS)
+            if caminho_json:
+                escrever_atomico(
+                    Path(caminho_json),
+                    json.dumps(self.resumo(), ensure_ascii=False, indent=2),
+                    MODO_ARQUIVOS
+                )
+        except Exception as e:
+            logger.error("Erro ao exportar métricas: %s", e)
+
+
+_atual: Optional[Metricas] = None
+
+
+def metricas_atuais() -> Metricas:
+    """
+    Retorna as métricas da execução em andamento
+
+    Returns:
+        Instância criada por nova_execucao (ou uma nova, se nenhuma execução foi iniciada)
+    """
+    global _atual
+
+    if _atual is None:
+        _atual = Metricas()
+    return _atual
+
+
+def nova_execucao() -> Metricas:
+    """
+    Inicia as métricas de uma nova execução (cada ciclo do daemon é uma execução)
+
+    Returns:
+        Métricas vazias, que passam a ser as atuais
+    """
+    global _atual
+
+    _atual = Metricas()
+    return _atual
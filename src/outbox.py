@@ -0,0 +1,575 @@
+"""
+Fila persistente de posts (outbox) em SQLite
+
+Cada post gerado é gravado na fila com uma chave de idempotência derivada
+dos dados do clube antes de qualquer chamada à API. O envio drena a fila
+tweet a tweet, gravando o ID de cada parte assim que a API responde: uma
+thread interrompida no meio continua da parte seguinte, e dados já
+publicados nunca são enviados de novo.
+
+Com vários canais (src/publicadores.py) o post é despachado para todos ao
+mesmo tempo e o progresso é gravado por canal (entregas): um canal lento
+ou fora do ar fica pendente sozinho, sem atrasar os outros nem a gravação
+do cache, e só ele é retentado nas execuções seguintes.
+"""
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+import logging
+from concurrent.futures import Future, wait
+from typing import Optional, Dict, List, Any, Callable, Set, Tuple
+from pathlib import Path
+
+from config.settings import (
+    OUTBOX_DB, OUTBOX_TENTATIVAS, OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX,
+    OUTBOX_ESPERA_MAX, DESPACHO_MAX_CONCORRENCIA, DESPACHO_TIMEOUT
+)
+from src.tabela import normalizar_texto
+from src.resiliencia import prazo_atual
+
+logger = logging.getLogger(__name__)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    chave TEXT PRIMARY KEY,
+    clube TEXT NOT NULL,
+    textos TEXT NOT NULL,
+    dados TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    criado_em REAL NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima_tentativa REAL NOT NULL DEFAULT 0,
+    ultimo_erro TEXT,
+    registrado INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_posts_pendentes ON posts (clube, estado, criado_em);
+
+CREATE TABLE IF NOT EXISTS entregas (
+    chave TEXT NOT NULL REFERENCES posts (chave),
+    destino TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima_tentativa REAL NOT NULL DEFAULT 0,
+    ultimo_erro TEXT,
+    PRIMARY KEY (chave, destino)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS partes (
+    chave TEXT NOT NULL REFERENCES posts (chave),
+    destino TEXT NOT NULL DEFAULT 'twitter',
+    indice INTEGER NOT NULL,
+    tweet_id TEXT,
+    publicado_em REAL NOT NULL,
+    PRIMARY KEY (chave, destino, indice)
+) WITHOUT ROWID;
+"""
+
+PENDENTE = "pendente"
+PUBLICADO = "publicado"
+FALHOU = "falhou"
+SUBSTITUIDO = "substituido"  # Pendente sem nenhuma parte enviada, superado por dados mais novos
+
+
+def chave_idempotencia(
+    clube: str,
+    classificacao: Optional[Dict],
+    probabilidades: Dict[str, Optional[str]],
+    unico: Optional[str] = None
+) -> str:
+    """
+    Deriva a chave de idempotência de um post a partir dos dados publicados
+
+    Args:
+        clube: Nome do clube
+        classificacao: Dados da classificação do post
+        probabilidades: Probabilidades do post
+        unico: Valor extra para posts que devem sair mesmo com dados repetidos (--force)
+
+    Returns:
+        Chave hexadecimal
+    """
+    conteudo = json.dumps(
+        {
+            "clube": normalizar_texto(clube),
+            "classificacao": classificacao,
+            "probabilidades": probabilidades,
+            "unico": unico,
+        },
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:32]
+
+
+def classificar_erro(erro: Exception) -> str:
+    """
+    Classifica um erro de envio
+
+    Usa o status HTTP da resposta anexada à exceção (tweepy.HTTPException ou
+    requests.HTTPError), sem depender do tweepy.
+
+    Args:
+        erro: Exceção levantada por Publicador.enviar
+
+    Returns:
+        "limite" (429), "duplicado" (403 de conteúdo repetido: já publicado),
+        "permanente" (demais 4xx) ou "transitorio" (5xx e erros de rede)
+    """
+    resposta = getattr(erro, "response", None)
+    status = getattr(resposta, "status_code", None)
+
+    if status == 429:
+        return "limite"
+    if status == 403 and "duplicate" in str(erro).lower():
+        return "duplicado"
+    if status is not None and 400 <= status < 500:
+        return "permanente"
+    return "transitorio"
+
+
+def espera_limite(erro: Exception, agora: Optional[float] = None) -> float:
+    """
+    Calcula quanto esperar após um 429 pelos cabeçalhos de rate limit
+
+    Args:
+        erro: Exceção com a resposta 429
+        agora: Timestamp atual (padrão: agora)
+
+    Returns:
+        Segundos até x-rate-limit-reset (ou Retry-After); OUTBOX_BACKOFF_MAX se ausentes
+    """
+    cabecalhos = getattr(getattr(erro, "response", None), "headers", None) or {}
+    agora = agora if agora is not None else time.time()
+
+    reset = cabecalhos.get("x-rate-limit-reset")
+    if reset and str(reset).isdigit():
+        return max(0.0, int(reset) - agora + 1)
+
+    retry_after = cabecalhos.get("Retry-After")
+    if retry_after and str(retry_after).isdigit():
+        return float(retry_after)
+
+    return OUTBOX_BACKOFF_MAX
+
+
+def _espera_backoff(tentativa: int) -> float:
+    """Backoff exponencial com jitter para erros transitórios da API"""
+    return random.uniform(0, min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** (tentativa - 1)))
+
+
+class Outbox:
+    """Fila persistente dos posts de todos os clubes"""
+
+    def __init__(self, caminho: str = OUTBOX_DB):
+        """
+        Abre (ou cria) a fila
+
+        Args:
+            caminho: Arquivo SQLite (":memory:" para testes)
+        """
+        if caminho != ":memory:":
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        self.caminho = caminho
+        # A conexão é compartilhada pelas threads do despacho, serializadas pela trava
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.row_factory = sqlite3.Row
+        self._trava = threading.RLock()
+        # (chave, destino) com thread de envio viva, mesmo depois do timeout do despacho
+        self._em_andamento: Set[Tuple[str, str]] = set()
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript(ESQUEMA)
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco"""
+        with self._trava:
+            self.conexao.close()
+
+    def enfileirar(
+        self,
+        chave: str,
+        clube: str,
+        textos: List[str],
+        dados: Dict[str, Any]
+    ) -> str:
+        """
+        Grava um post na fila, se a chave ainda não existir
+
+        Posts pendentes mais antigos do clube que ainda não tiveram nenhuma
+        parte enviada são substituídos pelo novo (dados desatualizados não
+        são publicados). Um post que falhou de forma permanente ou que foi
+        substituído volta a ficar pendente: se os dados voltarem a ser os de
+        um post substituído (A, depois B, depois A de novo), A é retomado e B
+        passa a ser o substituído.
+
+        Args:
+            chave: Chave de idempotência (chave_idempotencia)
+            clube: Nome do clube
+            textos: Tweets do post (mais de um = thread)
+            dados: Dados gravados no cache quando o post for publicado
+
+        Returns:
+            Estado do post na fila ("pendente", "publicado" ou "falhou")
+        """
+        clube = normalizar_texto(clube)
+        with self._trava, self.conexao:
+            cursor = self.conexao.execute(
+                "INSERT INTO posts (chave, clube, textos, dados, criado_em) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (chave) DO UPDATE SET estado = 'pendente', proxima_tentativa = 0 "
+                "WHERE estado IN ('falhou', 'substituido')",
+                (chave, clube, json.dumps(textos, ensure_ascii=False),
+                 json.dumps(dados, ensure_ascii=False), time.time())
+            )
+            if cursor.rowcount:
+                self.conexao.execute(
+                    "UPDATE entregas SET estado = ?, proxima_tentativa = 0 WHERE chave = ? AND estado != ?",
+                    (PENDENTE, chave, PUBLICADO)
+                )
+                substituidos = self.conexao.execute(
+                    "UPDATE posts SET estado = ? WHERE clube = ? AND estado = ? AND chave != ? "
+                    "AND chave NOT IN (SELECT chave FROM partes)",
+                    (SUBSTITUIDO, clube, PENDENTE, chave)
+                ).rowcount
+                if substituidos:
+                    logger.info("%s post(s) pendente(s) de %s substituído(s) por %s", substituidos, clube, chave)
+        return self.estado(chave)
+
+    def estado(self, chave: str) -> Optional[str]:
+        """Retorna o estado de um post ou None se a chave não existir"""
+        with self._trava:
+            linha = self.conexao.execute(
+                "SELECT estado FROM posts WHERE chave = ?", (chave,)
+            ).fetchone()
+        return linha["estado"] if linha else None
+
+    def pendentes(self, clube: str) -> List[Dict[str, Any]]:
+        """
+        Retorna os posts pendentes de um clube, do mais antigo ao mais novo
+
+        Args:
+            clube: Nome do clube
+
+        Returns:
+            Lista de posts com chave, clube, textos, dados, tentativas e proxima_tentativa
+        """
+        with self._trava:
+            linhas = self.conexao.execute(
+                "SELECT * FROM posts WHERE clube = ? AND estado = ? ORDER BY criado_em",
+                (normalizar_texto(clube), PENDENTE)
+            ).fetchall()
+        return [
+            {**dict(linha), "textos": json.loads(linha["textos"]), "dados": json.loads(linha["dados"])}
+            for linha in linhas
+        ]
+
+    def entregas(self, chave: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna o andamento de um post em cada canal
+
+        Args:
+            chave: Chave do post
+
+        Returns:
+            Dicionário {canal: {estado, tentativas, proxima_tentativa, ultimo_erro}}
+        """
+        with self._trava:
+            linhas = self.conexao.execute(
+                "SELECT * FROM entregas WHERE chave = ?", (chave,)
+            ).fetchall()
+        return {linha["destino"]: dict(linha) for linha in linhas}
+
+    def _partes_publicadas(self, chave: str, destino: str) -> Dict[int, Optional[str]]:
+        with self._trava:
+            return dict(self.conexao.execute(
+                "SELECT indice, tweet_id FROM partes WHERE chave = ? AND destino = ?", (chave, destino)
+            ).fetchall())
+
+    def _registrar_parte(self, chave: str, destino: str, indice: int, tweet_id: Optional[str]) -> None:
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO partes (chave, destino, indice, tweet_id, publicado_em) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (chave, destino, indice, tweet_id, time.time())
+            )
+
+    def _atualizar(self, chave: str, destino: str, estado: str, erro: Optional[str] = None,
+                   proxima_tentativa: float = 0) -> None:
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                "INSERT INTO entregas (chave, destino, estado, tentativas, proxima_tentativa, ultimo_erro) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (chave, destino) DO UPDATE SET "
+                "estado = excluded.estado, ultimo_erro = excluded.ultimo_erro, "
+                "proxima_tentativa = excluded.proxima_tentativa, "
+                "tentativas = tentativas + excluded.tentativas",
+                (chave, destino, estado, 0 if estado == PUBLICADO else 1, proxima_tentativa, erro)
+            )
+
+    def enviar(self, post: Dict[str, Any], publicador: Any, prazo: Optional[float] = None) -> str:
+        """
+        Envia a um canal as partes ainda não publicadas de um post
+
+        Erros transitórios são retentados com backoff até OUTBOX_TENTATIVAS
+        vezes; um 429 espera o reset do rate limit se ele couber em
+        OUTBOX_ESPERA_MAX e no prazo. Caso contrário o canal continua
+        pendente, com a próxima tentativa agendada.
+
+        Args:
+            post: Post retornado por pendentes
+            publicador: Canal (src.publicadores.Publicador)
+            prazo: Instante (time.monotonic) a partir do qual não se espera mais para retentar
+
+        Returns:
+            Estado do post no canal ("publicado", "pendente" ou "falhou")
+        """
+        chave, destino = post["chave"], publicador.nome
+        publicadas = self._partes_publicadas(chave, destino)
+        anterior = None
+
+        for indice, texto in enumerate(post["textos"]):
+            if indice in publicadas:
+                anterior = publicadas[indice] or anterior
+                continue
+
+            for tentativa in range(1, OUTBOX_TENTATIVAS + 1):
+                try:
+                    publicador.limitar()
+                    dados = publicador.enviar(texto, responder_a=anterior, chave=f"{chave}-{indice}")
+                except Exception as e:
+                    tipo = classificar_erro(e)
+                    if tipo == "duplicado":
+                        logger.warning("Parte %s do post %s já estava no %s: %s", indice + 1, chave, destino, e)
+                        self._registrar_parte(chave, destino, indice, None)
+                        break
+                    if tipo == "permanente":
+                        logger.error("Erro permanente ao postar %s no %s: %s", chave, destino, e)
+                        self._atualizar(chave, destino, FALHOU, str(e))
+                        return FALHOU
+
+                    espera = espera_limite(e) if tipo == "limite" else _espera_backoff(tentativa)
+                    sem_prazo = prazo is not None and time.monotonic() + espera > prazo
+                    if tentativa == OUTBOX_TENTATIVAS or espera > OUTBOX_ESPERA_MAX or sem_prazo:
+                        logger.warning(
+                            "Post %s continua na fila do %s (%s: %s) - próxima tentativa em %.0fs",
+                            chave, destino, tipo, e, espera
+                        )
+                        self._atualizar(chave, destino, PENDENTE, str(e), time.time() + espera)
+                        return PENDENTE
+
+                    logger.warning(
+                        "Erro %s ao postar %s no %s (tentativa %s/%s): %s - nova tentativa em %.2fs",
+                        tipo, chave, destino, tentativa, OUTBOX_TENTATIVAS, e, espera
+                    )
+                    time.sleep(espera)
+                else:
+                    anterior = (dados or {}).get("id")
+                    self._registrar_parte(chave, destino, indice, anterior)
+                    break
+
+        self._atualizar(chave, destino, PUBLICADO)
+        logger.info("Post %s publicado no %s (%s partes)", chave, destino, len(post['textos']))
+        return PUBLICADO
+
+    def despachar(self, post: Dict[str, Any], publicadores: List[Any]) -> str:
+        """
+        Envia um post a todos os canais ao mesmo tempo
+
+        No máximo DESPACHO_MAX_CONCORRENCIA canais publicam em paralelo e o
+        despacho inteiro tem DESPACHO_TIMEOUT segundos, ou o que resta do
+        prazo da execução (src/resiliencia.py), se for menos. Um canal que não
+        termina no prazo tem a tentativa registrada como falha e continua
+        pendente, sem segurar os demais; os que nem começaram são cancelados.
+        Cada canal roda em uma thread daemon: um envio travado termina (e
+        fica gravado) em segundo plano, mas não impede o processo de sair.
+        Canais já concluídos, agendados para depois (rate limit) ou com um
+        envio anterior ainda em andamento não são chamados.
+
+        Args:
+            post: Post retornado por pendentes
+            publicadores: Canais de destino
+
+        Returns:
+            Estado consolidado: "pendente" se algum canal ainda falta,
+            "publicado" se ao menos um publicou, senão "falhou"
+        """
+        chave = post["chave"]
+        entregas = self.entregas(chave)
+        agora = time.time()
+        with self._trava:
+            a_enviar = [
+                p for p in publicadores
+                if entregas.get(p.nome, {}).get("estado", PENDENTE) == PENDENTE
+                and entregas.get(p.nome, {}).get("proxima_tentativa", 0) <= agora
+                and (chave, p.nome) not in self._em_andamento
+            ]
+            # Reservados antes de a thread existir: outro despacho não reenvia o post
+            self._em_andamento.update((chave, p.nome) for p in a_enviar)
+
+        if a_enviar:
+            limite = DESPACHO_TIMEOUT
+            prazo_execucao = prazo_atual()
+            if prazo_execucao is not None:
+                limite = max(0.0, min(limite, prazo_execucao.restante()))
+            prazo = time.monotonic() + limite
+            vagas = threading.Semaphore(DESPACHO_MAX_CONCORRENCIA)
+            futuros: Dict[Future, str] = {}
+            for publicador in a_enviar:
+                futuro: Future = Future()
+                futuros[futuro] = publicador.nome
+                threading.Thread(
+                    target=self._enviar_em_segundo_plano,
+                    args=(post, publicador, prazo, vagas, futuro),
+                    name=f"despacho-{publicador.nome}", daemon=True
+                ).start()
+
+            _, atrasados = wait(futuros, timeout=max(0.0, prazo - time.monotonic()))
+            for futuro in atrasados:
+                destino = futuros[futuro]
+                if not futuro.cancel() and futuro.done():
+                    continue  # Terminou entre o fim da espera e agora
+                logger.warning(
+                    "%s não respondeu em %ss: post %s continua pendente nesse canal",
+                    destino, round(limite, 1), chave
+                )
+                self._expirar(chave, destino, f"sem resposta em {round(limite, 1)}s")
+            for futuro, destino in futuros.items():
+                if futuro.done() and not futuro.cancelled() and futuro.exception():
+                    logger.error("Erro inesperado ao despachar %s para %s: %s", chave, destino, futuro.exception())
+
+        return self._consolidar(chave, [p.nome for p in publicadores])
+
+    def _enviar_em_segundo_plano(
+        self,
+        post: Dict[str, Any],
+        publicador: Any,
+        prazo: float,
+        vagas: threading.Semaphore,
+        futuro: Future
+    ) -> None:
+        """Corpo da thread de um canal: espera uma vaga e envia, se o despacho não desistiu antes"""
+        try:
+            with vagas:
+                if not futuro.set_running_or_notify_cancel():
+                    return
+                try:
+                    futuro.set_result(self.enviar(post, publicador, prazo))
+                except BaseException as e:
+                    futuro.set_exception(e)
+        finally:
+            with self._trava:
+                self._em_andamento.discard((post["chave"], publicador.nome))
+
+    def _expirar(self, chave: str, destino: str, erro: str) -> None:
+        """Registra como tentativa falha um canal que passou do prazo (se ainda estiver pendente)"""
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                "INSERT INTO entregas (chave, destino, estado, tentativas, ultimo_erro) "
+                "VALUES (?, ?, ?, 1, ?) ON CONFLICT (chave, destino) DO UPDATE SET "
+                "ultimo_erro = excluded.ultimo_erro, proxima_tentativa = 0, "
+                "tentativas = tentativas + 1 WHERE estado = ?",
+                (chave, destino, PENDENTE, erro, PENDENTE)
+            )
+
+    def _consolidar(self, chave: str, destinos: List[str]) -> str:
+        entregas = self.entregas(chave)
+        estados = [entregas.get(d, {}).get("estado", PENDENTE) for d in destinos]
+
+        proxima = 0
+        if PENDENTE in estados:
+            estado = PENDENTE
+            proxima = min(entregas.get(d, {}).get("proxima_tentativa", 0)
+                          for d, e in zip(destinos, estados) if e == PENDENTE)
+        elif PUBLICADO in estados:
+            estado = PUBLICADO
+        else:
+            estado = FALHOU
+
+        erros = "; ".join(
+            f"{d}: {entregas[d]['ultimo_erro']}" for d in destinos
+            if d in entregas and entregas[d]["estado"] != PUBLICADO and entregas[d]["ultimo_erro"]
+        )
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                "UPDATE posts SET estado = ?, ultimo_erro = ?, proxima_tentativa = ?, "
+                "tentativas = tentativas + ? WHERE chave = ?",
+                (estado, erros or None, proxima, 0 if estado == PUBLICADO else 1, chave)
+            )
+        return estado
+
+    def _registrar(self, chave: str) -> bool:
+        """
+        Marca que o cache do post pode ser gravado
+
+        Vale quando algum canal já publicou e nenhum post mais novo do
+        clube foi registrado antes (o cache nunca volta para dados antigos).
+
+        Returns:
+            True se o post foi marcado agora
+        """
+        with self._trava, self.conexao:
+            return self.conexao.execute(
+                "UPDATE posts SET registrado = 1 WHERE chave = ? AND registrado = 0 "
+                "AND EXISTS (SELECT 1 FROM entregas e WHERE e.chave = posts.chave AND e.estado = ?) "
+                "AND NOT EXISTS (SELECT 1 FROM posts novo WHERE novo.clube = posts.clube "
+                "AND novo.registrado = 1 AND novo.criado_em > posts.criado_em)",
+                (chave, PUBLICADO)
+            ).rowcount > 0
+
+    def drenar(
+        self,
+        clube: str,
+        obter_publicadores: Callable[[], List[Any]],
+        ao_publicar: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, str]:
+        """
+        Envia os posts pendentes de um clube em ordem de criação
+
+        Posts agendados para depois (rate limit) são mantidos na fila. O
+        cache é gravado (ao_publicar) assim que o primeiro canal publica,
+        mesmo que outros continuem pendentes.
+
+        Args:
+            clube: Nome do clube
+            obter_publicadores: Função que cria os canais (chamada só se houver o que enviar)
+            ao_publicar: Chamada com cada post publicado (grava cache e histórico)
+
+        Returns:
+            Dicionário {chave: estado final} dos posts processados
+        """
+        resultados: Dict[str, str] = {}
+        publicadores = None
+        agora = time.time()
+
+        for post in self.pendentes(clube):
+            if post["proxima_tentativa"] > agora:
+                logger.info(
+                    "Post %s adiado até %s",
+                    post['chave'], time.strftime('%H:%M:%S', time.localtime(post['proxima_tentativa']))
+                )
+                resultados[post["chave"]] = PENDENTE
+                continue
+
+            if publicadores is None:
+                publicadores = obter_publicadores()
+            resultados[post["chave"]] = self.despachar(post, publicadores)
+            if self._registrar(post["chave"]) and ao_publicar:
+                ao_publicar(post)
+
+        return resultados
+
+
+_outbox_padrao: Optional[Outbox] = None
+
+
+def outbox_padrao() -> Outbox:
+    """
+    Retorna a fila configurada em config/settings.py
+
+    Returns:
+        Instância compartilhada de Outbox (em memória se OUTBOX_DB estiver vazio)
+    """
+    global _outbox_padrao
+
+    if _outbox_padrao is None:
+        _outbox_padrao = Outbox(OUTBOX_DB or ":memory:")
+    return _outbox_padrao
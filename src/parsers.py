@@ -0,0 +1,301 @@
+"""
+Backends de parse das tabelas do UFMG
+
+Cada backend recebe o HTML da página e devolve (cabeçalho, linhas) da
+primeira <table>, no mesmo formato de scraper.extrair_celulas.
+"""
+from html.parser import HTMLParser
+import re
+from typing import Optional, List, Tuple, Callable, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+Celulas = Tuple[List[str], List[List[str]]]
+
+_INICIO_TABELA = re.compile(r"<table[\s>]", re.IGNORECASE)
+_TAG_TABELA = re.compile(r"<(/?)table[\s>]", re.IGNORECASE)
+TAMANHO_PEDACO = 8192
+
+
+def limites_tabela(html: str) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Localiza a primeira <table> sem parsear o HTML
+
+    Args:
+        html: Conteúdo (completo ou parcial) da página
+
+    Returns:
+        Tupla com (início, fim) da tabela, com fim None se ela ainda não foi
+        fechada, ou None se não houver <table>
+    """
+    inicio = None
+    profundidade = 0
+
+    for tag in _TAG_TABELA.finditer(html):
+        if not tag.group(1):
+            if inicio is None:
+                inicio = tag.start()
+            profundidade += 1
+        elif inicio is not None:
+            profundidade -= 1
+            if profundidade == 0:
+                return inicio, tag.end()
+
+    return None if inicio is None else (inicio, None)
+
+
+def trecho_tabela(html: str) -> Optional[str]:
+    """
+    Retorna o HTML da primeira <table> (até o fim do texto se não fechada)
+
+    Args:
+        html: Conteúdo da página
+
+    Returns:
+        Trecho com a tabela ou None se não houver <table>
+    """
+    limites = limites_tabela(html)
+    if limites is None:
+        return None
+    inicio, fim = limites
+    return html[inicio:fim]
+
+
+class ParserTabela(HTMLParser):
+    """
+    Parser incremental que extrai apenas as linhas da primeira <table>
+
+    Ignora todo o HTML fora da tabela e não monta árvore: cada <tr> vira
+    diretamente uma lista de textos. Pode ser alimentado em pedaços com
+    feed(); o atributo concluido indica que a tabela já foi fechada.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cabecalho: List[str] = []
+        self.linhas: List[List[str]] = []
+        self.encontrou_tabela = False
+        self.concluido = False
+        self._profundidade = 0
+        self._linha: Optional[List[Tuple[str, str]]] = None
+        self._celula: Optional[str] = None
+        self._textos: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.concluido:
+            return
+        if tag == "table":
+            self.encontrou_tabela = True
+            self._profundidade += 1
+        elif self._profundidade == 0:
+            return
+        elif tag == "tr":
+            self._fechar_linha()
+            self._linha = []
+        elif tag in ("td", "th"):
+            self._fechar_celula()
+            if self._linha is None:
+                self._linha = []
+            self._celula = tag
+            self._textos = []
+
+    def handle_endtag(self, tag):
+        if self.concluido or self._profundidade == 0:
+            return
+        if tag in ("td", "th"):
+            self._fechar_celula()
+        elif tag == "tr":
+            self._fechar_linha()
+        elif tag == "table":
+            self._profundidade -= 1
+            if self._profundidade == 0:
+                self._fechar_linha()
+                self.concluido = True
+
+    def handle_data(self, data):
+        if self._celula is not None:
+            texto = data.strip()
+            if texto:
+                self._textos.append(texto)
+
+    def _fechar_celula(self) -> None:
+        if self._celula is not None and self._linha is not None:
+            self._linha.append((self._celula, "".join(self._textos)))
+        self._celula = None
+        self._textos = []
+
+    def _fechar_linha(self) -> None:
+        self._fechar_celula()
+        if self._linha is None:
+            return
+        tds = [texto for tag, texto in self._linha if tag == "td"]
+        if tds:
+            self.linhas.append(tds)
+        elif not self.cabecalho:
+            self.cabecalho = [texto for tag, texto in self._linha if tag == "th"]
+        self._linha = None
+
+    def resultado(self) -> Optional[Celulas]:
+        """Retorna (cabeçalho, linhas) ou None se nenhuma tabela foi encontrada"""
+        if not self.encontrou_tabela:
+            return None
+        self._fechar_linha()
+        return self.cabecalho, self.linhas
+
+
+class LeitorIncremental:
+    """
+    Alimenta um ParserTabela com pedaços de texto vindos da rede
+
+    O texto anterior ao primeiro <table> é descartado sem ser tokenizado.
+    """
+
+    def __init__(self):
+        self.parser = ParserTabela()
+        self._iniciado = False
+        self._pendente = ""
+
+    def alimentar(self, texto: str) -> None:
+        """
+        Processa mais um pedaço do HTML
+
+        Args:
+            texto: Pedaço de texto já decodificado
+        """
+        if not self._iniciado:
+            self._pendente += texto
+            inicio = _INICIO_TABELA.search(self._pendente)
+            if inicio is None:
+                # Mantém o final caso "<table" esteja dividido entre dois pedaços
+                self._pendente = self._pendente[-7:]
+                return
+            self._iniciado = True
+            texto = self._pendente[inicio.start():]
+            self._pendente = ""
+        self.parser.feed(texto)
+
+    @property
+    def concluido(self) -> bool:
+        """Indica se a primeira tabela já foi fechada"""
+        return self.parser.concluido
+
+    @property
+    def linhas(self) -> List[List[str]]:
+        """Linhas de dados lidas até agora"""
+        return self.parser.linhas
+
+    def resultado(self) -> Optional[Celulas]:
+        """Retorna (cabeçalho, linhas) ou None se nenhuma tabela foi encontrada"""
+        return self.parser.resultado()
+
+
+def celulas_htmlparser(html: str) -> Optional[Celulas]:
+    """
+    Extrai as células com o parser dedicado baseado em html.parser
+
+    Só o trecho a partir do primeiro <table> é tokenizado, e o parse para
+    assim que a tabela é fechada.
+
+    Args:
+        html: Conteúdo da página
+
+    Returns:
+        Tupla com (cabeçalho, linhas) ou None se não houver tabela
+    """
+    inicio = _INICIO_TABELA.search(html)
+    if inicio is None:
+        return None
+
+    parser = ParserTabela()
+    for posicao in range(inicio.start(), len(html), TAMANHO_PEDACO):
+        parser.feed(html[posicao:posicao + TAMANHO_PEDACO])
+        if parser.concluido:
+            break
+    return parser.resultado()
+
+
+def celulas_bs4(html: str) -> Optional[Celulas]:
+    """
+    Extrai as células montando a árvore completa com BeautifulSoup
+
+    Args:
+        html: Conteúdo da página
+
+    Returns:
+        Tupla com (cabeçalho, linhas) ou None se não houver tabela
+    """
+    from bs4 import BeautifulSoup
+    from src.scraper import extrair_celulas
+
+    return extrair_celulas(BeautifulSoup(html, "html.parser"))
+
+
+def celulas_lxml(html: str) -> Optional[Celulas]:
+    """
+    Extrai as células com lxml (dependência opcional)
+
+    Args:
+        html: Conteúdo da página
+
+    Returns:
+        Tupla com (cabeçalho, linhas) ou None se não houver tabela
+
+    Raises:
+        ImportError: Se lxml não estiver instalado
+    """
+    import lxml.html
+
+    tabela = lxml.html.fromstring(html).find(".//table")
+    if tabela is None:
+        return None
+
+    def texto(celula) -> str:
+        return "".join(parte.strip() for parte in celula.itertext())
+
+    cabecalho: List[str] = []
+    linhas: List[List[str]] = []
+
+    for linha in tabela.iter("tr"):
+        tds = [texto(c) for c in linha.iter("td")]
+        if tds:
+            linhas.append(tds)
+        elif not cabecalho:
+            cabecalho = [texto(c) for c in linha.iter("th")]
+
+    return cabecalho, linhas
+
+
+BACKENDS: Dict[str, Callable[[str], Optional[Celulas]]] = {
+    "htmlparser": celulas_htmlparser,
+    "lxml": celulas_lxml,
+    "bs4": celulas_bs4,
+}
+
+
+def extrair_celulas_html(html: str, backend: str) -> Optional[Celulas]:
+    """
+    Extrai as células da primeira tabela usando o backend escolhido
+
+    Se o backend não existir, não estiver instalado ou falhar, usa bs4.
+
+    Args:
+        html: Conteúdo da página
+        backend: Nome do backend ("htmlparser", "lxml" ou "bs4")
+
+    Returns:
+        Tupla com (cabeçalho, linhas) ou None se não houver tabela
+    """
+    if backend != "bs4":
+        funcao = BACKENDS.get(backend)
+        if funcao is None:
+            logger.warning("Backend de parse desconhecido: %s - usando bs4", backend)
+        else:
+            try:
+                return funcao(html)
+            except ImportError:
+                logger.warning("Backend de parse %s não instalado - usando bs4", backend)
+            except Exception as e:
+                logger.warning("Erro no backend de parse %s: %s - usando bs4", backend, e)
+
+    return celulas_bs4(html)
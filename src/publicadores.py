@@ -0,0 +1,260 @@
+"""
+Canais de publicação (Twitter, arquivo JSONL, webhook, Mastodon, Telegram)
+
+Todo canal implementa Publicador.enviar(texto, responder_a, chave) e
+levanta exceção em caso de erro; erros HTTP carregam a resposta em
+e.response (requests.HTTPError / tweepy.HTTPException), usada pela outbox
+para decidir entre retentar, esperar o rate limit ou desistir.
+"""
+import json
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, List, Callable
+from pathlib import Path
+
+from config.settings import (
+    PUBLICADORES, PUBLICADOR_ARQUIVO, WEBHOOK_URL, MASTODON_URL, MASTODON_TOKEN,
+    TELEGRAM_URL, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, REQUEST_TIMEOUT, TWITTER_CONFIG
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Publicador(ABC):
+    """Interface comum dos canais de publicação"""
+
+    nome = "publicador"
+    intervalo = 0.0  # Segundos mínimos entre dois envios ao mesmo canal
+
+    def __init__(self):
+        """Inicializa o controle do intervalo entre envios"""
+        self._trava_envio = threading.Lock()
+        self._ultimo_envio = 0.0
+
+    @abstractmethod
+    def enviar(self, texto: str, responder_a: Optional[str] = None, chave: Optional[str] = None) -> dict:
+        """
+        Publica um texto
+
+        Args:
+            texto: Conteúdo do post
+            responder_a: ID do post respondido (partes seguintes de uma thread)
+            chave: Chave de idempotência do envio (usada pelos canais que a suportam)
+
+        Returns:
+            Dados do post publicado, com o ID em "id"
+
+        Raises:
+            Exception: Qualquer erro de envio (a outbox classifica e retenta)
+        """
+
+    def limitar(self) -> None:
+        """Espera o intervalo mínimo desde o último envio a este canal"""
+        if not self.intervalo:
+            return
+        with self._trava_envio:
+            espera = self._ultimo_envio + self.intervalo - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+            self._ultimo_envio = time.monotonic()
+
+
+class PublicadorArquivo(Publicador):
+    """Anexa cada post a um arquivo JSONL (auditoria, testes e modo replay)"""
+
+    nome = "arquivo"
+
+    def __init__(self, caminho: str = PUBLICADOR_ARQUIVO):
+        """
+        Args:
+            caminho: Arquivo JSONL de destino
+        """
+        super().__init__()
+        self.caminho = Path(caminho)
+        self._proximo_id = 1
+        if self.caminho.exists():
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                self._proximo_id += sum(1 for _ in f)
+
+    def enviar(self, texto: str, responder_a: Optional[str] = None, chave: Optional[str] = None) -> dict:
+        dados = {"id": str(self._proximo_id), "text": texto}
+        self._proximo_id += 1
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.caminho, 'a', encoding='utf-8') as f:
+            registro = {**dados, "responder_a": responder_a, "chave": chave}
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        logger.info("Post %s registrado em %s", dados['id'], self.caminho)
+        return dados
+
+
+class _PublicadorHTTP(Publicador):
+    """Base dos canais que publicam com um POST JSON"""
+
+    def _post(self, url: str, corpo: Dict, cabecalhos: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Faz o POST e retorna o JSON da resposta
+
+        Raises:
+            requests.HTTPError: Status de erro (a resposta fica em e.response)
+            requests.RequestException: Erro de rede
+        """
+        from src.scraper import sessao_padrao
+
+        resposta = sessao_padrao().post(
+            url, json=corpo, headers=cabecalhos, timeout=REQUEST_TIMEOUT
+        )
+        resposta.raise_for_status()
+        try:
+            return resposta.json()
+        except ValueError:
+            return {}
+
+
+class PublicadorWebhook(_PublicadorHTTP):
+    """Envia cada post como JSON para uma URL (Discord, Slack, automações)"""
+
+    nome = "webhook"
+
+    def __init__(self, url: Optional[str] = WEBHOOK_URL):
+        """
+        Args:
+            url: URL que recebe o POST
+
+        Raises:
+            ValueError: Se a URL não estiver configurada
+        """
+        if not url:
+            raise ValueError("WEBHOOK_URL não configurada")
+        super().__init__()
+        self.url = url
+
+    def enviar(self, texto: str, responder_a: Optional[str] = None, chave: Optional[str] = None) -> dict:
+        cabecalhos = {"Idempotency-Key": chave} if chave else None
+        resposta = self._post(self.url, {"texto": texto, "responder_a": responder_a}, cabecalhos)
+        return {"id": str(resposta["id"]) if resposta.get("id") is not None else None}
+
+
+class PublicadorMastodon(_PublicadorHTTP):
+    """Publica statuses no Mastodon (API /api/v1/statuses)"""
+
+    nome = "mastodon"
+
+    def __init__(self, url: Optional[str] = MASTODON_URL, token: Optional[str] = MASTODON_TOKEN):
+        """
+        Args:
+            url: Endereço da instância (ex: https://mastodon.social)
+            token: Token de acesso da conta
+
+        Raises:
+            ValueError: Se a URL ou o token não estiverem configurados
+        """
+        if not url or not token:
+            raise ValueError("MASTODON_URL e MASTODON_TOKEN são obrigatórios")
+        super().__init__()
+        self.url = url.rstrip("/")
+        self.token = token
+
+    def enviar(self, texto: str, responder_a: Optional[str] = None, chave: Optional[str] = None) -> dict:
+        cabecalhos = {"Authorization": f"Bearer {self.token}"}
+        if chave:
+            # O Mastodon descarta envios repetidos com a mesma chave por 1 hora
+            cabecalhos["Idempotency-Key"] = chave
+        corpo = {"status": texto}
+        if responder_a:
+            corpo["in_reply_to_id"] = responder_a
+        resposta = self._post(f"{self.url}/api/v1/statuses", corpo, cabecalhos)
+        return {"id": str(resposta["id"])}
+
+
+class PublicadorTelegram(_PublicadorHTTP):
+    """Envia mensagens para um chat do Telegram (Bot API sendMessage)"""
+
+    nome = "telegram"
+    intervalo = 1.0  # O Telegram pede no máximo ~1 mensagem por segundo no mesmo chat
+
+    def __init__(
+        self,
+        url: str = TELEGRAM_URL,
+        token: Optional[str] = TELEGRAM_TOKEN,
+        chat_id: Optional[str] = TELEGRAM_CHAT_ID
+    ):
+        """
+        Args:
+            url: Endereço da Bot API
+            token: Token do bot
+            chat_id: Chat ou canal de destino
+
+        Raises:
+            ValueError: Se o token ou o chat não estiverem configurados
+        """
+        if not token or not chat_id:
+            raise ValueError("TELEGRAM_TOKEN e TELEGRAM_CHAT_ID são obrigatórios")
+        super().__init__()
+        self.url = url.rstrip("/")
+        self.token = token
+        self.chat_id = chat_id
+
+    def enviar(self, texto: str, responder_a: Optional[str] = None, chave: Optional[str] = None) -> dict:
+        corpo = {"chat_id": self.chat_id, "text": texto}
+        if responder_a:
+            corpo["reply_to_message_id"] = int(responder_a)
+        resposta = self._post(f"{self.url}/bot{self.token}/sendMessage", corpo)
+        return {"id": str(resposta["result"]["message_id"])}
+
+
+def _fabricas(credenciais: Optional[Dict[str, Optional[str]]]) -> Dict[str, Callable[[], Publicador]]:
+    from src.twitter_client import obter_cliente
+
+    return {
+        "twitter": lambda: obter_cliente(credenciais),
+        "arquivo": PublicadorArquivo,
+        "webhook": PublicadorWebhook,
+        "mastodon": PublicadorMastodon,
+        "telegram": PublicadorTelegram,
+    }
+
+
+_publicadores: Dict[tuple, List[Publicador]] = {}
+
+
+def obter_publicadores(
+    credenciais: Optional[Dict[str, Optional[str]]] = None,
+    nomes: List[str] = PUBLICADORES
+) -> List[Publicador]:
+    """
+    Retorna os canais configurados, reaproveitados entre execuções do mesmo processo
+
+    Canais com configuração inválida são ignorados com um erro no log.
+
+    Args:
+        credenciais: Credenciais do Twitter do clube (padrão: TWITTER_CONFIG)
+        nomes: Nomes dos canais (padrão: PUBLICADORES)
+
+    Returns:
+        Lista de publicadores
+
+    Raises:
+        ValueError: Se nenhum canal puder ser criado
+    """
+    chave = (tuple(sorted((credenciais or TWITTER_CONFIG).items())), tuple(nomes))
+    if chave in _publicadores:
+        return _publicadores[chave]
+
+    fabricas = _fabricas(credenciais)
+    publicadores = []
+    for nome in nomes:
+        if nome not in fabricas:
+            logger.error("Canal de publicação desconhecido: %s", nome)
+            continue
+        try:
+            publicadores.append(fabricas[nome]())
+        except Exception as e:
+            logger.error("Canal %s ignorado: %s", nome, e)
+
+    if not publicadores:
+        raise ValueError(f"Nenhum canal de publicação disponível em {', '.join(nomes)}")
+
+    _publicadores[chave] = publicadores
+    return publicadores
@@ -0,0 +1,372 @@
+"""
+Servidor HTTP local que imita as páginas do UFMG (modo replay)
+
+Serve snapshots gravados das páginas de todas as competições (COMPETICOES)
+a partir de um diretório: <dir>/<chave de URLS>.html para a competição
+padrão, o mesmo formato de benchmarks/fixtures, e <dir>/<competição>/<chave>.html
+para as demais. Também injeta falhas configuradas em <dir>/falhas.json: latência, erros 5xx,
+corpos truncados, layout de colunas alterado e ETag / 304.
+
+Os snapshots são relidos a cada requisição: editar um arquivo simula uma
+atualização do UFMG.
+
+Para executar isolado: python -m src.replay <dir> [porta]
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse
+
+from config.settings import COMPETICOES, COMPETICAO_PADRAO, REPLAY_PORTA
+from src.parsers import celulas_htmlparser, limites_tabela
+from src.publicadores import PublicadorArquivo
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_FALHAS = "falhas.json"
+ARQUIVO_POSTS = "posts.jsonl"
+
+# Falhas desativadas por padrão; probabilidades entre 0 e 1
+FALHAS_PADRAO: Dict[str, Any] = {
+    "latencia": 0.0,  # Segundos antes de cada resposta
+    "latencia_variacao": 0.0,  # Segundos aleatórios somados à latência
+    "erros": 0.0,  # Probabilidade de responder 503
+    "retry_after": None,  # Valor do cabeçalho Retry-After nos 503
+    "truncar": 0.0,  # Probabilidade de cortar o corpo ao meio
+    "layout_alterado": False,  # Move a coluna de posição para o fim da tabela
+    "etag": True,  # Envia ETag / Last-Modified e responde 304
+    "semente": 0,  # Semente do sorteio das falhas (execuções reproduzíveis)
+}
+
+
+def arquivo_snapshot(competicao: str, chave: str) -> str:
+    """
+    Caminho do snapshot de uma página, relativo ao diretório do replay
+
+    Args:
+        competicao: Chave de COMPETICOES
+        chave: Chave da página na competição
+
+    Returns:
+        "<chave>.html" na competição padrão, "<competição>/<chave>.html" nas outras
+    """
+    return f"{chave}.html" if competicao == COMPETICAO_PADRAO else f"{competicao}/{chave}.html"
+
+
+def carregar_falhas(diretorio: str) -> Dict[str, Any]:
+    """
+    Lê a configuração de falhas de um diretório de snapshots
+
+    Args:
+        diretorio: Diretório com os snapshots
+
+    Returns:
+        FALHAS_PADRAO atualizado com o conteúdo de falhas.json (se existir)
+
+    Raises:
+        ValueError: Se falhas.json tiver uma chave desconhecida
+    """
+    falhas = dict(FALHAS_PADRAO)
+    caminho = Path(diretorio) / ARQUIVO_FALHAS
+    if caminho.exists():
+        configuradas = json.loads(caminho.read_text(encoding="utf-8"))
+        desconhecidas = set(configuradas) - set(FALHAS_PADRAO)
+        if desconhecidas:
+            raise ValueError(f"Falhas desconhecidas em {caminho}: {', '.join(sorted(desconhecidas))}")
+        falhas.update(configuradas)
+    return falhas
+
+
+def alterar_layout(html: str) -> str:
+    """
+    Reescreve a primeira tabela movendo a primeira coluna para o fim
+
+    Os rótulos do cabeçalho acompanham as colunas, então o scraper deve
+    continuar lendo a tabela pelo cabeçalho.
+
+    Args:
+        html: Conteúdo da página
+
+    Returns:
+        Página com a tabela reescrita (inalterada se não houver tabela)
+    """
+    celulas = celulas_htmlparser(html)
+    limites = limites_tabela(html)
+    if celulas is None or limites is None or limites[1] is None:
+        return html
+
+    cabecalho, linhas = celulas
+
+    def girar(valores: List[str]) -> List[str]:
+        return valores[1:] + valores[:1]
+
+    partes = ["<table>"]
+    if cabecalho:
+        partes.append("<tr>" + "".join(f"<th>{c}</th>" for c in girar(cabecalho)) + "</tr>")
+    for linha in linhas:
+        partes.append("<tr>" + "".join(f"<td>{c}</td>" for c in girar(linha)) + "</tr>")
+    partes.append("</table>")
+
+    inicio, fim = limites
+    return html[:inicio] + "\n".join(partes) + html[fim:]
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    """Repassa cada GET para o ServidorUFMG dono do servidor HTTP"""
+
+    protocol_version = "HTTP/1.1"
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # O scraper em modo streaming fecha a conexão ao fim da tabela
+            logger.debug("Replay: cliente encerrou a conexão")
+
+    def do_GET(self):
+        self.server.ufmg.responder(self)
+
+    def log_message(self, format, *args):
+        logger.debug("Replay %s: " + format, self.address_string(), *args)
+
+
+class ServidorUFMG:
+    """Servidor local com os snapshots das páginas do UFMG e injeção de falhas"""
+
+    def __init__(
+        self,
+        diretorio: str,
+        falhas: Optional[Dict[str, Any]] = None,
+        host: str = "127.0.0.1",
+        porta: int = REPLAY_PORTA
+    ):
+        """
+        Cria o servidor (ainda parado)
+
+        Args:
+            diretorio: Diretório com os snapshots (ver arquivo_snapshot) e,
+                opcionalmente, falhas.json
+            falhas: Falhas que substituem as de falhas.json
+            host: Endereço de escuta
+            porta: Porta de escuta (0 = porta livre)
+        """
+        self.diretorio = Path(diretorio)
+        self.falhas = {**carregar_falhas(diretorio), **(falhas or {})}
+        self.estatisticas = {"requisicoes": 0, "erros": 0, "truncadas": 0, "nao_modificadas": 0}
+        self._aleatorio = random.Random(self.falhas["semente"])
+        self._lock = threading.Lock()
+        # Caminho da URL -> snapshot; uma página compartilhada fica com a primeira competição
+        self._caminhos: Dict[str, str] = {}
+        for competicao, dados in COMPETICOES.items():
+            for chave, url in dados["paginas"].items():
+                self._caminhos.setdefault(urlparse(url).path, arquivo_snapshot(competicao, chave))
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, porta), _Manipulador)
+        self.httpd.daemon_threads = True
+        self.httpd.ufmg = self
+
+    @property
+    def url_base(self) -> str:
+        """Endereço do servidor (ex: http://127.0.0.1:8765)"""
+        host, porta = self.httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def urls(self, competicao: str = COMPETICAO_PADRAO) -> Dict[str, str]:
+        """Retorna as páginas de uma competição com o host do UFMG trocado pelo servidor local"""
+        return {
+            chave: self.url_base + urlparse(url).path
+            for chave, url in COMPETICOES[competicao]["paginas"].items()
+        }
+
+    def iniciar(self) -> "ServidorUFMG":
+        """Atende requisições em uma thread em segundo plano"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("Servidor replay em %s servindo %s", self.url_base, self.diretorio)
+        return self
+
+    def parar(self) -> None:
+        """Encerra o servidor"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "ServidorUFMG":
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.parar()
+
+    def _sortear(self, probabilidade: float) -> bool:
+        with self._lock:
+            return self._aleatorio.random() < probabilidade
+
+    def _contar(self, estatistica: str) -> None:
+        with self._lock:
+            self.estatisticas[estatistica] += 1
+
+    def responder(self, requisicao: BaseHTTPRequestHandler) -> None:
+        """
+        Responde um GET aplicando as falhas configuradas
+
+        Args:
+            requisicao: Manipulador da requisição em andamento
+        """
+        self._contar("requisicoes")
+        falhas = self.falhas
+
+        if falhas["latencia"] or falhas["latencia_variacao"]:
+            with self._lock:
+                variacao = self._aleatorio.uniform(0, falhas["latencia_variacao"])
+            time.sleep(falhas["latencia"] + variacao)
+
+        snapshot = self._caminhos.get(urlparse(requisicao.path).path)
+        arquivo = self.diretorio / snapshot if snapshot else None
+        if arquivo is None or not arquivo.exists():
+            self._enviar(requisicao, 404, b"")
+            return
+
+        if self._sortear(falhas["erros"]):
+            self._contar("erros")
+            cabecalhos = {}
+            if falhas["retry_after"] is not None:
+                cabecalhos["Retry-After"] = str(falhas["retry_after"])
+            self._enviar(requisicao, 503, b"", cabecalhos)
+            return
+
+        html = arquivo.read_text(encoding="utf-8")
+        if falhas["layout_alterado"]:
+            html = alterar_layout(html)
+        corpo = html.encode("utf-8")
+
+        cabecalhos = {"Content-Type": "text/html; charset=utf-8"}
+        if falhas["etag"]:
+            etag = '"' + hashlib.sha1(corpo).hexdigest()[:16] + '"'
+            modificado = int(arquivo.stat().st_mtime)
+            cabecalhos["ETag"] = etag
+            cabecalhos["Last-Modified"] = formatdate(modificado, usegmt=True)
+            if self._nao_modificado(requisicao, etag, modificado):
+                self._contar("nao_modificadas")
+                self._enviar(requisicao, 304, b"", cabecalhos)
+                return
+
+        if self._sortear(falhas["truncar"]):
+            self._contar("truncadas")
+            corpo = corpo[:len(corpo) // 2]
+            cabecalhos.pop("ETag", None)
+            cabecalhos.pop("Last-Modified", None)
+
+        self._enviar(requisicao, 200, corpo, cabecalhos)
+
+    @staticmethod
+    def _nao_modificado(requisicao: BaseHTTPRequestHandler, etag: str, modificado: int) -> bool:
+        """Avalia If-None-Match / If-Modified-Since"""
+        if_none_match = requisicao.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [e.strip() for e in if_none_match.split(",")]
+
+        if_modified_since = requisicao.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return modificado <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _enviar(
+        requisicao: BaseHTTPRequestHandler,
+        status: int,
+        corpo: bytes,
+        cabecalhos: Optional[Dict[str, str]] = None
+    ) -> None:
+        requisicao.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            requisicao.send_header(nome, valor)
+        if status != 304:
+            requisicao.send_header("Content-Length", str(len(corpo)))
+        requisicao.end_headers()
+        if corpo:
+            requisicao.wfile.write(corpo)
+
+
+class ClienteReplay(PublicadorArquivo):
+    """
+    Substitui o TwitterClient no modo replay
+
+    Nada é enviado ao Twitter: cada post é anexado a posts.jsonl.
+    """
+
+    nome = "replay"
+
+    def __init__(self, diretorio: str):
+        """
+        Args:
+            diretorio: Diretório onde posts.jsonl é gravado
+        """
+        super().__init__(Path(diretorio) / ARQUIVO_POSTS)
+
+    def postar_tweet(self, texto: str) -> Optional[dict]:
+        """Registra o tweet em posts.jsonl"""
+        return self.enviar(texto)
+
+    def postar_thread(self, tweets: list[str]) -> Optional[list[dict]]:
+        """Registra a thread em posts.jsonl"""
+        resultados = []
+        anterior = None
+        for texto in tweets:
+            dados = self.enviar(texto, anterior)
+            resultados.append(dados)
+            anterior = dados["id"]
+        return resultados
+
+    def deletar_tweet(self, tweet_id: str) -> bool:
+        return True
+
+
+def iniciar_replay(diretorio: str, porta: int = REPLAY_PORTA) -> ServidorUFMG:
+    """
+    Sobe o servidor replay e aponta as páginas de todas as competições para ele
+
+    As páginas de COMPETICOES (e URLS, o mesmo dicionário da competição
+    padrão) são alteradas no lugar, então todos os módulos que as
+    importaram passam a usar o servidor local e nenhuma competição vai
+    ao site real.
+
+    Args:
+        diretorio: Diretório com os snapshots
+        porta: Porta de escuta (0 = porta livre)
+
+    Returns:
+        Servidor em execução
+    """
+    servidor = ServidorUFMG(diretorio, porta=porta).iniciar()
+    for competicao, dados in COMPETICOES.items():
+        dados["paginas"].update(servidor.urls(competicao))
+    return servidor
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    porta = int(sys.argv[2]) if len(sys.argv) > 2 else REPLAY_PORTA
+    with ServidorUFMG(os.path.abspath(sys.argv[1]), porta=porta) as servidor:
+        for competicao in COMPETICOES:
+            for chave, url in servidor.urls(competicao).items():
+                print(f"{competicao} {chave}: {url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,228 @@
+"""
+Prazo da execução e disjuntor por host
+
+O prazo cobre uma execução inteira do bot: cada requisição recebe como
+timeout o menor entre REQUEST_TIMEOUT e o tempo que resta (menos
+PRAZO_RESERVA, guardado para parse e postagem), então as páginas dividem
+o mesmo orçamento e a execução não passa do limite com o UFMG lento.
+
+O disjuntor conta as falhas seguidas de um host. Com DISJUNTOR_FALHAS
+falhas ele abre e as requisições falham na hora, sem rede, até que
+DISJUNTOR_ESPERA segundos depois uma única requisição de teste decida se
+ele fecha ou continua aberto. Cada abertura e fechamento é gravado em
+DISJUNTOR_ARQUIVO para valer entre execuções do cron.
+
+Nos dois casos o scraper usa a última versão da página no cache HTTP,
+marcada como obsoleta (src/scraper.py: obter_conteudo).
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+from config.settings import (
+    PRAZO_RESERVA, DISJUNTOR_FALHAS, DISJUNTOR_ESPERA, DISJUNTOR_ARQUIVO
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ColetaInterrompida(Exception):
+    """Requisição não feita por falta de prazo ou com o disjuntor aberto"""
+
+
+class PrazoEsgotado(ColetaInterrompida):
+    """O prazo da execução acabou"""
+
+
+class CircuitoAberto(ColetaInterrompida):
+    """O disjuntor do host está aberto"""
+
+
+class Prazo:
+    """Prazo de uma execução, dividido entre as requisições"""
+
+    def __init__(
+        self,
+        segundos: float,
+        reserva: float = PRAZO_RESERVA,
+        relogio: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicia o prazo
+
+        Args:
+            segundos: Duração total da execução
+            reserva: Segundos finais que as requisições não usam
+            relogio: Fonte de tempo (injetável nos testes)
+        """
+        self._relogio = relogio
+        self.fim = relogio() + segundos
+        self.reserva = reserva
+
+    def restante(self) -> float:
+        """Segundos até o fim do prazo (negativo se já passou)"""
+        return self.fim - self._relogio()
+
+    def timeout(self, maximo: float) -> float:
+        """
+        Timeout da próxima requisição
+
+        Args:
+            maximo: Timeout de uma requisição sem prazo (REQUEST_TIMEOUT)
+
+        Returns:
+            O menor entre maximo e o tempo que resta para as requisições
+
+        Raises:
+            PrazoEsgotado: Se não sobra tempo para requisições
+        """
+        disponivel = self.restante() - self.reserva
+        if disponivel <= 0:
+            raise PrazoEsgotado(f"prazo da execução esgotado ({-disponivel:.1f}s além do limite)")
+        return min(maximo, disponivel)
+
+
+_prazo_atual: Optional[Prazo] = None
+
+
+def prazo_atual() -> Optional[Prazo]:
+    """Retorna o prazo da execução em andamento (None fora de prazo_execucao)"""
+    return _prazo_atual
+
+
+@contextmanager
+def prazo_execucao(segundos: Optional[float]) -> Iterator[Optional[Prazo]]:
+    """
+    Define o prazo das requisições feitas dentro do bloco
+
+    Args:
+        segundos: Duração do prazo (None mantém o prazo em andamento, se houver)
+
+    Yields:
+        O prazo em vigor no bloco
+    """
+    global _prazo_atual
+
+    if segundos is None:
+        yield _prazo_atual
+        return
+
+    anterior, _prazo_atual = _prazo_atual, Prazo(segundos)
+    try:
+        yield _prazo_atual
+    finally:
+        _prazo_atual = anterior
+
+
+class Disjuntor:
+    """Circuit breaker das requisições a um host"""
+
+    def __init__(
+        self,
+        host: str,
+        limite: int = DISJUNTOR_FALHAS,
+        espera: float = DISJUNTOR_ESPERA,
+        arquivo: Optional[str] = DISJUNTOR_ARQUIVO,
+        relogio: Callable[[], float] = time.time
+    ):
+        """
+        Carrega o estado do host
+
+        Args:
+            host: Host protegido (netloc da URL)
+            limite: Falhas seguidas que abrem o disjuntor
+            espera: Segundos aberto antes da requisição de teste
+            arquivo: JSON com o estado de todos os hosts (vazio = só em memória)
+            relogio: Fonte de tempo (injetável nos testes)
+        """
+        self.host = host
+        self.limite = limite
+        self.espera = espera
+        self.arquivo = arquivo
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        self._testando = False
+        estado = self._ler().get(host, {})
+        self.falhas: int = estado.get("falhas", 0)
+        self.aberto_em: Optional[float] = estado.get("aberto_em")
+
+    def _ler(self) -> Dict[str, Dict]:
+        """Lê o estado de todos os hosts"""
+        if not self.arquivo:
+            return {}
+        try:
+            with open(Path(self.arquivo), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("Estado do disjuntor inválido em %s: %s", self.arquivo, e)
+            return {}
+
+    def _gravar(self) -> None:
+        """Grava o estado deste host, preservando o dos outros"""
+        if not self.arquivo:
+            return
+        try:
+            estados = self._ler()
+            estados[self.host] = {"falhas": self.falhas, "aberto_em": self.aberto_em}
+            Path(self.arquivo).parent.mkdir(parents=True, exist_ok=True)
+            with open(Path(self.arquivo), 'w', encoding='utf-8') as f:
+                json.dump(estados, f)
+        except Exception as e:
+            logger.error("Erro ao gravar estado do disjuntor em %s: %s", self.arquivo, e)
+
+    @property
+    def aberto(self) -> bool:
+        """True se o disjuntor está aberto (inclusive esperando o teste)"""
+        return self.aberto_em is not None
+
+    def permitir(self) -> bool:
+        """
+        Indica se uma requisição ao host pode ser feita
+
+        Com o disjuntor aberto, depois da espera só uma requisição de teste
+        passa; as outras continuam bloqueadas até ela terminar.
+
+        Returns:
+            True se a requisição pode ser feita
+        """
+        with self._lock:
+            if self.aberto_em is None:
+                return True
+            if self._testando or self._relogio() - self.aberto_em < self.espera:
+                return False
+            self._testando = True
+            logger.info("Disjuntor de %s meio aberto - requisição de teste", self.host)
+            return True
+
+    def registrar_sucesso(self) -> None:
+        """Fecha o disjuntor e zera as falhas"""
+        with self._lock:
+            estava_aberto = self.aberto_em is not None
+            self.falhas, self.aberto_em, self._testando = 0, None, False
+            if estava_aberto:
+                logger.info("Disjuntor de %s fechado", self.host)
+                self._gravar()
+
+    def registrar_falha(self) -> None:
+        """Conta uma falha e abre o disjuntor no limite (ou se o teste falhou)"""
+        with self._lock:
+            self.falhas += 1
+            if self._testando or (self.aberto_em is None and self.falhas >= self.limite):
+                self.aberto_em = self._relogio()
+                logger.warning(
+                    "Disjuntor de %s aberto após %s falhas seguidas - requisições suspensas por %ss",
+                    self.host, self.falhas, self.espera
+                )
+                self._gravar()
+            self._testando = False
+
+    def liberar(self) -> None:
+        """Libera a vaga de teste de uma requisição que terminou sem resultado"""
+        with self._lock:
+            self._testando = False
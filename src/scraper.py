@@ -1,38 +1,194 @@
 """
 Módulo responsável por extrair dados das páginas do UFMG
+
+requests e bs4 só são importados no primeiro uso: uma execução sem
+mudanças (impressões digitais iguais) nunca carrega o bs4.
 """
-import requests
-from bs4 import BeautifulSoup
-import unicodedata
-from typing import Optional, Dict
+from __future__ import annotations
+
+from typing import Optional, Dict, Any, Callable, Tuple, List, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import codecs
+import random
+import threading
+import time
 import logging
 
-from config.settings import REQUEST_TIMEOUT
+from config.settings import (
+    REQUEST_TIMEOUT, MAX_WORKERS, MAX_CONEXOES_POR_HOST, HTTP_TAXA_POR_HOST, HTTP_RAJADA_POR_HOST, HTTP_TENTATIVAS,
+    HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX, HTTP_STATUS_RETENTAVEIS, USER_AGENT,
+    PARSER_BACKEND, HTTP_STREAMING, HTTP_TAMANHO_PEDACO
+)
+from src.tabela import Tabela, normalizar_texto
+from src.http_cache import CacheHTTP, cache_http_padrao
+from src.cache import calcular_impressao
+from src.coleta import BaldeDeFichas
+from src.resiliencia import Disjuntor, CircuitoAberto, prazo_atual
+from src.parsers import extrair_celulas_html, LeitorIncremental, limites_tabela
+
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+# Semáforos por host para limitar requisições simultâneas ao mesmo servidor
+_semaforos_host: Dict[str, threading.BoundedSemaphore] = {}
+_semaforos_lock = threading.Lock()
+
+# Baldes de fichas por host para limitar a taxa de requisições ao mesmo servidor
+_baldes_host: Dict[str, BaldeDeFichas] = {}
+
+# Disjuntores por host: suspendem as requisições a um servidor que só falha
+_disjuntores_host: Dict[str, Disjuntor] = {}
+
+# Sessão HTTP compartilhada (pool de conexões keep-alive)
+_sessao_padrao: Optional[requests.Session] = None
+_sessao_lock = threading.Lock()
+
+
+def criar_sessao(pool: int = MAX_CONEXOES_POR_HOST) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões, keep-alive e compressão
+    
+    Args:
+        pool: Número máximo de conexões mantidas por host
+        
+    Returns:
+        Sessão configurada (as retentativas são feitas em baixar_pagina)
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=pool, pool_maxsize=pool, max_retries=0)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    sessao.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive"
+    })
+    return sessao
+
+
+def sessao_padrao() -> requests.Session:
+    """Retorna a sessão HTTP compartilhada pelo processo, criando-a no primeiro uso"""
+    global _sessao_padrao
+    with _sessao_lock:
+        if _sessao_padrao is None:
+            _sessao_padrao = criar_sessao()
+        return _sessao_padrao
+
 
-def normalizar_texto(texto: str) -> str:
+def _espera_backoff(tentativa: int, response: Optional[requests.Response] = None) -> float:
     """
-    Normaliza texto removendo acentos e convertendo para maiúsculas
+    Calcula a espera antes da próxima tentativa (backoff exponencial com jitter)
     
     Args:
-        texto: String para normalizar
+        tentativa: Número da tentativa que falhou (começando em 1)
+        response: Resposta com erro, usada para respeitar Retry-After
         
     Returns:
-        String normalizada em maiúsculas sem acentos
+        Tempo de espera em segundos
     """
-    texto = unicodedata.normalize("NFD", texto)
-    texto = texto.encode("ascii", "ignore").decode("utf-8")
-    return texto.upper()
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+    
+    espera = min(HTTP_BACKOFF_BASE * 2 ** (tentativa - 1), HTTP_BACKOFF_MAX)
+    return random.uniform(0, espera)
 
 
-def fazer_requisicao(url: str) -> BeautifulSoup:
+def baixar_pagina(
+    url: str,
+    cabecalhos: Optional[Dict[str, str]] = None,
+    sessao: Optional[requests.Session] = None,
+    stream: bool = False
+) -> requests.Response:
+    """
+    Faz a requisição HTTP de uma página, retentando falhas transitórias
+    
+    Erros de conexão, timeouts e status em HTTP_STATUS_RETENTAVEIS são
+    retentados até HTTP_TENTATIVAS vezes com backoff exponencial e jitter.
+    Cada tentativa espera uma ficha do balde do host (HTTP_TAXA_POR_HOST),
+    passa pelo disjuntor do host e usa como timeout o que resta do prazo
+    da execução (src/resiliencia.py), até REQUEST_TIMEOUT.
+    
+    Args:
+        url: URL para fazer a requisição
+        cabecalhos: Cabeçalhos extras (ex: If-None-Match)
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
+        stream: Se True, o corpo não é baixado até ser lido com iter_content
+        
+    Returns:
+        Resposta HTTP (status 200 ou 304)
+        
+    Raises:
+        requests.RequestException: Erro na requisição HTTP após todas as tentativas
+        CircuitoAberto: Se o disjuntor do host estiver aberto
+        PrazoEsgotado: Se o prazo da execução acabar antes de uma tentativa
+    """
+    import requests
+    
+    sessao = sessao or sessao_padrao()
+    
+    balde = _balde_host(url)
+    disjuntor = _disjuntor_host(url)
+    prazo = prazo_atual()
+    
+    for tentativa in range(1, HTTP_TENTATIVAS + 1):
+        response = None
+        timeout = prazo.timeout(REQUEST_TIMEOUT) if prazo else REQUEST_TIMEOUT
+        if not disjuntor.permitir():
+            raise CircuitoAberto(f"disjuntor de {disjuntor.host} aberto")
+        try:
+            if balde is not None and balde.aguardar():
+                logger.debug("Limite de taxa de %s: requisição adiada", urlparse(url).netloc)
+            logger.info("Fazendo requisição para: %s", url)
+            response = sessao.get(
+                url, timeout=timeout, headers=cabecalhos, stream=stream
+            )
+            response.raise_for_status()
+            disjuntor.registrar_sucesso()
+            return response
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            retentavel = response is None or response.status_code in HTTP_STATUS_RETENTAVEIS
+            if retentavel:
+                disjuntor.registrar_falha()
+            else:
+                disjuntor.registrar_sucesso()  # O servidor respondeu: o problema é a página
+            if not retentavel or tentativa == HTTP_TENTATIVAS:
+                logger.error("Erro na requisição para %s: %s", url, e)
+                raise
+            espera = _espera_backoff(tentativa, response)
+            if prazo and espera >= prazo.restante() - prazo.reserva:
+                logger.error("Erro na requisição para %s: %s (sem prazo para nova tentativa)", url, e)
+                raise
+            logger.warning(
+                "Falha transitória em %s (tentativa %s/%s): %s - nova tentativa em %.2fs",
+                url, tentativa, HTTP_TENTATIVAS, e, espera
+            )
+            time.sleep(espera)
+        except requests.RequestException as e:
+            disjuntor.registrar_falha()
+            logger.error("Erro na requisição para %s: %s", url, e)
+            raise
+        finally:
+            # Saídas sem sucesso/falha registrado (prazo esgotado, Ctrl+C...) não
+            # podem prender o disjuntor meio aberto na requisição de teste
+            disjuntor.liberar()
+
+
+def fazer_requisicao(url: str, sessao: Optional[requests.Session] = None) -> BeautifulSoup:
     """
     Faz requisição HTTP e retorna objeto BeautifulSoup
     
     Args:
         url: URL para fazer a requisição
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
         
     Returns:
         Objeto BeautifulSoup com o HTML parseado
@@ -40,98 +196,522 @@ def fazer_requisicao(url: str) -> BeautifulSoup:
     Raises:
         requests.RequestException: Erro na requisição HTTP
     """
+    from bs4 import BeautifulSoup
+    
+    return BeautifulSoup(baixar_pagina(url, sessao=sessao).text, "html.parser")
+
+
+def extrair_celulas(soup: BeautifulSoup) -> Optional[Tuple[List[str], List[List[str]]]]:
+    """
+    Extrai os textos do cabeçalho e das linhas da primeira tabela da página
+    
+    Args:
+        soup: HTML parseado
+        
+    Returns:
+        Tupla com (cabeçalho, linhas) ou None se não houver tabela
+    """
+    tabela = soup.find("table")
+    
+    if not tabela:
+        return None
+    
+    cabecalho: List[str] = []
+    linhas: List[List[str]] = []
+    
+    for linha in tabela.find_all("tr"):
+        celulas = linha.find_all("td")
+        if celulas:
+            linhas.append([c.get_text(strip=True) for c in celulas])
+        elif not cabecalho:
+            cabecalho = [c.get_text(strip=True) for c in linha.find_all("th")]
+    
+    return cabecalho, linhas
+
+
+def parsear_tabela(html: str, tipo: str, backend: str = PARSER_BACKEND) -> Optional[Tabela]:
+    """
+    Converte o HTML de uma página do UFMG em Tabela
+    
+    Args:
+        html: Conteúdo da página
+        tipo: Layout da tabela ("classificacao" ou "probabilidade")
+        backend: Backend de parse (ver src/parsers.py)
+        
+    Returns:
+        Tabela indexada por time ou None se a página não tiver tabela
+    """
+    celulas = extrair_celulas_html(html, backend)
+    
+    if celulas is None:
+        logger.warning("Tabela não encontrada na página")
+        return None
+    
+    cabecalho, linhas = celulas
+    return Tabela.de_celulas(cabecalho, linhas, tipo)
+
+
+def ler_tabela_streaming(
+    response: requests.Response,
+    tipo: str,
+    parar_em: Optional[str] = None
+) -> Tuple[Optional[Tabela], str, bool]:
+    """
+    Lê o corpo da resposta em pedaços, parseando a tabela incrementalmente
+    
+    A leitura termina quando a tabela é fechada ou, se parar_em for
+    informado, assim que a linha desse time aparece. A conexão é fechada
+    em seguida, sem baixar o restante da página.
+    
+    Args:
+        response: Resposta aberta com stream=True
+        tipo: Layout da tabela ("classificacao" ou "probabilidade")
+        parar_em: Nome normalizado do time que encerra a leitura (modo um clube)
+        
+    Returns:
+        Tupla com (tabela, texto lido, se a tabela foi lida por completo)
+    """
+    decodificador = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    leitor = LeitorIncremental()
+    partes: List[str] = []
+    bytes_lidos = 0
+    linhas_vistas = 0
+    encontrou_time = False
+    
+    try:
+        for pedaco in response.iter_content(chunk_size=HTTP_TAMANHO_PEDACO):
+            bytes_lidos += len(pedaco)
+            texto = decodificador.decode(pedaco)
+            partes.append(texto)
+            leitor.alimentar(texto)
+            
+            if leitor.concluido:
+                break
+            
+            if parar_em:
+                novas = leitor.linhas[linhas_vistas:]
+                linhas_vistas = len(leitor.linhas)
+                if any(normalizar_texto(c) == parar_em for linha in novas for c in linha):
+                    encontrou_time = True
+                    break
+        else:
+            partes.append(decodificador.decode(b"", final=True))
+    finally:
+        response.close()
+    
+    completo = leitor.concluido
+    logger.info(
+        "Streaming de %s: %s bytes lidos%s%s", response.url, bytes_lidos,
+        " (tabela completa)" if completo else "",
+        f" (parou em {parar_em})" if encontrou_time else ""
+    )
+    
+    celulas = leitor.resultado()
+    if celulas is None:
+        logger.warning("Tabela não encontrada na página")
+        return None, "".join(partes), completo
+    
+    cabecalho, linhas = celulas
+    return Tabela.de_celulas(cabecalho, linhas, tipo), "".join(partes), completo
+
+
+def ler_corpo_streaming(response: requests.Response) -> Tuple[str, bool]:
+    """
+    Lê o corpo da resposta em pedaços até o fechamento da primeira tabela
+    
+    Não faz parse: o fim da tabela é localizado pelas tags <table>/</table>.
+    A conexão é fechada em seguida, sem baixar o restante da página.
+    
+    Args:
+        response: Resposta aberta com stream=True
+        
+    Returns:
+        Tupla com (texto lido, se a tabela foi lida por completo)
+    """
+    decodificador = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    partes: List[str] = []
+    bytes_lidos = 0
+    completo = False
+    final_anterior = ""
+    
     try:
-        logger.info(f"Fazendo requisição para: {url}")
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
-    except requests.RequestException as e:
-        logger.error(f"Erro na requisição para {url}: {e}")
-        raise
+        for pedaco in response.iter_content(chunk_size=HTTP_TAMANHO_PEDACO):
+            bytes_lidos += len(pedaco)
+            texto = decodificador.decode(pedaco)
+            partes.append(texto)
+            
+            # Só procura o fim da tabela quando um "</table" aparece neste pedaço
+            if "</table" in (final_anterior + texto).lower():
+                limites = limites_tabela("".join(partes))
+                if limites is not None and limites[1] is not None:
+                    completo = True
+                    break
+            final_anterior = texto[-8:]
+        else:
+            partes.append(decodificador.decode(b"", final=True))
+    finally:
+        response.close()
+    
+    logger.info(
+        "Streaming de %s: %s bytes lidos%s", response.url, bytes_lidos,
+        " (tabela completa)" if completo else ""
+    )
+    return "".join(partes), completo
+
 
+def _conteudo_do_cache(url: str, entrada: Dict, origem: str) -> Dict[str, Any]:
+    """Monta o conteúdo de uma página a partir de uma entrada do cache HTTP"""
+    return {
+        "url": url,
+        "origem": origem,
+        "html": entrada.get("corpo"),
+        "tabela": Tabela.de_dict(entrada["tabela"]) if entrada.get("tabela") else None,
+        "impressao": entrada.get("impressao") or calcular_impressao(entrada.get("corpo")),
+        "completo": True,
+        "bytes": 0,
+        "atualizado_em": entrada.get("validado_em") or entrada.get("salvo_em")
+    }
 
-def extrair_classificacao_geral(url: str, time_alvo: str) -> Optional[Dict[str, str]]:
+
+def obter_conteudo(
+    url: str,
+    cache: Optional[CacheHTTP] = None,
+    sessao: Optional[requests.Session] = None,
+    streaming: bool = HTTP_STREAMING,
+    tipo: Optional[str] = None,
+    parar_em: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Obtém o conteúdo bruto de uma página, sem parsear a tabela
+    
+    Usa requisição condicional (ETag / Last-Modified). Quando o servidor
+    responde 304, o conteúdo e a tabela já parseada vêm do cache. Se a
+    requisição falhar (erro, disjuntor aberto ou prazo esgotado) e a página
+    estiver no cache, a última versão é usada com origem "obsoleto".
+    
+    Args:
+        url: URL da página
+        cache: Cache HTTP (padrão: cache configurado em config/settings.py)
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
+        streaming: Se True, lê o corpo em pedaços e para no fim da tabela
+            (só com o backend "htmlparser")
+        tipo: Layout da tabela, necessário apenas com parar_em
+        parar_em: Nome normalizado de um time; no modo streaming a tabela é
+            parseada durante a leitura, que para assim que a linha dele
+            aparece (a tabela parcial não vai para o cache)
+        
+    Returns:
+        Dicionário com url, origem ("cache", "304", "rede" ou "obsoleto"),
+        html, tabela (Tabela já parseada ou None), impressao, completo, bytes
+        e, vindo do cache, atualizado_em (timestamp da última validação)
+    """
+    cache = cache or cache_http_padrao()
+    entrada = cache.obter(url) if cache else None
+    
+    if entrada and entrada.get("tabela") and cache.esta_fresca(entrada):
+        logger.info("Cache HTTP fresco para %s - requisição evitada", url)
+        cache.registrar_acerto()
+        return _conteudo_do_cache(url, entrada, "cache")
+    
+    streaming = streaming and PARSER_BACKEND == "htmlparser"
+    cabecalhos = cache.cabecalhos_condicionais(entrada) if cache else None
+    try:
+        response = baixar_pagina(url, cabecalhos, sessao, stream=streaming)
+    except Exception as e:
+        if not entrada:
+            raise
+        logger.warning("%s indisponível (%s) - usando a última versão do cache", url, e)
+        cache.registrar_obsoleto()
+        return _conteudo_do_cache(url, entrada, "obsoleto")
+    
+    if response.status_code == 304 and entrada:
+        logger.info("Página não modificada (304): %s", url)
+        response.close()
+        cache.registrar_revalidacao()
+        cache.renovar(url, entrada)
+        return _conteudo_do_cache(url, entrada, "304")
+    
+    tabela = None
+    if streaming and parar_em:
+        tabela, html, completo = ler_tabela_streaming(response, tipo, parar_em)
+    elif streaming:
+        html, completo = ler_corpo_streaming(response)
+    else:
+        html, completo = response.text, True
+    
+    impressao = calcular_impressao(html)
+    
+    if cache:
+        cache.registrar_falha()
+        if completo:
+            cache.salvar(
+                url,
+                html,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                tabela.para_dict() if tabela else None,
+                impressao
+            )
+    
+    return {
+        "url": url,
+        "origem": "rede",
+        "html": html,
+        "tabela": tabela,
+        "impressao": impressao,
+        "completo": completo,
+        "bytes": len(html.encode("utf-8"))
+    }
+
+
+def tabela_do_conteudo(
+    conteudo: Dict[str, Any],
+    tipo: str,
+    cache: Optional[CacheHTTP] = None
+) -> Optional[Tabela]:
+    """
+    Parseia a tabela de um conteúdo retornado por obter_conteudo
+    
+    Se a tabela já veio do cache, nenhum parse é feito. Uma tabela recém
+    parseada de uma página completa é anexada à entrada do cache HTTP.
+    
+    Args:
+        conteudo: Conteúdo retornado por obter_conteudo
+        tipo: Layout da tabela ("classificacao" ou "probabilidade")
+        cache: Cache HTTP (padrão: cache configurado em config/settings.py)
+        
+    Returns:
+        Tabela indexada por time ou None se a página não tiver tabela
+    """
+    if conteudo["tabela"] is not None:
+        return conteudo["tabela"]
+    
+    if not conteudo["html"]:
+        return None
+    
+    tabela = parsear_tabela(conteudo["html"], tipo)
+    
+    cache = cache or cache_http_padrao()
+    if cache and tabela and conteudo["origem"] == "rede" and conteudo["completo"]:
+        cache.anexar_tabela(conteudo["url"], tabela.para_dict())
+    
+    return tabela
+
+
+def carregar_tabela(
+    url: str,
+    tipo: str,
+    cache: Optional[CacheHTTP] = None,
+    sessao: Optional[requests.Session] = None,
+    streaming: bool = HTTP_STREAMING,
+    parar_em: Optional[str] = None
+) -> Optional[Tabela]:
+    """
+    Baixa uma página do UFMG e converte sua tabela com todos os clubes
+    
+    Args:
+        url: URL da página
+        tipo: Layout da tabela ("classificacao" ou "probabilidade")
+        cache: Cache HTTP (padrão: cache configurado em config/settings.py)
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
+        streaming: Se True, lê o corpo em pedaços e para no fim da tabela
+            (só com o backend "htmlparser")
+        parar_em: Nome normalizado de um time; no modo streaming a leitura
+            para assim que a linha dele aparece
+        
+    Returns:
+        Tabela indexada por time ou None se a página não tiver tabela
+    """
+    conteudo = obter_conteudo(url, cache, sessao, streaming, tipo, parar_em)
+    return tabela_do_conteudo(conteudo, tipo, cache)
+
+
+def formatar_linha_classificacao(linha: Dict[str, str]) -> Dict[str, str]:
+    """
+    Converte uma linha da tabela de classificação no formato usado pelo bot
+    
+    Args:
+        linha: Linha da Tabela de classificação
+        
+    Returns:
+        Dicionário com dados da classificação
+    """
+    return {
+        "Posicao": linha["posicao"] + "º",
+        "Pnts": linha["pontos"],
+        "Jogos": linha["jogos"] + "/38",
+        "Vitorias": linha["vitorias"],
+        "Empates": linha["empates"],
+        "Derrotas": linha["derrotas"],
+        "SG": linha["saldo"],
+        "Rendimento": linha["rendimento"] + "%",
+    }
+
+
+def extrair_classificacao_geral(
+    url: str,
+    time_alvo: str,
+    tabela: Optional[Tabela] = None,
+    sessao: Optional[requests.Session] = None
+) -> Optional[Dict[str, str]]:
     """
     Extrai dados da classificação geral do campeonato
     
     Args:
         url: URL da página de classificação geral
         time_alvo: Nome do time normalizado (ex: "VITORIA")
+        tabela: Tabela já carregada (evita nova requisição e novo parse)
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
         
     Returns:
         Dicionário com dados da classificação ou None se não encontrado
     """
     try:
-        soup = fazer_requisicao(url)
-        tabela = soup.find("table")
+        if tabela is None:
+            tabela = carregar_tabela(
+                url, "classificacao", sessao=sessao, parar_em=normalizar_texto(time_alvo)
+            )
+        if tabela is None:
+            return None
         
-        if not tabela:
-            logger.warning("Tabela não encontrada na página")
+        linha = tabela.buscar(time_alvo)
+        if linha is None:
+            logger.warning("Time %s não encontrado na tabela", time_alvo)
             return None
-            
-        linhas = tabela.find_all("tr")
-
-        for linha in linhas:
-            cols = [c.get_text(strip=True) for c in linha.find_all("td")]
-            
-            if len(cols) < 11:
-                continue
-                
-            if normalizar_texto(cols[1]) == time_alvo:
-                logger.info(f"Time {time_alvo} encontrado na posição {cols[0]}")
-                return {
-                    "Posicao": cols[0] + "º",
-                    "Pnts": cols[2],
-                    "Jogos": cols[3] + "/38",
-                    "Vitorias": cols[4],
-                    "Empates": cols[5],
-                    "Derrotas": cols[6],
-                    "SG": cols[9],
-                    "Rendimento": cols[10] + "%",
-                }
-        
-        logger.warning(f"Time {time_alvo} não encontrado na tabela")
-        return None
+        
+        logger.info("Time %s encontrado na posição %s", time_alvo, linha['posicao'])
+        return formatar_linha_classificacao(linha)
         
     except Exception as e:
-        logger.error(f"Erro ao extrair classificação geral: {e}")
+        logger.error("Erro ao extrair classificação geral: %s", e)
         return None
 
 
-def extrair_probabilidade(url: str, time_alvo: str) -> Optional[str]:
+def extrair_probabilidade(
+    url: str,
+    time_alvo: str,
+    tabela: Optional[Tabela] = None,
+    sessao: Optional[requests.Session] = None
+) -> Optional[str]:
     """
     Extrai probabilidade de um objetivo específico (Libertadores, Sula, Rebaixamento)
     
     Args:
         url: URL da página de probabilidades
         time_alvo: Nome do time normalizado (ex: "VITORIA")
+        tabela: Tabela já carregada (evita nova requisição e novo parse)
+        sessao: Sessão HTTP (padrão: sessão compartilhada do processo)
         
     Returns:
         String com a probabilidade ou None se não encontrado
     """
     try:
-        soup = fazer_requisicao(url)
-        tabela = soup.find("table")
+        if tabela is None:
+            tabela = carregar_tabela(
+                url, "probabilidade", sessao=sessao, parar_em=normalizar_texto(time_alvo)
+            )
+        if tabela is None:
+            return None
         
-        if not tabela:
-            logger.warning("Tabela não encontrada na página")
+        linha = tabela.buscar(time_alvo)
+        if linha is None:
+            logger.warning("Probabilidade não encontrada para %s", time_alvo)
             return None
-            
-        linhas = tabela.find_all("tr")
+        
+        logger.info("Probabilidade encontrada para %s: %s", time_alvo, linha['probabilidade'])
+        return linha["probabilidade"]
+        
+    except Exception as e:
+        logger.error("Erro ao extrair probabilidade: %s", e)
+        return None
 
-        for linha in linhas:
-            cols = [c.get_text(strip=True) for c in linha.find_all("td")]
-            
-            if len(cols) < 3:
-                continue
-                
-            if normalizar_texto(cols[1]) == time_alvo:
-                logger.info(f"Probabilidade encontrada para {time_alvo}: {cols[2]}")
-                return cols[2]
-        
-        logger.warning(f"Probabilidade não encontrada para {time_alvo}")
+
+def _semaforo_host(url: str) -> threading.BoundedSemaphore:
+    """
+    Retorna o semáforo que limita a concorrência para o host da URL
+    
+    Args:
+        url: URL da requisição
+        
+    Returns:
+        Semáforo compartilhado por todas as requisições ao mesmo host
+    """
+    host = urlparse(url).netloc
+    with _semaforos_lock:
+        if host not in _semaforos_host:
+            _semaforos_host[host] = threading.BoundedSemaphore(MAX_CONEXOES_POR_HOST)
+        return _semaforos_host[host]
+
+
+def _balde_host(url: str) -> Optional[BaldeDeFichas]:
+    """
+    Retorna o balde de fichas que limita a taxa de requisições ao host da URL
+    
+    Args:
+        url: URL da requisição
+        
+    Returns:
+        Balde compartilhado por todas as requisições ao mesmo host ou None
+        se HTTP_TAXA_POR_HOST for 0
+    """
+    if HTTP_TAXA_POR_HOST <= 0:
         return None
+    host = urlparse(url).netloc
+    with _semaforos_lock:
+        if host not in _baldes_host:
+            _baldes_host[host] = BaldeDeFichas(HTTP_TAXA_POR_HOST, HTTP_RAJADA_POR_HOST)
+        return _baldes_host[host]
+
+
+def _disjuntor_host(url: str) -> Disjuntor:
+    """
+    Retorna o disjuntor das requisições ao host da URL
+    
+    Args:
+        url: URL da requisição
         
-    except Exception as e:
-        logger.error(f"Erro ao extrair probabilidade: {e}")
-        return None
\ No newline at end of file
+    Returns:
+        Disjuntor compartilhado por todas as requisições ao mesmo host
+    """
+    host = urlparse(url).netloc
+    with _semaforos_lock:
+        if host not in _disjuntores_host:
+            _disjuntores_host[host] = Disjuntor(host)
+        return _disjuntores_host[host]
+
+
+def coletar_em_paralelo(
+    tarefas: Dict[str, Tuple[Callable[..., Any], str, tuple]],
+    max_workers: int = MAX_WORKERS
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Executa extrações de várias páginas em paralelo
+    
+    Cada tarefa é uma tupla (função, url, argumentos extras). A função é
+    chamada como função(url, *argumentos). A concorrência é limitada por
+    host através de MAX_CONEXOES_POR_HOST.
+    
+    Args:
+        tarefas: Dicionário {chave: (função, url, argumentos)}
+        max_workers: Número máximo de threads
+        
+    Returns:
+        Tupla com (resultados por chave, latência em segundos por chave)
+    """
+    latencias: Dict[str, float] = {}
+    
+    def executar(chave: str) -> Any:
+        funcao, url, args = tarefas[chave]
+        with _semaforo_host(url):
+            inicio = time.perf_counter()
+            try:
+                return funcao(url, *args)
+            finally:
+                latencias[chave] = time.perf_counter() - inicio
+                logger.info("Latência de %s (%s): %.2fs", chave, url, latencias[chave])
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tarefas)))) as executor:
+        futuros = {chave: executor.submit(executar, chave) for chave in tarefas}
+        resultados = {chave: futuro.result() for chave, futuro in futuros.items()}
+    
+    return resultados, latencias
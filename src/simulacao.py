@@ -0,0 +1,347 @@
+"""
+Simulação Monte Carlo do restante do Brasileirão
+
+A partir da classificação atual, simula o resto da temporada muitas vezes
+com operações em lote do NumPy (dependência opcional) e conta quantas
+vezes cada clube termina em cada zona da competição (COMPETICOES, padrão
+SIMULACAO_ZONAS). O resultado tem
+o mesmo formato das páginas de probabilidade do UFMG, que ele substitui
+quando uma delas falta e com as quais pode ser conferido.
+
+A força de cada clube é seu aproveitamento (pontos por jogo), puxado para
+a média da liga por SIMULACAO_REGRESSAO jogos. Em cada jogo o empate tem
+probabilidade fixa e o resto é dividido na proporção das forças, com a
+do mandante multiplicada por SIMULACAO_MANDO. Desempates: vitórias, saldo
+de gols atual e sorteio.
+"""
+import json
+import logging
+from math import lgamma, log
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any
+
+from config.settings import (
+    SIMULACAO_TEMPORADAS, SIMULACAO_LOTE, SIMULACAO_SEMENTE, SIMULACAO_RODADAS,
+    SIMULACAO_EMPATE, SIMULACAO_MANDO, SIMULACAO_REGRESSAO, SIMULACAO_ZONAS,
+    SIMULACAO_DIVERGENCIA, PARTIDAS_FILE
+)
+from src.tabela import Tabela, normalizar_texto
+from src.historico import retrato
+
+logger = logging.getLogger(__name__)
+
+# Limiares (a, b) de um jogo com resultado fixo: o sorteio está em [0, 1)
+LIMIARES_FIXOS = {"V": (2.0, 2.0), "E": (-1.0, 2.0), "D": (-1.0, -1.0)}
+
+
+def carregar_partidas(caminho: Optional[str] = PARTIDAS_FILE) -> Optional[List[Tuple[str, str]]]:
+    """
+    Carrega os jogos restantes da temporada
+
+    Args:
+        caminho: Arquivo JSON com uma lista de pares [mandante, visitante] (vazio = sem arquivo)
+
+    Returns:
+        Lista de (mandante, visitante) normalizados ou None se não houver arquivo
+    """
+    if not caminho:
+        return None
+    with open(Path(caminho), 'r', encoding='utf-8') as f:
+        return [(normalizar_texto(mandante), normalizar_texto(visitante)) for mandante, visitante in json.load(f)]
+
+
+def _probabilidades_jogo(mandante, visitante) -> Tuple:
+    """Probabilidades (vitória do mandante, vitória do visitante) a partir das forças"""
+    forca_mandante = mandante * SIMULACAO_MANDO
+    total = forca_mandante + visitante
+    return (
+        (1 - SIMULACAO_EMPATE) * forca_mandante / total,
+        (1 - SIMULACAO_EMPATE) * visitante / total,
+    )
+
+
+def _pesos_jogos(mandantes, visitantes, quantidade_times: int) -> Tuple:
+    """
+    Matrizes que levam os resultados dos jogos aos pontos e vitórias de cada clube
+
+    Com a = mandante venceu e b = mandante não perdeu (0 ou 1 por jogo), o
+    mandante soma 2a + b pontos e a vitórias; o visitante, 3 - a - 2b pontos
+    e 1 - b vitórias. As somas por clube saem de [a | b] @ pesos + base,
+    numa única multiplicação.
+
+    Returns:
+        Tupla com (pesos 2·jogos x 2·clubes, base 2·clubes)
+    """
+    import numpy as np
+
+    jogos = len(mandantes)
+    mandante = np.zeros((jogos, quantidade_times), dtype=np.float32)
+    mandante[np.arange(jogos), mandantes] = 1
+    visitante = np.zeros_like(mandante)
+    visitante[np.arange(jogos), visitantes] = 1
+    pesos = np.block([
+        [2 * mandante - visitante, mandante],
+        [mandante - 2 * visitante, -visitante],
+    ])
+    jogos_fora = visitante.sum(axis=0)
+    return pesos, np.concatenate([3 * jogos_fora, jogos_fora])
+
+
+def _distribuicao_resultados(restantes: int, vitoria: float) -> Tuple:
+    """
+    Distribuição exata de (vitórias, empates) em jogos independentes
+
+    Args:
+        restantes: Jogos que faltam
+        vitoria: Probabilidade de vitória em cada jogo (o empate é SIMULACAO_EMPATE)
+
+    Returns:
+        Tupla com (probabilidade acumulada, pontos, vitórias) de cada resultado
+    """
+    import numpy as np
+
+    derrota = max(1 - vitoria - SIMULACAO_EMPATE, 1e-12)
+    resultados = [(v, e) for v in range(restantes + 1) for e in range(restantes - v + 1)]
+    logaritmos = np.array([
+        lgamma(restantes + 1) - lgamma(v + 1) - lgamma(e + 1) - lgamma(restantes - v - e + 1)
+        + v * log(vitoria) + e * log(SIMULACAO_EMPATE) + (restantes - v - e) * log(derrota)
+        for v, e in resultados
+    ])
+    acumulada = np.cumsum(np.exp(logaritmos))
+    return (
+        acumulada / acumulada[-1],
+        np.array([3 * v + e for v, e in resultados], dtype=np.float64),
+        np.array([v for v, _ in resultados], dtype=np.float64),
+    )
+
+
+def preparar(
+    classificacao: Tabela,
+    partidas: Optional[List[Tuple[str, str]]] = None,
+    zonas: Optional[Dict[str, Tuple[int, int]]] = None
+) -> Dict[str, Any]:
+    """
+    Monta os vetores da simulação a partir da classificação
+
+    Os vetores só são lidos durante a simulação, então a mesma base pode
+    ser reaproveitada (e enviada uma única vez a outros processos) por
+    várias simulações, como os cenários de src/cenarios.py.
+
+    Args:
+        classificacao: Tabela da classificação geral
+        partidas: Jogos restantes (mandante, visitante) ou None
+        zonas: Posições (inicial, final) de cada objetivo (padrão: SIMULACAO_ZONAS)
+
+    Returns:
+        Dicionário com times, indice, pontos, jogos, vitorias, saldo, forcas,
+        media, zonas e, se houver jogos, mandantes e visitantes (índices)
+
+    Raises:
+        ImportError: Se o numpy não estiver instalado
+        ValueError: Se a classificação estiver vazia
+    """
+    import numpy as np
+
+    dados = retrato({"classificacao_geral": classificacao})
+    times = list(dados)
+    if not times:
+        raise ValueError("Classificação vazia")
+
+    def coluna(nome: str):
+        return np.array([dados[t].get(nome) or 0 for t in times], dtype=np.float64)
+
+    pontos, jogos = coluna("pontos"), coluna("jogos")
+    media = pontos.sum() / jogos.sum() if jogos.sum() else 1.0
+    base = {
+        "times": times,
+        "indice": {time: i for i, time in enumerate(times)},
+        "pontos": pontos,
+        "jogos": jogos,
+        "vitorias": coluna("vitorias"),
+        "saldo": coluna("saldo"),
+        "forcas": (pontos + SIMULACAO_REGRESSAO * media) / (jogos + SIMULACAO_REGRESSAO),
+        "media": media,
+        "zonas": zonas or SIMULACAO_ZONAS,
+        "mandantes": None,
+        "visitantes": None,
+    }
+
+    if partidas is not None:
+        indice = base["indice"]
+        validas = [(indice[m], indice[v]) for m, v in partidas if m in indice and v in indice]
+        if len(validas) < len(partidas):
+            logger.warning("%s jogos com clubes fora da classificação ignorados", len(partidas) - len(validas))
+        base["mandantes"] = np.array([m for m, _ in validas], dtype=np.intp)
+        base["visitantes"] = np.array([v for _, v in validas], dtype=np.intp)
+    return base
+
+
+def simular_base(
+    base: Dict[str, Any],
+    temporadas: int = SIMULACAO_TEMPORADAS,
+    semente: Optional[int] = SIMULACAO_SEMENTE,
+    lote: int = SIMULACAO_LOTE
+) -> Dict[str, Dict[str, float]]:
+    """
+    Simula o restante da temporada a partir de uma base de preparar
+
+    Jogos em base["fixados"] ({índice do jogo: "V", "E" ou "D"}, do ponto
+    de vista do mandante) continuam sorteados, mas com resultado certo: o
+    mesmo sorteio das outras simulações com a mesma semente cai nos mesmos
+    jogos, e a diferença entre cenários não é ruído.
+
+    Args:
+        base: Retorno de preparar
+        temporadas: Número de temporadas simuladas
+        semente: Semente do gerador (None = aleatória)
+        lote: Temporadas simuladas por operação em lote
+
+    Returns:
+        Dicionário {time normalizado: {objetivo: probabilidade em %}}
+    """
+    import numpy as np
+
+    times, pontos, vitorias, saldo = base["times"], base["pontos"], base["vitorias"], base["saldo"]
+    forcas, media, zonas = base["forcas"], base["media"], base["zonas"]
+    com_jogos = base["mandantes"] is not None
+
+    if com_jogos:
+        mandantes, visitantes = base["mandantes"], base["visitantes"]
+        vitoria_mandante, vitoria_visitante = _probabilidades_jogo(forcas[mandantes], forcas[visitantes])
+        limiares = np.stack([vitoria_mandante, 1 - vitoria_visitante]).astype(np.float32)
+        for jogo, resultado in base.get("fixados", {}).items():
+            limiares[:, jogo] = LIMIARES_FIXOS[resultado]
+        pesos, fixo = _pesos_jogos(mandantes, visitantes, len(times))
+    else:
+        restantes = np.maximum(SIMULACAO_RODADAS - base["jogos"], 0).astype(int)
+        casa, fora = _probabilidades_jogo(forcas, media), _probabilidades_jogo(media, forcas)
+        distribuicoes = [
+            _distribuicao_resultados(r, (casa[0][i] + fora[1][i]) / 2)
+            for i, r in enumerate(restantes)
+        ]
+
+    gerador = np.random.default_rng(semente)
+    contagens = {objetivo: np.zeros(len(times), dtype=np.int64) for objetivo in zonas}
+    feitas = 0
+
+    while feitas < temporadas:
+        tamanho = min(lote, temporadas - feitas)
+        if com_jogos:
+            # a = mandante venceu, b = mandante não perdeu; uma multiplicação dá pontos e vitórias
+            sorteio = gerador.random((tamanho, len(mandantes)), dtype=np.float32)
+            resultados = np.concatenate([sorteio < limiares[0], sorteio < limiares[1]], axis=1)
+            somas = resultados.astype(np.float32) @ pesos + fixo
+            pontos_finais = pontos + somas[:, :len(times)]
+            vitorias_finais = vitorias + somas[:, len(times):]
+        else:
+            # Cada clube sorteia (vitórias, empates) direto da sua distribuição exata
+            sorteio = gerador.random((tamanho, len(times)))
+            pontos_finais = np.empty((tamanho, len(times)))
+            vitorias_finais = np.empty((tamanho, len(times)))
+            for i, (acumulada, pontos_resultado, vitorias_resultado) in enumerate(distribuicoes):
+                escolhidos = np.minimum(np.searchsorted(acumulada, sorteio[:, i], side="right"), len(acumulada) - 1)
+                pontos_finais[:, i] = pontos[i] + pontos_resultado[escolhidos]
+                vitorias_finais[:, i] = vitorias[i] + vitorias_resultado[escolhidos]
+
+        # Pontos, vitórias e saldo numa só chave de ordenação; o sorteio desfaz o resto
+        nota = (
+            pontos_finais * 1e6 + vitorias_finais * 1e3 + np.clip(saldo + 500, 0, 999)
+            + gerador.random((tamanho, len(times)))
+        )
+        ordem = np.argsort(-nota, axis=1)
+        for objetivo, (inicial, final) in zonas.items():
+            contagens[objetivo] += np.bincount(ordem[:, inicial - 1:final].ravel(), minlength=len(times))
+        feitas += tamanho
+
+    logger.debug("%s temporadas simuladas (%s)", temporadas, "jogos restantes" if com_jogos else "adversário médio")
+    return {
+        time: {objetivo: 100 * float(contagens[objetivo][i]) / temporadas for objetivo in zonas}
+        for i, time in enumerate(times)
+    }
+
+
+def simular(
+    classificacao: Tabela,
+    partidas: Optional[List[Tuple[str, str]]] = None,
+    temporadas: int = SIMULACAO_TEMPORADAS,
+    semente: Optional[int] = SIMULACAO_SEMENTE,
+    lote: int = SIMULACAO_LOTE,
+    zonas: Optional[Dict[str, Tuple[int, int]]] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Simula o restante da temporada e calcula a probabilidade de cada objetivo
+
+    Args:
+        classificacao: Tabela da classificação geral
+        partidas: Jogos restantes (mandante, visitante). Sem eles, cada clube
+            joga SIMULACAO_RODADAS - jogos contra um adversário de força média,
+            metade em casa
+        temporadas: Número de temporadas simuladas
+        semente: Semente do gerador (None = aleatória)
+        lote: Temporadas simuladas por operação em lote
+        zonas: Posições (inicial, final) de cada objetivo (padrão: SIMULACAO_ZONAS)
+
+    Returns:
+        Dicionário {time normalizado: {objetivo: probabilidade em %}}
+
+    Raises:
+        ImportError: Se o numpy não estiver instalado
+        ValueError: Se a classificação estiver vazia
+    """
+    resultado = simular_base(preparar(classificacao, partidas, zonas), temporadas, semente, lote)
+    logger.info("%s temporadas simuladas (%s)", temporadas, "jogos restantes" if partidas is not None else "adversário médio")
+    return resultado
+
+
+def tabelas_simuladas(
+    resultado: Dict[str, Dict[str, float]],
+    classificacao: Tabela
+) -> Dict[str, Tabela]:
+    """
+    Monta tabelas de probabilidade no formato das páginas do UFMG
+
+    Args:
+        resultado: Retorno de simular
+        classificacao: Classificação usada na simulação (dá nomes e posições)
+
+    Returns:
+        Dicionário {objetivo: Tabela do tipo "probabilidade"} com os objetivos
+        simulados, com origem "simulacao" (o post e o histórico não as
+        atribuem ao UFMG)
+    """
+    tabelas = {}
+    objetivos = next(iter(resultado.values()), {})
+    for objetivo in objetivos:
+        linhas = [
+            [linha["posicao"], linha["time"], f"{resultado[normalizar_texto(linha['time'])][objetivo]:.2f}".replace(".", ",")]
+            for linha in classificacao
+            if normalizar_texto(linha["time"]) in resultado
+        ]
+        tabelas[objetivo] = Tabela.de_celulas([], linhas, "probabilidade", origem="simulacao")
+    return tabelas
+
+
+def divergencias(
+    tabelas: Dict[str, Optional[Tabela]],
+    resultado: Dict[str, Dict[str, float]],
+    limite: float = SIMULACAO_DIVERGENCIA
+) -> List[Tuple[str, str, float, float]]:
+    """
+    Compara as probabilidades do UFMG com a simulação
+
+    Args:
+        tabelas: Tabelas coletadas (as de probabilidade ausentes são ignoradas)
+        resultado: Retorno de simular
+        limite: Diferença mínima em pontos percentuais
+
+    Returns:
+        Lista de (time, objetivo, valor do UFMG, valor simulado) acima do limite
+    """
+    encontradas = []
+    dados = retrato(tabelas)
+    for time, simulado in resultado.items():
+        for objetivo, valor in simulado.items():
+            ufmg = dados.get(time, {}).get(objetivo)
+            if ufmg is not None and abs(ufmg - valor) > limite:
+                encontradas.append((time, objetivo, ufmg, valor))
+    return encontradas
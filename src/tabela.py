@@ -0,0 +1,201 @@
+"""
+Módulo responsável por transformar as tabelas do UFMG em estruturas indexadas
+"""
+import re
+import unicodedata
+from typing import Optional, Dict, List, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Layouts conhecidos das páginas do UFMG.
+# "aliases" mapeia cada coluna canônica para os rótulos aceitos no cabeçalho;
+# "padrao" guarda as posições usadas quando o cabeçalho não identifica a coluna.
+LAYOUTS: Dict[str, Dict[str, Dict]] = {
+    "classificacao": {
+        "aliases": {
+            "posicao": {"POS", "POSICAO", "#", "CLASSIFICACAO"},
+            "time": {"TIME", "CLUBE", "EQUIPE"},
+            "pontos": {"PG", "PTS", "PONTOS", "PNTS"},
+            "jogos": {"J", "JOGOS", "PJ"},
+            "vitorias": {"V", "VITORIAS"},
+            "empates": {"E", "EMPATES"},
+            "derrotas": {"D", "DERROTAS"},
+            "gols_pro": {"GP", "GOLS PRO"},
+            "gols_contra": {"GC", "GOLS CONTRA"},
+            "saldo": {"SG", "SALDO", "SALDO DE GOLS"},
+            "rendimento": {"%", "REND", "RENDIMENTO", "APROV", "APROVEITAMENTO"},
+        },
+        "padrao": {
+            "posicao": 0, "time": 1, "pontos": 2, "jogos": 3, "vitorias": 4,
+            "empates": 5, "derrotas": 6, "gols_pro": 7, "gols_contra": 8,
+            "saldo": 9, "rendimento": 10,
+        },
+    },
+    "probabilidade": {
+        "aliases": {
+            "posicao": {"POS", "POSICAO", "#"},
+            "time": {"TIME", "CLUBE", "EQUIPE"},
+            "probabilidade": {"PROBABILIDADE", "PROB", "CHANCE", "CHANCES", "%"},
+        },
+        "padrao": {"posicao": 0, "time": 1, "probabilidade": 2},
+    },
+}
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza texto removendo acentos e convertendo para maiúsculas
+
+    Args:
+        texto: String para normalizar
+
+    Returns:
+        String normalizada em maiúsculas sem acentos
+    """
+    texto = unicodedata.normalize("NFD", texto)
+    texto = texto.encode("ascii", "ignore").decode("utf-8")
+    return texto.upper()
+
+
+def _normalizar_cabecalho(texto: str) -> str:
+    """Normaliza rótulo de cabeçalho (sem acentos, parênteses e espaços extras)"""
+    texto = re.sub(r"[().:]", " ", normalizar_texto(texto))
+    return " ".join(texto.split())
+
+
+def mapear_colunas(cabecalho: List[str], tipo: str) -> Dict[str, int]:
+    """
+    Descobre a posição de cada coluna canônica a partir do cabeçalho
+
+    Colunas não reconhecidas no cabeçalho usam a posição padrão do layout,
+    desde que essa posição não tenha sido atribuída a outra coluna.
+
+    Args:
+        cabecalho: Textos das células do cabeçalho
+        tipo: Layout da tabela ("classificacao" ou "probabilidade")
+
+    Returns:
+        Dicionário {coluna canônica: índice}
+    """
+    layout = LAYOUTS[tipo]
+    colunas: Dict[str, int] = {}
+
+    for indice, rotulo in enumerate(cabecalho):
+        rotulo = _normalizar_cabecalho(rotulo)
+        for coluna, aliases in layout["aliases"].items():
+            if coluna in colunas:
+                continue
+            if rotulo in aliases or any(rotulo.startswith(a + " ") for a in aliases):
+                colunas[coluna] = indice
+                break
+
+    ocupados = set(colunas.values())
+    for coluna, indice in layout["padrao"].items():
+        if coluna not in colunas and indice not in ocupados:
+            colunas[coluna] = indice
+            ocupados.add(indice)
+
+    return colunas
+
+
+class Tabela:
+    """Tabela de todos os clubes de uma página do UFMG, indexada pelo nome normalizado"""
+
+    def __init__(
+        self,
+        tipo: str,
+        colunas: Dict[str, int],
+        linhas: List[Dict[str, str]],
+        origem: str = "ufmg"
+    ):
+        """
+        Inicializa a tabela e constrói o índice por time
+
+        Args:
+            tipo: Layout da tabela ("classificacao" ou "probabilidade")
+            colunas: Mapeamento {coluna canônica: índice} usado no parse
+            linhas: Linhas já convertidas em dicionários de colunas canônicas
+            origem: De onde vêm os dados ("ufmg" ou "simulacao")
+        """
+        self.tipo = tipo
+        self.colunas = colunas
+        self.linhas = linhas
+        self.origem = origem
+        self.indice: Dict[str, Dict[str, str]] = {
+            normalizar_texto(linha["time"]): linha for linha in linhas
+        }
+
+    @classmethod
+    def de_celulas(
+        cls,
+        cabecalho: List[str],
+        linhas: List[List[str]],
+        tipo: str,
+        origem: str = "ufmg"
+    ) -> "Tabela":
+        """
+        Constrói a tabela a partir das células de texto já extraídas do HTML
+
+        Args:
+            cabecalho: Textos do cabeçalho (pode ser vazio)
+            linhas: Lista de linhas, cada uma com os textos das células
+            tipo: Layout da tabela ("classificacao" ou "probabilidade")
+            origem: De onde vêm os dados ("ufmg" ou "simulacao")
+
+        Returns:
+            Tabela indexada
+        """
+        colunas = mapear_colunas(cabecalho, tipo)
+        minimo = max(colunas.values()) + 1
+        registros = []
+
+        for cols in linhas:
+            if len(cols) < minimo or not cols[colunas["time"]]:
+                continue
+            registros.append({coluna: cols[i] for coluna, i in colunas.items()})
+
+        logger.debug("Tabela '%s' com %s times", tipo, len(registros))
+        return cls(tipo, colunas, registros, origem)
+
+    def para_dict(self) -> Dict:
+        """Serializa a tabela em um dicionário compatível com JSON"""
+        return {"tipo": self.tipo, "colunas": self.colunas, "linhas": self.linhas, "origem": self.origem}
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Tabela":
+        """
+        Reconstrói a tabela serializada por para_dict
+
+        Args:
+            dados: Dicionário com tipo, colunas, linhas e (opcional) origem
+
+        Returns:
+            Tabela indexada
+        """
+        return cls(dados["tipo"], dados["colunas"], dados["linhas"], dados.get("origem", "ufmg"))
+
+    def buscar(self, time: str) -> Optional[Dict[str, str]]:
+        """
+        Busca a linha de um time em O(1)
+
+        Args:
+            time: Nome do time (com ou sem acentos)
+
+        Returns:
+            Dicionário com as colunas do time ou None se não encontrado
+        """
+        return self.indice.get(normalizar_texto(time))
+
+    def times(self) -> List[str]:
+        """Retorna os nomes normalizados de todos os times na ordem da tabela"""
+        return list(self.indice)
+
+    def __contains__(self, time: str) -> bool:
+        return normalizar_texto(time) in self.indice
+
+    def __len__(self) -> int:
+        return len(self.linhas)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self.linhas)
@@ -1,20 +1,36 @@
 """
 Módulo responsável por interagir com a API do Twitter
+
+O tweepy (e sua pilha oauth/requests) só é importado ao criar o cliente:
+execuções sem post não pagam esse custo na inicialização.
 """
-import tweepy
 import logging
-from typing import Optional
+from typing import Optional, Dict, TYPE_CHECKING
 
 from config.settings import TWITTER_CONFIG
+from src.publicadores import Publicador
+
+if TYPE_CHECKING:
+    import tweepy
 
 logger = logging.getLogger(__name__)
 
 
-class TwitterClient:
+class TwitterClient(Publicador):
     """Cliente para interação com a API do Twitter"""
     
-    def __init__(self):
-        """Inicializa o cliente do Twitter com as credenciais"""
+    nome = "twitter"
+    
+    def __init__(self, credenciais: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Inicializa o cliente do Twitter com as credenciais
+        
+        Args:
+            credenciais: Credenciais no formato de TWITTER_CONFIG.
+                Se None, usa TWITTER_CONFIG
+        """
+        super().__init__()
+        self.credenciais = credenciais if credenciais is not None else TWITTER_CONFIG
         self._validar_credenciais()
         self.client = self._criar_cliente()
     
@@ -26,7 +42,7 @@ class TwitterClient:
             ValueError: Se alguma credencial estiver faltando
         """
         credenciais_faltantes = [
-            key for key, value in TWITTER_CONFIG.items() 
+            key for key, value in self.credenciais.items() 
             if not value
         ]
         
@@ -35,24 +51,48 @@ class TwitterClient:
             logger.error(erro)
             raise ValueError(erro)
     
-    def _criar_cliente(self) -> tweepy.Client:
+    def _criar_cliente(self) -> "tweepy.Client":
         """
         Cria instância do cliente do Twitter
         
         Returns:
             Cliente configurado do tweepy
         """
+        import tweepy
+        
         try:
             return tweepy.Client(
-                consumer_key=TWITTER_CONFIG["consumer_key"],
-                consumer_secret=TWITTER_CONFIG["consumer_secret"],
-                access_token=TWITTER_CONFIG["access_token"],
-                access_token_secret=TWITTER_CONFIG["access_token_secret"]
+                consumer_key=self.credenciais["consumer_key"],
+                consumer_secret=self.credenciais["consumer_secret"],
+                access_token=self.credenciais["access_token"],
+                access_token_secret=self.credenciais["access_token_secret"]
             )
         except Exception as e:
-            logger.error(f"Erro ao criar cliente do Twitter: {e}")
+            logger.error("Erro ao criar cliente do Twitter: %s", e)
             raise
     
+    def enviar(self, texto: str, responder_a: Optional[str] = None, chave: Optional[str] = None) -> dict:
+        """
+        Posta um tweet sem tratar erros (usado pela outbox, que decide se retenta)
+        
+        Args:
+            texto: Conteúdo do tweet
+            responder_a: ID do tweet respondido (partes seguintes de uma thread)
+            chave: Ignorada (a API do Twitter não aceita chave de idempotência)
+        
+        Returns:
+            Dados do tweet postado
+        
+        Raises:
+            tweepy.TweepyException: Erro da API (a resposta HTTP fica em e.response)
+        """
+        if responder_a:
+            response = self.client.create_tweet(text=texto, in_reply_to_tweet_id=responder_a)
+        else:
+            response = self.client.create_tweet(text=texto)
+        logger.info("Tweet postado. ID: %s", response.data.get('id'))
+        return response.data
+    
     def postar_tweet(self, texto: str) -> Optional[dict]:
         """
         Posta um tweet
@@ -63,16 +103,18 @@ class TwitterClient:
         Returns:
             Dados do tweet postado ou None em caso de erro
         """
+        import tweepy
+        
         try:
-            logger.info(f"Postando tweet ({len(texto)} caracteres)")
+            logger.info("Postando tweet (%s caracteres)", len(texto))
             response = self.client.create_tweet(text=texto)
-            logger.info(f"Tweet postado com sucesso. ID: {response.data.get('id')}")
+            logger.info("Tweet postado com sucesso. ID: %s", response.data.get('id'))
             return response.data
         except tweepy.TweepyException as e:
-            logger.error(f"Erro ao postar tweet: {e}")
+            logger.error("Erro ao postar tweet: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Erro inesperado ao postar tweet: {e}")
+            logger.error("Erro inesperado ao postar tweet: %s", e)
             return None
     
     def postar_thread(self, tweets: list[str]) -> Optional[list[dict]]:
@@ -85,12 +127,14 @@ class TwitterClient:
         Returns:
             Lista com dados de cada tweet postado ou None em caso de erro
         """
+        import tweepy
+        
         try:
             resultados = []
             tweet_anterior_id = None
             
             for i, texto in enumerate(tweets, 1):
-                logger.info(f"Postando tweet {i}/{len(tweets)}")
+                logger.info("Postando tweet %s/%s", i, len(tweets))
                 
                 if tweet_anterior_id:
                     response = self.client.create_tweet(
@@ -102,16 +146,16 @@ class TwitterClient:
                 
                 tweet_anterior_id = response.data.get('id')
                 resultados.append(response.data)
-                logger.info(f"Tweet {i} postado. ID: {tweet_anterior_id}")
+                logger.info("Tweet %s postado. ID: %s", i, tweet_anterior_id)
             
-            logger.info(f"Thread de {len(tweets)} tweets postada com sucesso")
+            logger.info("Thread de %s tweets postada com sucesso", len(tweets))
             return resultados
             
         except tweepy.TweepyException as e:
-            logger.error(f"Erro ao postar thread: {e}")
+            logger.error("Erro ao postar thread: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Erro inesperado ao postar thread: {e}")
+            logger.error("Erro inesperado ao postar thread: %s", e)
             return None
     
     def deletar_tweet(self, tweet_id: str) -> bool:
@@ -124,14 +168,36 @@ class TwitterClient:
         Returns:
             True se deletado com sucesso, False caso contrário
         """
+        import tweepy
+        
         try:
-            logger.info(f"Deletando tweet ID: {tweet_id}")
+            logger.info("Deletando tweet ID: %s", tweet_id)
             self.client.delete_tweet(tweet_id)
             logger.info("Tweet deletado com sucesso")
             return True
         except tweepy.TweepyException as e:
-            logger.error(f"Erro ao deletar tweet: {e}")
+            logger.error("Erro ao deletar tweet: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Erro inesperado ao deletar tweet: {e}")
-            return False
\ No newline at end of file
+            logger.error("Erro inesperado ao deletar tweet: %s", e)
+            return False
+
+
+_clientes: Dict[tuple, TwitterClient] = {}
+
+
+def obter_cliente(credenciais: Optional[Dict[str, Optional[str]]] = None) -> TwitterClient:
+    """
+    Retorna um cliente do Twitter reaproveitado entre execuções do mesmo processo
+    
+    Args:
+        credenciais: Credenciais no formato de TWITTER_CONFIG.
+            Se None, usa TWITTER_CONFIG
+            
+    Returns:
+        Cliente criado na primeira chamada com essas credenciais
+    """
+    chave = tuple(sorted((credenciais if credenciais is not None else TWITTER_CONFIG).items()))
+    if chave not in _clientes:
+        _clientes[chave] = TwitterClient(credenciais)
+    return _clientes[chave]
@@ -0,0 +1,129 @@
+"""
+Variações entre duas coletas de todos os clubes
+
+comparar percorre uma vez o retrato atual (src/historico.py: {time:
+{coluna: valor}}) e devolve, por clube, o que mudou em relação ao retrato
+anterior: posições ganhas, pontos somados e a variação de cada
+probabilidade. Com o retrato dos últimos posts como base, diz quais
+clubes precisam de um post novo; com a coleta anterior, dá os clubes que
+mais se moveram na rodada.
+"""
+import logging
+from typing import Optional, Dict, List, Any
+
+from src.historico import COLUNAS_CLASSIFICACAO, COLUNAS_PROBABILIDADE
+
+logger = logging.getLogger(__name__)
+
+COLUNAS = COLUNAS_CLASSIFICACAO + COLUNAS_PROBABILIDADE
+
+
+def _diferenca(atual: Optional[float], anterior: Optional[float]) -> Optional[float]:
+    """atual - anterior, ou None se faltar um dos valores"""
+    if atual is None or anterior is None:
+        return None
+    return atual - anterior
+
+
+def comparar(
+    atual: Dict[str, Dict[str, Any]],
+    anterior: Optional[Dict[str, Dict[str, Any]]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compara dois retratos de todos os clubes em uma única passada
+
+    Cada variação tem:
+        time: Nome normalizado do clube
+        novo: True se o clube não estava no retrato anterior
+        mudou: True se alguma coluna mudou (ou o clube é novo)
+        posicao, posicao_anterior: Posições nos dois retratos
+        subiu: Posições ganhas (negativo = caiu)
+        pontos, pontos_ganhos: Pontos atuais e a diferença
+        probabilidades: {tipo: {"atual", "anterior", "variacao"}} dos tipos com valor atual
+        maior_variacao: Maior variação absoluta entre as probabilidades (pontos percentuais)
+
+    Args:
+        atual: Retrato da coleta atual
+        anterior: Retrato usado como base (None = todos os clubes são novos)
+
+    Returns:
+        Dicionário {time: variação}, na ordem do retrato atual
+    """
+    anterior = anterior or {}
+    variacoes: Dict[str, Dict[str, Any]] = {}
+
+    for time, dados in atual.items():
+        antes = anterior.get(time)
+        base = antes or {}
+        posicao, posicao_anterior = dados.get("posicao"), base.get("posicao")
+        subiu = _diferenca(posicao_anterior, posicao)
+
+        probabilidades = {}
+        maior = 0.0
+        for tipo in COLUNAS_PROBABILIDADE:
+            valor = dados.get(tipo)
+            if valor is None:
+                continue
+            variacao = _diferenca(valor, base.get(tipo))
+            probabilidades[tipo] = {"atual": valor, "anterior": base.get(tipo), "variacao": variacao}
+            if variacao is not None:
+                maior = max(maior, abs(variacao))
+
+        variacoes[time] = {
+            "time": time,
+            "novo": antes is None,
+            "mudou": antes is None or any(dados.get(c) != base.get(c) for c in COLUNAS),
+            "posicao": posicao,
+            "posicao_anterior": posicao_anterior,
+            "subiu": subiu,
+            "pontos": dados.get("pontos"),
+            "pontos_ganhos": _diferenca(dados.get("pontos"), base.get("pontos")),
+            "probabilidades": probabilidades,
+            "maior_variacao": maior,
+        }
+
+    logger.debug(
+        "%s clubes comparados, %s com mudanças",
+        len(variacoes), sum(v["mudou"] for v in variacoes.values())
+    )
+    return variacoes
+
+
+def alterados(variacoes: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Retorna os clubes que mudaram, na ordem do retrato atual"""
+    return [time for time, variacao in variacoes.items() if variacao["mudou"]]
+
+
+def maiores_variacoes(
+    variacoes: Dict[str, Dict[str, Any]],
+    quantidade: int = 5,
+    tipo: Optional[str] = None,
+    minimo: float = 0.01
+) -> List[Dict[str, Any]]:
+    """
+    Seleciona os clubes que mais se moveram
+
+    Clubes novos (sem base de comparação) ficam de fora.
+
+    Args:
+        variacoes: Resultado de comparar
+        quantidade: Número máximo de clubes
+        tipo: Ordena pela variação de uma probabilidade (padrão: maior variação
+            entre todas, desempatando pelas posições ganhas ou perdidas)
+        minimo: Variação mínima (pontos percentuais) para um clube entrar sem
+            ter mudado de posição
+
+    Returns:
+        Variações em ordem decrescente de movimento
+    """
+    def movimento(variacao: Dict[str, Any]) -> tuple:
+        if tipo is not None:
+            prob = variacao["probabilidades"].get(tipo) or {}
+            return (abs(prob.get("variacao") or 0.0), 0)
+        return (variacao["maior_variacao"], abs(variacao["subiu"] or 0))
+
+    candidatos = [
+        v for v in variacoes.values()
+        if not v["novo"] and (movimento(v)[0] >= minimo or movimento(v)[1])
+    ]
+    return sorted(candidatos, key=movimento, reverse=True)[:quantidade]
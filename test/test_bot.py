@@ -10,8 +10,11 @@ import os
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.scraper import normalizar_texto
+from src.scraper import normalizar_texto, coletar_em_paralelo
 from src.formatter import formatar_classificacao, formatar_probabilidade
+from src.tabela import Tabela, mapear_colunas
+from src.historico import Historico
+from src.outbox import Outbox
 
 
 class TestScraper(unittest.TestCase):
@@ -26,6 +29,289 @@ class TestScraper(unittest.TestCase):
     def test_normalizar_texto_minusculas(self):
         """Testa que minúsculas são convertidas"""
         self.assertEqual(normalizar_texto("flamengo"), "FLAMENGO")
+    
+    @patch('src.scraper.time.sleep')
+    def test_baixar_pagina_retenta_5xx(self, sleep):
+        """Testa que erros 5xx transitórios são retentados com backoff"""
+        import requests
+        from src.scraper import baixar_pagina
+        
+        erro = Mock(status_code=503, headers={})
+        erro.raise_for_status.side_effect = requests.HTTPError("503")
+        ok = Mock(status_code=200, headers={})
+        sessao = Mock()
+        sessao.get.side_effect = [erro, ok]
+        
+        self.assertIs(baixar_pagina("https://exemplo.com", sessao=sessao), ok)
+        self.assertEqual(sessao.get.call_count, 2)
+        sleep.assert_called_once()
+    
+    def test_baixar_pagina_nao_retenta_404(self):
+        """Testa que erros 4xx não são retentados"""
+        import requests
+        from src.scraper import baixar_pagina
+        
+        erro = Mock(status_code=404, headers={})
+        erro.raise_for_status.side_effect = requests.HTTPError("404")
+        sessao = Mock()
+        sessao.get.return_value = erro
+        
+        with self.assertRaises(requests.HTTPError):
+            baixar_pagina("https://exemplo.com", sessao=sessao)
+        self.assertEqual(sessao.get.call_count, 1)
+    
+    def test_import_main_nao_carrega_bs4_nem_tweepy(self):
+        """Testa que importar main não carrega bs4 nem tweepy (só no primeiro uso)"""
+        import subprocess
+        
+        raiz = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        codigo = (
+            "import sys, main; "
+            "print(','.join(m for m in ('bs4', 'tweepy') if m in sys.modules))"
+        )
+        resultado = subprocess.run(
+            [sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True
+        )
+        
+        self.assertEqual(resultado.returncode, 0, resultado.stderr)
+        self.assertEqual(resultado.stdout.strip(), "")
+
+    def test_coletar_em_paralelo(self):
+        """Testa que a coleta paralela mantém resultados por chave e mede latência"""
+        import time
+        
+        def lenta(url, sufixo):
+            time.sleep(0.2)
+            return url + sufixo
+        
+        tarefas = {
+            chave: (lenta, f"https://exemplo.com/{chave}", ("!",))
+            for chave in ["a", "b", "c", "d"]
+        }
+        
+        inicio = time.perf_counter()
+        resultados, latencias = coletar_em_paralelo(tarefas)
+        duracao = time.perf_counter() - inicio
+        
+        self.assertEqual(resultados["c"], "https://exemplo.com/c!")
+        self.assertEqual(set(latencias), set(tarefas))
+        self.assertLess(duracao, 0.6)
+
+
+class TestCacheHTTP(unittest.TestCase):
+    """Testes para o cache HTTP condicional"""
+    
+    HTML = (
+        "<table><tr><th>Pos</th><th>Time</th><th>Prob</th></tr>"
+        "<tr><td>17</td><td>Vitória</td><td>45,6</td></tr></table>"
+    )
+    
+    def test_revalidacao_304_reutiliza_tabela(self):
+        """Testa que um 304 não baixa nem parseia a página de novo"""
+        import tempfile
+        from src.http_cache import CacheHTTP
+        from src.scraper import carregar_tabela
+        
+        resposta_200 = Mock(status_code=200, text=self.HTML, headers={"ETag": '"v1"'},
+                            encoding="utf-8", url="https://exemplo.com/p")
+        resposta_200.iter_content.return_value = [self.HTML.encode("utf-8")]
+        resposta_304 = Mock(status_code=304, text="", headers={})
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CacheHTTP(tmp, ttl=3600, max_bytes=10**6)
+            
+            sessao = Mock()
+            sessao.get.side_effect = [resposta_200, resposta_304]
+            primeira = carregar_tabela("https://exemplo.com/p", "probabilidade", cache, sessao)
+            with patch('src.scraper.parsear_tabela') as parse:
+                segunda = carregar_tabela("https://exemplo.com/p", "probabilidade", cache, sessao)
+                parse.assert_not_called()
+            
+            self.assertEqual(sessao.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+            self.assertEqual(segunda.buscar("VITORIA"), primeira.buscar("VITORIA"))
+            self.assertEqual(cache.estatisticas["falhas"], 1)
+            self.assertEqual(cache.estatisticas["revalidacoes"], 1)
+    
+    def test_streaming_para_no_time_alvo(self):
+        """Testa que o streaming fecha a conexão ao encontrar o time e não grava cache"""
+        import tempfile
+        from src.http_cache import CacheHTTP
+        from src.scraper import carregar_tabela
+        
+        pedacos = [
+            b"<html>" + b"x" * 50,
+            b"<table><tr><td>1</td><td>Vit\xc3\xb3ria</td><td>45,6</td></tr>",
+            b"<tr><td>2</td><td>Bahia</td><td>1,0</td></tr></table>",
+        ]
+        lidos = []
+        
+        def gerar(chunk_size):
+            for pedaco in pedacos:
+                lidos.append(pedaco)
+                yield pedaco
+        
+        resposta = Mock(status_code=200, headers={}, encoding="utf-8", url="https://exemplo.com/p")
+        resposta.iter_content.side_effect = gerar
+        sessao = Mock()
+        sessao.get.return_value = resposta
+        
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch('src.scraper.PARSER_BACKEND', "htmlparser"):
+            cache = CacheHTTP(tmp, ttl=3600, max_bytes=10**6)
+            tabela = carregar_tabela("https://exemplo.com/p", "probabilidade", cache, sessao,
+                                     streaming=True, parar_em="VITORIA")
+            
+            self.assertEqual(tabela.buscar("VITORIA")["probabilidade"], "45,6")
+            self.assertEqual(len(lidos), 2)
+            resposta.close.assert_called_once()
+            self.assertIsNone(cache.obter("https://exemplo.com/p"))
+    
+    def test_limite_de_tamanho(self):
+        """Testa que entradas antigas são removidas quando o limite é excedido"""
+        import tempfile
+        from src.http_cache import CacheHTTP
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CacheHTTP(tmp, ttl=3600, max_bytes=300)
+            cache.salvar("https://exemplo.com/a", "x" * 200, None, None)
+            cache.salvar("https://exemplo.com/b", "y" * 200, None, None)
+            
+            self.assertIsNone(cache.obter("https://exemplo.com/a"))
+            self.assertIsNotNone(cache.obter("https://exemplo.com/b"))
+
+
+class TestParsers(unittest.TestCase):
+    """Testes para os backends de parse"""
+    
+    HTML = (
+        "<html><body><p>Menu <td>fora</td></p>"
+        "<table><tr><th>Pos</th><th>Time</th><th>Prob (%)</th></tr>"
+        "<tr><td>1</td><td> <b>Atl&eacute;tico</b>-MG </td><td>12,5</td></tr>"
+        "<tr><td>17</td><td>Vitória</td><td>45,6</td></tr>"
+        "</table><table><tr><td>outra</td></tr></table></body></html>"
+    )
+    
+    def test_htmlparser_igual_bs4(self):
+        """Testa que o parser rápido produz as mesmas células que o bs4"""
+        from src.parsers import celulas_htmlparser, celulas_bs4
+        
+        self.assertEqual(celulas_htmlparser(self.HTML), celulas_bs4(self.HTML))
+    
+    def test_backend_indisponivel_usa_bs4(self):
+        """Testa o fallback para bs4 quando o backend não existe"""
+        from src.parsers import extrair_celulas_html, celulas_bs4
+        
+        self.assertEqual(extrair_celulas_html(self.HTML, "inexistente"), celulas_bs4(self.HTML))
+    
+    def test_pagina_sem_tabela(self):
+        """Testa página sem tabela"""
+        from src.parsers import celulas_htmlparser
+        
+        self.assertIsNone(celulas_htmlparser("<html><p>Manutenção</p></html>"))
+
+
+class TestTabela(unittest.TestCase):
+    """Testes para o módulo tabela"""
+    
+    def test_mapear_colunas_pelo_cabecalho(self):
+        """Testa que colunas são encontradas pelo cabeçalho e não pela posição"""
+        colunas = mapear_colunas(["Time", "Pos", "Probabilidade (%)"], "probabilidade")
+        
+        self.assertEqual(colunas, {"time": 0, "posicao": 1, "probabilidade": 2})
+    
+    def test_buscar_time(self):
+        """Testa busca por nome com e sem acentos"""
+        linhas = [
+            ["1", "Flamengo", "12,3"],
+            ["17", "Vitória", "45,6"],
+            ["Total", ""],
+        ]
+        tabela = Tabela.de_celulas([], linhas, "probabilidade")
+        
+        self.assertEqual(len(tabela), 2)
+        self.assertEqual(tabela.buscar("VITORIA")["probabilidade"], "45,6")
+        self.assertIn("Vitória", tabela)
+        self.assertIsNone(tabela.buscar("Bahia"))
+
+
+class TestCache(unittest.TestCase):
+    """Testes para o módulo cache"""
+    
+    def test_impressao_ignora_fora_da_tabela(self):
+        """Testa que só a tabela (com espaços normalizados) entra na impressão digital"""
+        from src.cache import calcular_impressao
+        
+        a = "<p>Atualizado 10:00</p><table><tr><td>1</td></tr></table>"
+        b = "<p>Atualizado 22:00</p><table>\n  <tr><td>1</td></tr>\n</table>"
+        c = "<table><tr><td>2</td></tr></table>"
+        
+        self.assertEqual(calcular_impressao(a), calcular_impressao(b))
+        self.assertNotEqual(calcular_impressao(a), calcular_impressao(c))
+        self.assertIsNone(calcular_impressao("<p>sem tabela</p>"))
+    
+    def test_checksum_detecta_corrupcao(self):
+        """Testa que o cache salvo é validado pelo checksum"""
+        import json
+        import tempfile
+        from src.cache import salvar_dados_cache, carregar_dados_cache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = os.path.join(tmp, "cache.json")
+            salvar_dados_cache({"Posicao": "15º"}, {"rebaixamento": "5,0"}, caminho)
+            
+            self.assertEqual(carregar_dados_cache(caminho)["classificacao"]["Posicao"], "15º")
+            self.assertEqual(os.listdir(tmp), ["cache.json"])  # Sem temporários sobrando
+            
+            with open(caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+            dados["classificacao"]["Posicao"] = "1º"
+            with open(caminho, "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+            
+            self.assertIsNone(carregar_dados_cache(caminho))
+    
+    @unittest.skipIf(sys.platform == 'win32', "permissões POSIX")
+    def test_escrita_atomica_mantem_permissoes(self):
+        """Testa que o rename do temporário não deixa o arquivo com 0600"""
+        import stat
+        import tempfile
+        from src.cache import escrever_atomico
+        from pathlib import Path
+        
+        with tempfile.TemporaryDirectory() as tmp, patch('src.cache._UMASK', 0o022):
+            caminho = Path(tmp) / "cache.json"
+            escrever_atomico(caminho, "{}")
+            self.assertEqual(stat.S_IMODE(caminho.stat().st_mode), 0o644)
+            
+            os.chmod(caminho, 0o640)
+            escrever_atomico(caminho, "[]")
+            self.assertEqual(stat.S_IMODE(caminho.stat().st_mode), 0o640)
+    
+    def test_trava_exclusiva(self):
+        """Testa que uma segunda execução não entra enquanto a trava está ocupada"""
+        import tempfile
+        from src.cache import trava_cache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = os.path.join(tmp, "cache.json")
+            with trava_cache(caminho):
+                with self.assertRaises(TimeoutError):
+                    with trava_cache(caminho, timeout=0.3):
+                        pass
+            
+            with trava_cache(caminho, timeout=0.3):
+                pass
+    
+    def test_paginas_mudaram(self):
+        """Testa a comparação das impressões digitais com o cache"""
+        from src.cache import paginas_mudaram
+        
+        cache = {"impressoes": {"a": "1", "b": "2"}}
+        
+        self.assertFalse(paginas_mudaram({"a": "1", "b": "2"}, cache))
+        self.assertTrue(paginas_mudaram({"a": "1", "b": "3"}, cache))
+        self.assertTrue(paginas_mudaram({"a": "1", "b": None}, cache))
+        self.assertTrue(paginas_mudaram({"a": "1", "b": "2"}, {"classificacao": {}}))
 
 
 class TestFormatter(unittest.TestCase):
@@ -63,12 +349,106 @@ class TestFormatter(unittest.TestCase):
         resultado = formatar_probabilidade("libertadores", "N/A")
         
         self.assertIn("N/A", resultado)
+    
+    def test_renderizar_lote_igual_a_gerar_tweet(self):
+        """Testa que o lote gera os mesmos tweets de gerar_tweet, com datas por item"""
+        from datetime import datetime
+        from src.formatter import gerar_tweet, renderizar_lote
+        
+        classificacao = {
+            "Posicao": "3º", "Pnts": "50", "Jogos": "25/38", "Vitorias": "15",
+            "Empates": "5", "Derrotas": "5", "SG": "+12", "Rendimento": "66.67%"
+        }
+        itens = [
+            {"classificacao": classificacao, "probabilidades": {"libertadores": "81,2", "rebaixamento": "0,1"},
+             "time": "BAHIA", "emoji_time": "🔵🔴⚪"},
+            {"classificacao": None, "probabilidades": {"sulamericana": "N/A"}},
+            {"classificacao": classificacao, "probabilidades": {"rebaixamento": "2"},
+             "time": "SPORT", "emoji_time": "🔴⚫", "quando": datetime(2025, 5, 4, 23, 50)},
+        ]
+        
+        tweets = renderizar_lote(itens)
+        
+        esperados = [
+            gerar_tweet(i["classificacao"], i["probabilidades"], **{k: i[k] for k in ("time", "emoji_time") if k in i})
+            for i in itens
+        ]
+        self.assertEqual(tweets[:2], esperados[:2])
+        self.assertEqual(tweets[2], esperados[2].replace(datetime.now().strftime("%d/%m/%y"), "04/05/25"))
+        self.assertIn("81.20%", tweets[0])
+        self.assertIn("Dados indisponíveis", tweets[1])
+    
+    def test_renderizar_lote_com_clube_da_serie_b(self):
+        """Testa que o lote usa a competição de cada item, como gerar_tweet com serie"""
+        from src.formatter import gerar_tweet, renderizar_lote
+        
+        classificacao = {
+            "Posicao": "2º", "Pnts": "60", "Jogos": "30/38", "Vitorias": "18",
+            "Empates": "6", "Derrotas": "6", "SG": "+20", "Rendimento": "66.67%"
+        }
+        probabilidades = {"rebaixamento": "0,0"}
+        itens = [
+            {"classificacao": classificacao, "probabilidades": probabilidades,
+             "time": "SPORT", "emoji_time": "🔴⚫", "competicao": "serie_b"},
+            {"classificacao": classificacao, "probabilidades": probabilidades,
+             "time": "VITORIA", "emoji_time": "🔴⚫"},
+        ]
+        
+        serie_b, serie_a = renderizar_lote(itens)
+        
+        self.assertEqual(serie_b, gerar_tweet(classificacao, probabilidades, "SPORT", "🔴⚫", serie="Serie B"))
+        self.assertIn("Serie B", serie_b)
+        self.assertNotIn("Serie A", serie_b)
+        self.assertIn("Serie A", serie_a)
+    
+    def test_peso_tweet_conta_emojis_como_dois(self):
+        """Testa o peso do Twitter para emojis, sequências e acentos"""
+        from src.formatter import peso_tweet
+        
+        self.assertEqual(peso_tweet("VITÓRIA 12º"), 11)
+        self.assertEqual(peso_tweet("🔴⚫"), 4)
+        self.assertEqual(peso_tweet("⬇🛑"), 4)
+        self.assertEqual(peso_tweet("🇧🇷"), 2)
+        self.assertEqual(peso_tweet("👨‍👩‍👧"), 2)
+        self.assertEqual(peso_tweet("👍🏽 1️⃣"), 5)
+    
+    def test_gerar_thread_com_muitos_emojis(self):
+        """Testa que conteúdo acima do peso vira thread dividida só entre seções"""
+        from src.formatter import gerar_thread, gerar_tweet, modelo_tweet, peso_tweet
+        from config.settings import MAX_TWEET_LENGTH
+        
+        classificacao = {
+            "Posicao": "1º", "Pnts": "80", "Jogos": "38/38", "Vitorias": "24",
+            "Empates": "8", "Derrotas": "6", "SG": "+40", "Rendimento": "70.18%"
+        }
+        probabilidades = {"rebaixamento": "0", "sulamericana": "0", "libertadores": "100"}
+        clubes = [("VITORIA", "🔴⚫"), ("BAHIA", "🔵⚪🔴"), ("ATLETICO MINEIRO", "🐓⚫⚪" * 6), ("FLAMENGO", "🇧🇷🔴⚫👨‍👩‍👧" * 30)]
+        
+        for time, emoji in clubes:
+            thread = gerar_thread(classificacao, probabilidades, time=time, emoji_time=emoji)
+            modelo = modelo_tweet(time, emoji)
+            secoes = [secao.strip("\n") for secao in modelo.secoes(classificacao, probabilidades, modelo.data())]
+            
+            self.assertTrue(all(peso_tweet(tweet) <= MAX_TWEET_LENGTH for tweet in thread))
+            # Nada se perde e cada seção fica inteira em uma única parte
+            self.assertEqual([s for tweet in thread for s in tweet.split("\n") if s],
+                             [s for secao in secoes for s in secao.split("\n") if s])
+            for secao in secoes:
+                self.assertEqual(sum(secao in tweet for tweet in thread), 1)
+            if len(thread) == 1:
+                self.assertEqual(thread[0], gerar_tweet(classificacao, probabilidades, time=time, emoji_time=emoji))
+        
+        # Só por contagem de caracteres o post do Atlético caberia em um tweet
+        thread = gerar_thread(classificacao, probabilidades, time="ATLETICO MINEIRO", emoji_time="🐓⚫⚪" * 6)
+        self.assertLessEqual(len("\n".join(thread)), MAX_TWEET_LENGTH)
+        self.assertGreater(len(thread), 1)
+        self.assertTrue(thread[-1].endswith("Fonte: UFMG"))
 
 
 class TestTwitterClient(unittest.TestCase):
     """Testes para o cliente do Twitter"""
     
-    @patch('src.twitter_client.tweepy.Client')
+    @patch('tweepy.Client')
     def test_postar_tweet(self, mock_client):
         """Testa postagem de tweet"""
         from src.twitter_client import TwitterClient
@@ -92,5 +472,992 @@ class TestTwitterClient(unittest.TestCase):
             self.assertEqual(resultado["id"], "123456")
 
 
+
+def tabelas_exemplo():
+    """Tabelas mínimas com dois clubes para os testes do fluxo principal"""
+    classificacao = Tabela.de_celulas([], [
+        ["1", "Bahia", "70", "38", "20", "10", "8", "60", "40", "20", "61.4"],
+        ["15", "Vitória", "45", "38", "11", "12", "15", "40", "57", "-17", "39.47"],
+    ], "classificacao")
+    tabelas = {"classificacao_geral": classificacao}
+    for tipo, valores in [("rebaixamento", ("0,1", "5,0")),
+                          ("sulamericana", ("90,0", "1,0")),
+                          ("libertadores", ("80,0", "0,0"))]:
+        tabelas[tipo] = Tabela.de_celulas([], [
+            ["1", "Bahia", valores[0]],
+            ["15", "Vitória", valores[1]],
+        ], "probabilidade")
+    return tabelas
+
+
+class TestMulticlubes(unittest.TestCase):
+    """Testes para o modo com vários clubes"""
+    
+    def test_fanout_com_uma_coleta(self):
+        """Testa que todos os clubes usam uma única coleta e caches separados"""
+        import json
+        import tempfile
+        import main
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            clubes_path = os.path.join(tmp, "clubes.json")
+            with open(clubes_path, "w", encoding="utf-8") as f:
+                json.dump([
+                    {"nome": "Vitória", "emoji": "🔴⚫", "prefixo_env": "VIT",
+                     "cache": os.path.join(tmp, "vitoria.json")},
+                    {"nome": "Bahia", "emoji": "🔵", "prefixo_env": "BAH",
+                     "cache": os.path.join(tmp, "bahia.json")},
+                ], f)
+            
+            conteudos = {chave: {"impressao": f"hash-{chave}"} for chave in main.URLS}
+            historico = Historico(":memory:")
+            
+            with patch('main.historico_padrao', return_value=historico), \
+                 patch('main.outbox_padrao', return_value=Outbox(":memory:")), \
+                 patch('main.baixar_competicoes', return_value={"serie_a": conteudos}) as coleta, \
+                 patch('main.parsear_conteudos', return_value=tabelas_exemplo()) as parse, \
+                 patch('main.obter_publicadores') as publicadores:
+                canal = Mock(nome="twitter")
+                canal.enviar.return_value = {"id": "1"}
+                publicadores.return_value = [canal]
+                sucesso = main.executar_multiclubes(caminho=clubes_path)
+                
+                self.assertTrue(sucesso)
+                coleta.assert_called_once()
+                parse.assert_called_once()
+                self.assertEqual(canal.enviar.call_count, 2)
+                
+                with open(os.path.join(tmp, "bahia.json"), encoding="utf-8") as f:
+                    self.assertEqual(json.load(f)["classificacao"]["Posicao"], "1º")
+                
+                # Segunda execução com as mesmas páginas: encerra antes do parse
+                self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+                parse.assert_called_once()
+                self.assertEqual(canal.enviar.call_count, 2)
+            
+            self.assertEqual(historico.ultimo_post("BAHIA")["probabilidades"]["rebaixamento"], "0,1")
+    
+    def test_post_acima_do_limite_vira_thread(self):
+        """Testa que um clube com muitos emojis publica uma thread em vez de cortar o post"""
+        import json
+        import tempfile
+        import main
+        from src.formatter import peso_tweet
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            clubes_path = os.path.join(tmp, "clubes.json")
+            with open(clubes_path, "w", encoding="utf-8") as f:
+                json.dump([
+                    {"nome": "Vitória", "emoji": "🔴⚫" * 30, "prefixo_env": "VIT",
+                     "cache": os.path.join(tmp, "vitoria.json")},
+                    {"nome": "Bahia", "emoji": "🔵", "prefixo_env": "BAH",
+                     "cache": os.path.join(tmp, "bahia.json")},
+                ], f)
+            
+            conteudos = {chave: {"impressao": f"hash-{chave}"} for chave in main.URLS}
+            
+            with patch('main.historico_padrao', return_value=Historico(":memory:")), \
+                 patch('main.outbox_padrao', return_value=Outbox(":memory:")), \
+                 patch('main.baixar_competicoes', return_value={"serie_a": conteudos}), \
+                 patch('main.parsear_conteudos', return_value=tabelas_exemplo()), \
+                 patch('main.obter_publicadores') as publicadores:
+                canal = Mock(nome="twitter")
+                canal.enviar.side_effect = [{"id": str(i)} for i in range(1, 10)]
+                publicadores.return_value = [canal]
+                
+                self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+            
+            textos = [chamada.args[0] for chamada in canal.enviar.call_args_list]
+            respostas = [chamada.kwargs["responder_a"] for chamada in canal.enviar.call_args_list]
+            self.assertEqual(len(textos), 3)  # Vitória em 2 partes, Bahia em 1
+            self.assertEqual(respostas, [None, "1", None])
+            self.assertTrue(all(peso_tweet(texto) <= 280 for texto in textos))
+            self.assertNotIn("...", textos[0] + textos[1])
+            self.assertIn("Fonte: UFMG", textos[1])
+
+
+class TestVariacoes(unittest.TestCase):
+    """Testes para o diff entre coletas de todos os clubes"""
+    
+    def test_comparar_e_maiores_variacoes(self):
+        """Testa as variações por clube e a seleção dos que mais se moveram"""
+        from src.variacoes import comparar, alterados, maiores_variacoes
+        from src.formatter import gerar_variacoes, peso_tweet
+        
+        anterior = {
+            "VITORIA": {"posicao": 17, "pontos": 20, "rebaixamento": 60.0, "sulamericana": 1.0},
+            "BAHIA": {"posicao": 5, "pontos": 40, "rebaixamento": 0.1, "libertadores": 50.0},
+            "SPORT": {"posicao": 20, "pontos": 10, "rebaixamento": 99.0},
+        }
+        atual = {
+            "VITORIA": {"posicao": 15, "pontos": 23, "rebaixamento": 41.25, "sulamericana": 1.0},
+            "BAHIA": {"posicao": 6, "pontos": 40, "rebaixamento": 0.1, "libertadores": 44.0},
+            "SPORT": {"posicao": 20, "pontos": 10, "rebaixamento": 99.0},
+            "CEARA": {"posicao": 12, "pontos": 30},
+        }
+        
+        variacoes = comparar(atual, anterior)
+        
+        vitoria = variacoes["VITORIA"]
+        self.assertEqual((vitoria["subiu"], vitoria["pontos_ganhos"]), (2, 3))
+        self.assertEqual(vitoria["probabilidades"]["rebaixamento"]["variacao"], -18.75)
+        self.assertEqual(vitoria["maior_variacao"], 18.75)
+        self.assertEqual(variacoes["BAHIA"]["subiu"], -1)
+        self.assertTrue(variacoes["CEARA"]["novo"])
+        self.assertEqual(alterados(variacoes), ["VITORIA", "BAHIA", "CEARA"])
+        self.assertEqual([v["time"] for v in maiores_variacoes(variacoes)], ["VITORIA", "BAHIA"])
+        self.assertEqual([v["time"] for v in maiores_variacoes(variacoes, tipo="libertadores")], ["BAHIA"])
+        
+        tweets = gerar_variacoes(maiores_variacoes(variacoes))
+        texto = "\n".join(tweets)
+        self.assertIn("VITORIA: 17º → 15º (▲2) | Pnts: 23 (+3)", texto)
+        self.assertIn("60.00% → 41.25% (-18.75)", texto)
+        self.assertNotIn("Sula", texto)  # Sem variação
+        self.assertTrue(all(peso_tweet(tweet) <= 280 for tweet in tweets))
+    
+    def test_multiclubes_so_atualiza_clubes_que_mudaram(self):
+        """Testa que só o clube com dados novos é renderizado e postado de novo"""
+        import json
+        import tempfile
+        import main
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            clubes_path = os.path.join(tmp, "clubes.json")
+            with open(clubes_path, "w", encoding="utf-8") as f:
+                json.dump([
+                    {"nome": "Vitória", "emoji": "🔴⚫", "prefixo_env": "VIT",
+                     "cache": os.path.join(tmp, "vitoria.json")},
+                    {"nome": "Bahia", "emoji": "🔵", "prefixo_env": "BAH",
+                     "cache": os.path.join(tmp, "bahia.json")},
+                ], f)
+            
+            historico = Historico(":memory:")
+            tabelas = tabelas_exemplo()
+            novas = tabelas_exemplo()
+            novas["rebaixamento"] = Tabela.de_celulas([], [
+                ["1", "Bahia", "0,1"],
+                ["15", "Vitória", "7,5"],
+            ], "probabilidade")
+            
+            with patch('main.historico_padrao', return_value=historico), \
+                 patch('main.outbox_padrao', return_value=Outbox(":memory:")), \
+                 patch('main.gerar_thread', wraps=main.gerar_thread) as render, \
+                 patch('main.obter_publicadores') as publicadores:
+                canal = Mock(nome="twitter")
+                canal.enviar.side_effect = [{"id": str(i)} for i in range(1, 10)]
+                publicadores.return_value = [canal]
+                
+                for indice, dados in enumerate([tabelas, novas]):
+                    conteudos = {chave: {"impressao": f"hash-{chave}-{indice}"} for chave in main.URLS}
+                    with patch('main.baixar_competicoes', return_value={"serie_a": conteudos}), \
+                         patch('main.parsear_conteudos', return_value=dados):
+                        self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+            
+            self.assertEqual(render.call_count, 3)
+            self.assertEqual(canal.enviar.call_count, 3)
+            self.assertIn("7.50%", canal.enviar.call_args.args[0])
+            self.assertEqual(historico.ultimo_post("VITORIA")["probabilidades"]["rebaixamento"], "7,5")
+
+    
+    def test_duas_competicoes_com_uma_coleta(self):
+        """Testa clubes da Série A e da Série B com cada página baixada uma vez"""
+        import json
+        import tempfile
+        import main
+        
+        serie_b = {
+            "classificacao_geral": Tabela.de_celulas([], [
+                ["5", "Sport", "50", "30", "14", "8", "8", "40", "30", "10", "55.6"],
+            ], "classificacao"),
+            "rebaixamento": Tabela.de_celulas([], [["5", "Sport", "2,5"]], "probabilidade"),
+        }
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            clubes_path = os.path.join(tmp, "clubes.json")
+            with open(clubes_path, "w", encoding="utf-8") as f:
+                json.dump([
+                    {"nome": "Vitória", "emoji": "🔴⚫", "cache": os.path.join(tmp, "vitoria.json")},
+                    {"nome": "Sport", "emoji": "🦁", "competicao": "serie_b",
+                     "cache": os.path.join(tmp, "sport.json")},
+                ], f)
+            historico = Historico(":memory:")
+            
+            with patch('main.historico_padrao', return_value=historico), \
+                 patch('main.outbox_padrao', return_value=Outbox(":memory:")), \
+                 patch('main.obter_conteudo', side_effect=lambda url, sessao=None: {"impressao": url, "origem": "rede", "bytes": 1}) as baixar, \
+                 patch('main.parsear_conteudos', side_effect=lambda c: serie_b if len(c) == 2 else tabelas_exemplo()), \
+                 patch('main.obter_publicadores') as publicadores:
+                canal = Mock(nome="twitter")
+                canal.enviar.side_effect = [{"id": str(i)} for i in range(1, 10)]
+                publicadores.return_value = [canal]
+                
+                self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+            
+            urls = [chamada.args[0] for chamada in baixar.call_args_list]
+            self.assertEqual(len(urls), 6)
+            self.assertEqual(len(set(urls)), 6)
+            
+            textos = {chamada.args[0].split()[0]: chamada.args[0] for chamada in canal.enviar.call_args_list}
+            self.assertIn("Serie B", textos["SPORT"])
+            self.assertNotIn("Libertadores", textos["SPORT"])
+            self.assertIn("Serie A", textos["VITORIA"])
+            self.assertEqual(
+                sorted(c for (c,) in historico.conexao.execute("SELECT competicao FROM coletas")),
+                ["serie_a", "serie_b"]
+            )
+
+
+class TestColeta(unittest.TestCase):
+    """Testes para o plano de coleta e o limite de taxa por host"""
+    
+    def test_plano_sem_paginas_repetidas(self):
+        """Testa que cada URL entra uma vez no plano, mesmo compartilhada entre competições"""
+        from src.coleta import planejar
+        
+        competicoes = {
+            "a": {"nome": "A", "paginas": {"classificacao_geral": "https://x/a", "rebaixamento": "https://x/r"}},
+            "b": {"nome": "B", "paginas": {"classificacao_geral": "https://x/b", "rebaixamento": "https://x/r"}},
+        }
+        with patch('src.coleta.COMPETICOES', competicoes):
+            plano = planejar(["a", "b", "a"])
+            with self.assertRaises(ValueError):
+                planejar(["c"])
+        
+        self.assertEqual(plano["urls"], ["https://x/a", "https://x/r", "https://x/b"])
+        self.assertEqual(plano["paginas"]["b"]["rebaixamento"], "https://x/r")
+    
+    def test_balde_de_fichas(self):
+        """Testa a rajada inicial, a espera pela taxa e a reposição com o tempo"""
+        from src.coleta import BaldeDeFichas
+        
+        agora = [0.0]
+        esperas = []
+        balde = BaldeDeFichas(2.0, 2, relogio=lambda: agora[0], dormir=esperas.append)
+        
+        self.assertEqual([balde.aguardar() for _ in range(4)], [0.0, 0.0, 0.5, 1.0])
+        self.assertEqual(esperas, [0.5, 1.0])
+        agora[0] = 10.0
+        self.assertEqual(balde.aguardar(), 0.0)
+
+
+class TestResiliencia(unittest.TestCase):
+    """Testes para o prazo da execução, o disjuntor e os dados obsoletos"""
+    
+    def test_prazo_divide_o_tempo(self):
+        """Testa que o timeout encolhe com o prazo e falha quando só resta a reserva"""
+        from src.resiliencia import Prazo, PrazoEsgotado
+        
+        agora = [0.0]
+        prazo = Prazo(30, reserva=5, relogio=lambda: agora[0])
+        
+        self.assertEqual(prazo.timeout(15), 15)
+        agora[0] = 20.0
+        self.assertEqual(prazo.timeout(15), 5)
+        agora[0] = 26.0
+        with self.assertRaises(PrazoEsgotado):
+            prazo.timeout(15)
+    
+    def test_disjuntor_abre_testa_e_fecha(self):
+        """Testa abertura no limite, a requisição de teste após a espera e a persistência"""
+        import tempfile
+        from src.resiliencia import Disjuntor
+        
+        agora = [1000.0]
+        with tempfile.TemporaryDirectory() as tmp:
+            arquivo = os.path.join(tmp, "disjuntor.json")
+            disjuntor = Disjuntor("ufmg", limite=2, espera=60, arquivo=arquivo, relogio=lambda: agora[0])
+            
+            disjuntor.registrar_falha()
+            self.assertTrue(disjuntor.permitir())
+            disjuntor.registrar_falha()
+            self.assertFalse(disjuntor.permitir())
+            
+            # Outra execução (cron) encontra o disjuntor aberto
+            outro = Disjuntor("ufmg", limite=2, espera=60, arquivo=arquivo, relogio=lambda: agora[0])
+            self.assertTrue(outro.aberto)
+            
+            agora[0] += 61
+            self.assertTrue(disjuntor.permitir())
+            self.assertFalse(disjuntor.permitir())  # só uma requisição de teste
+            disjuntor.registrar_falha()
+            self.assertFalse(disjuntor.permitir())  # teste falhou: reabre
+            
+            agora[0] += 61
+            self.assertTrue(disjuntor.permitir())
+            disjuntor.registrar_sucesso()
+            self.assertTrue(disjuntor.permitir())
+            self.assertFalse(Disjuntor("ufmg", arquivo=arquivo).aberto)
+    
+    @patch('src.scraper.time.sleep')
+    def test_falha_do_site_usa_cache_obsoleto(self, sleep):
+        """Testa que, com o site fora do ar, a última versão do cache é usada e o circuito abre"""
+        import tempfile
+        import requests
+        from src.http_cache import CacheHTTP
+        from src.resiliencia import Disjuntor, CircuitoAberto
+        from src.scraper import obter_conteudo
+        
+        url = "https://exemplo.com/p"
+        tabela = Tabela.de_celulas([], [["17", "Vitória", "45,6"]], "probabilidade")
+        disjuntor = Disjuntor("exemplo.com", limite=3, espera=300, arquivo="")
+        sessao = Mock()
+        sessao.get.side_effect = requests.ConnectionError("fora do ar")
+        
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch('src.scraper._disjuntor_host', return_value=disjuntor):
+            cache = CacheHTTP(tmp, ttl=3600, max_bytes=10**6)
+            cache.salvar(url, "<table></table>", '"v1"', None, tabela=tabela.para_dict())
+            
+            conteudo = obter_conteudo(url, cache, sessao)
+            self.assertEqual(conteudo["origem"], "obsoleto")
+            self.assertEqual(conteudo["tabela"].buscar("VITORIA")["probabilidade"], "45,6")
+            self.assertIsNotNone(conteudo["atualizado_em"])
+            self.assertTrue(disjuntor.aberto)
+            
+            # Com o circuito aberto nem há requisição
+            chamadas = sessao.get.call_count
+            self.assertEqual(obter_conteudo(url, cache, sessao)["origem"], "obsoleto")
+            self.assertEqual(sessao.get.call_count, chamadas)
+            self.assertEqual(cache.estatisticas["obsoletos"], 2)
+            
+            with self.assertRaises(CircuitoAberto):
+                obter_conteudo("https://exemplo.com/sem-cache", cache, sessao)
+    
+    def test_disjuntor_meio_aberto_liberado_em_erro_inesperado(self):
+        """Testa que um erro fora do requests na requisição de teste não prende o disjuntor"""
+        from src.resiliencia import Disjuntor
+        from src.scraper import baixar_pagina
+        
+        agora = [1000.0]
+        disjuntor = Disjuntor("exemplo.com", limite=1, espera=60, arquivo="", relogio=lambda: agora[0])
+        disjuntor.registrar_falha()
+        agora[0] += 61
+        sessao = Mock()
+        sessao.get.side_effect = KeyboardInterrupt
+        
+        with patch('src.scraper._disjuntor_host', return_value=disjuntor), \
+             patch('src.scraper._balde_host', return_value=None):
+            with self.assertRaises(KeyboardInterrupt):
+                baixar_pagina("https://exemplo.com/p", sessao=sessao)
+        
+        # Continua aberto, mas a próxima requisição de teste pode passar
+        self.assertTrue(disjuntor.aberto)
+        self.assertTrue(disjuntor.permitir())
+    
+    def test_post_obsoleto_marcado_ou_pulado(self):
+        """Testa o rodapé de dados obsoletos, DADOS_OBSOLETOS=pular e o post incompleto cancelado"""
+        import json
+        import tempfile
+        import main
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            clubes_path = os.path.join(tmp, "clubes.json")
+            with open(clubes_path, "w", encoding="utf-8") as f:
+                json.dump([{"nome": "Vitória", "emoji": "🔴⚫", "prefixo_env": "VIT",
+                            "cache": os.path.join(tmp, "vitoria.json")}], f)
+            
+            conteudos = {
+                chave: {"impressao": f"hash-{chave}", "origem": "obsoleto", "atualizado_em": 1699963200}
+                for chave in main.URLS
+            }
+            incompletas = dict(tabelas_exemplo(), rebaixamento=None)
+            
+            with patch('main.historico_padrao', return_value=Historico(":memory:")), \
+                 patch('main.outbox_padrao', return_value=Outbox(":memory:")), \
+                 patch('main.SIMULACAO', "desligado"), \
+                 patch('main.baixar_competicoes', return_value={"serie_a": conteudos}), \
+                 patch('main.parsear_conteudos', side_effect=[incompletas, tabelas_exemplo(), tabelas_exemplo(), tabelas_exemplo()]) as parse, \
+                 patch('main.obter_publicadores') as publicadores:
+                canal = Mock(nome="twitter")
+                canal.enviar.return_value = {"id": "1"}
+                publicadores.return_value = [canal]
+                
+                self.assertFalse(main.executar_multiclubes(caminho=clubes_path))
+                canal.enviar.assert_not_called()
+                
+                with patch('main.DADOS_OBSOLETOS', "pular"):
+                    self.assertFalse(main.executar_multiclubes(caminho=clubes_path))
+                canal.enviar.assert_not_called()
+                
+                self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+                
+                # Páginas novas com os mesmos dados do clube: sem post, mas as
+                # impressões vão para o cache e a próxima coleta nem faz o parse
+                for conteudo in conteudos.values():
+                    conteudo["impressao"] += "-novo"
+                self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+                self.assertTrue(main.executar_multiclubes(caminho=clubes_path))
+                self.assertEqual(parse.call_count, 4)
+                self.assertEqual(canal.enviar.call_count, 2)  # Só a thread do primeiro post
+            
+            with open(os.path.join(tmp, "vitoria.json"), encoding="utf-8") as f:
+                self.assertTrue(all(v.endswith("-novo") for v in json.load(f)["impressoes"].values()))
+            
+            texto = canal.enviar.call_args.args[0]
+            self.assertIn("site fora do ar", texto)
+            self.assertIn("14/11", texto)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy não instalado")
+class TestSimulacao(unittest.TestCase):
+    """Testes para a simulação Monte Carlo local"""
+    
+    def classificacao(self):
+        """Quatro clubes a um jogo do fim: Alfa campeão e Delta rebaixado garantidos"""
+        return Tabela.de_celulas([], [
+            ["1", "Alfa", "20", "5", "6", "2", "0", "0", "0", "10", "0"],
+            ["2", "Beta", "10", "5", "3", "1", "1", "0", "0", "2", "0"],
+            ["3", "Gama", "9", "5", "3", "0", "2", "0", "0", "1", "0"],
+            ["4", "Delta", "0", "5", "0", "0", "5", "0", "0", "-13", "0"],
+        ], "classificacao")
+    
+    @patch('src.simulacao.SIMULACAO_RODADAS', 6)
+    @patch('src.simulacao.SIMULACAO_ZONAS', {"libertadores": (1, 2), "rebaixamento": (4, 4)})
+    def test_simular_nos_dois_modelos(self):
+        """Testa probabilidades garantidas, soma por zona e determinismo pela semente"""
+        from src.simulacao import simular
+        
+        for partidas in (None, [("ALFA", "DELTA"), ("BETA", "GAMA")]):
+            resultado = simular(self.classificacao(), partidas, temporadas=20000, lote=7000)
+            
+            self.assertEqual(resultado["ALFA"]["libertadores"], 100.0)
+            self.assertEqual(resultado["DELTA"]["rebaixamento"], 100.0)
+            # Beta e Gama disputam a segunda vaga na última rodada
+            self.assertGreater(resultado["BETA"]["libertadores"], resultado["GAMA"]["libertadores"])
+            self.assertGreater(resultado["GAMA"]["libertadores"], 0.0)
+            self.assertAlmostEqual(sum(r["libertadores"] for r in resultado.values()), 200.0)
+            self.assertEqual(resultado, simular(self.classificacao(), partidas, temporadas=20000, lote=7000))
+    
+    @patch('main.SIMULACAO', "fallback")
+    @patch('src.simulacao.SIMULACAO_TEMPORADAS', 2000)
+    def test_pagina_ausente_usa_simulacao(self):
+        """Testa que uma página de probabilidade fora do ar é preenchida pela simulação"""
+        import main
+        
+        tabelas = tabelas_exemplo()
+        tabelas["rebaixamento"] = None
+        
+        from src import simulacao
+        
+        with patch('src.simulacao.simular', wraps=simulacao.simular) as simular:
+            main.completar_probabilidades(tabelas)
+            main.completar_probabilidades(tabelas)
+        
+        simular.assert_called_once()
+        self.assertEqual(tabelas["rebaixamento"].tipo, "probabilidade")
+        _, probabilidades = main.dados_do_time(tabelas, "VITORIA")
+        self.assertRegex(probabilidades["rebaixamento"], r"^\d+,\d{2}$")
+        self.assertEqual(probabilidades["sulamericana"], "1,0")
+        
+        # A simulação não é atribuída ao UFMG: nem no post nem no histórico
+        from src.formatter import gerar_thread
+        from src.historico import retrato
+        
+        self.assertEqual(main.probabilidades_simuladas(tabelas), ["rebaixamento"])
+        rodape = gerar_thread(None, probabilidades, simulados=["rebaixamento"])[-1]
+        self.assertIn("Risco de Rebaixamento: simulação do bot, não do UFMG", rodape)
+        self.assertNotIn("Sula: simulação", rodape)
+        self.assertIsNone(retrato(tabelas)["VITORIA"].get("rebaixamento"))
+        self.assertEqual(retrato(tabelas)["VITORIA"]["sulamericana"], 1.0)
+    
+    @patch('main.SIMULACAO', "fallback")
+    @patch('src.simulacao.SIMULACAO_TEMPORADAS', 2000)
+    def test_simulacao_usa_zonas_da_competicao(self):
+        """Testa que a Série B só simula as zonas dela, sem os jogos da Série A"""
+        import main
+        from src import simulacao
+        from config.settings import COMPETICOES
+        
+        tabelas = {"classificacao_geral": tabelas_exemplo()["classificacao_geral"], "rebaixamento": None}
+        
+        with patch('src.simulacao.simular', wraps=simulacao.simular) as simular, \
+             patch('src.simulacao.carregar_partidas') as partidas:
+            main.completar_probabilidades(tabelas, "serie_b")
+        
+        partidas.assert_not_called()
+        self.assertIsNone(simular.call_args.args[1])
+        self.assertEqual(simular.call_args.kwargs["zonas"], COMPETICOES["serie_b"]["zonas"])
+        self.assertEqual(set(tabelas), {"classificacao_geral", "rebaixamento"})
+        self.assertEqual(tabelas["rebaixamento"].origem, "simulacao")
+        
+        resultado = simulacao.simular(self.classificacao(), temporadas=100, zonas={"acesso": (1, 2)})
+        self.assertEqual(set(simulacao.tabelas_simuladas(resultado, self.classificacao())), {"acesso"})
+    
+    @patch('src.simulacao.SIMULACAO_RODADAS', 6)
+    @patch('src.simulacao.SIMULACAO_ZONAS', {"libertadores": (1, 2), "rebaixamento": (4, 4)})
+    def test_cenarios_fixam_resultados(self):
+        """Testa os cenários nos dois modelos, no pool de processos e a ordem do que o time precisa"""
+        from src.cenarios import combinacoes, simular_cenarios, o_que_precisa
+        
+        cenarios = combinacoes([("BETA", "GAMA")])
+        self.assertEqual([c[0][2] for c in cenarios], ["V", "E", "D"])
+        
+        for partidas in (None, [("ALFA", "DELTA"), ("BETA", "GAMA")]):
+            resultados = simular_cenarios(self.classificacao(), cenarios, partidas, temporadas=2000, processos=1)
+            # Com o último jogo decidido, a segunda vaga não tem mais sorteio
+            libertadores = [r["probabilidades"]["GAMA"]["libertadores"] for r in resultados]
+            self.assertEqual(libertadores, [0.0, 0.0, 100.0])
+            self.assertAlmostEqual(sum(r["chance"] for r in resultados), 1.0)
+            
+            precisa = o_que_precisa(resultados, "GAMA", "libertadores")
+            self.assertEqual(precisa["cenarios"][0]["cenario"], (("BETA", "GAMA", "D"),))
+            self.assertAlmostEqual(precisa["atual"], 100 * resultados[2]["chance"])
+            self.assertGreater(precisa["cenarios"][0]["variacao"], 0)
+        
+        self.assertEqual(resultados, simular_cenarios(self.classificacao(), cenarios, partidas, temporadas=2000, processos=2))
+        with self.assertRaises(ValueError):
+            simular_cenarios(self.classificacao(), [(("GAMA", "BETA", "V"),)], partidas, processos=1)
+    
+    def test_cenarios_objetivo_invalido(self):
+        """Testa que um objetivo fora de SIMULACAO_ZONAS é recusado antes de qualquer coleta"""
+        import main
+        
+        with patch('src.simulacao.carregar_partidas') as partidas, \
+             self.assertLogs('main', level='ERROR') as logs:
+            self.assertFalse(main.mostrar_cenarios("titulo"))
+        partidas.assert_not_called()
+        self.assertIn("rebaixamento", logs.output[0])
+    
+    def test_gerar_cenarios(self):
+        """Testa o post do que o time precisa"""
+        from src.formatter import gerar_cenarios, peso_tweet
+        from config.settings import MAX_TWEET_LENGTH
+        
+        precisa = {
+            "time": "VITORIA", "objetivo": "rebaixamento", "atual": 40.0,
+            "cenarios": [
+                {"cenario": (("VITORIA", "BAHIA", "V"), ("SPORT", "CEARA", "D")), "probabilidade": 25.5, "variacao": -14.5, "chance": 0.2},
+                {"cenario": (("VITORIA", "BAHIA", "E"), ("SPORT", "CEARA", "D")), "probabilidade": 38.0, "variacao": -2.0, "chance": 0.1},
+            ],
+        }
+        tweets = gerar_cenarios(precisa)
+        texto = "\n".join(tweets)
+        
+        self.assertTrue(all(peso_tweet(t) <= MAX_TWEET_LENGTH for t in tweets))
+        self.assertTrue(tweets[0].startswith("🔮 O que o VITORIA precisa"))
+        self.assertIn("Risco de Rebaixamento hoje: 40.00%", tweets[0])
+        self.assertIn("1. VITORIA vence BAHIA, CEARA vence SPORT", texto)
+        self.assertIn("2. VITORIA e BAHIA empatam", texto)
+        self.assertIn("25.50% (-14.50)", texto)
+
+
+class TestDaemon(unittest.TestCase):
+    """Testes para o modo daemon"""
+    
+    def test_intervalo_adaptativo(self):
+        """Testa intervalo curto em janela de jogo e longo fora dela"""
+        from datetime import datetime
+        from src.daemon import intervalo_polling, BRT
+        from config.settings import DAEMON_INTERVALO_JOGO, DAEMON_INTERVALO_NORMAL
+        
+        domingo_tarde = datetime(2025, 11, 2, 16, 0, tzinfo=BRT)
+        terca_manha = datetime(2025, 11, 4, 10, 0, tzinfo=BRT)
+        
+        self.assertEqual(intervalo_polling(domingo_tarde), DAEMON_INTERVALO_JOGO)
+        self.assertEqual(intervalo_polling(terca_manha), DAEMON_INTERVALO_NORMAL)
+        self.assertEqual(intervalo_polling(terca_manha, falhou=True), DAEMON_INTERVALO_JOGO)
+    
+    @patch('src.daemon.DAEMON_INTERVALO_JOGO', 0.01)
+    def test_loop_ate_parada(self):
+        """Testa que o daemon repete ciclos, sobrevive a erros e para pelo evento"""
+        import threading
+        from src.daemon import executar_daemon
+        
+        parar = threading.Event()
+        chamadas = []
+        
+        def executar():
+            chamadas.append(1)
+            if len(chamadas) == 1:
+                raise RuntimeError("UFMG fora do ar")
+            parar.set()
+            return True
+        
+        self.assertTrue(executar_daemon(executar, parar=parar))
+        self.assertEqual(len(chamadas), 2)
+    
+    def test_memoria_e_o_rss_atual(self):
+        """Testa que a memória vem do RSS atual (statm), e não do pico, que nunca diminui"""
+        import tempfile
+        from src.daemon import memoria_mb
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            statm = os.path.join(tmp, "statm")
+            with open(statm, "w", encoding="ascii") as f:
+                f.write("9000 512 100 10 0 300 0\n")
+            with patch('src.daemon.os.sysconf', return_value=4096):
+                self.assertEqual(memoria_mb(statm), 2.0)
+            
+            with open(statm, "w", encoding="ascii") as f:
+                f.write("9000 256 100 10 0 300 0\n")
+            with patch('src.daemon.os.sysconf', return_value=4096):
+                self.assertEqual(memoria_mb(statm), 1.0)
+            
+            self.assertIsNone(memoria_mb(os.path.join(tmp, "inexistente")))
+
+
+class ErroAPI(Exception):
+    """Exceção no formato de tweepy.HTTPException (com a resposta HTTP)"""
+    
+    def __init__(self, status, headers=None):
+        super().__init__(f"{status} erro da API")
+        self.response = Mock(status_code=status, headers=headers or {})
+
+
+class TestOutbox(unittest.TestCase):
+    """Testes para a fila persistente de posts"""
+    
+    @patch('src.outbox.time.sleep')
+    def test_thread_retoma_sem_repetir_partes(self, sleep):
+        """Testa que uma thread interrompida continua da parte seguinte e nunca é reenviada"""
+        outbox = Outbox(":memory:")
+        chave = outbox.enfileirar("k1", "Vitória", ["parte 1", "parte 2"], {})
+        self.assertEqual(chave, "pendente")
+        
+        cliente = Mock(nome="twitter")
+        cliente.enviar.side_effect = [{"id": "10"}] + [ErroAPI(503)] * 3
+        self.assertEqual(outbox.drenar("VITORIA", lambda: [cliente]), {"k1": "pendente"})
+        
+        # A próxima tentativa fica agendada pelo backoff; libera para reenviar agora
+        outbox.conexao.execute("UPDATE posts SET proxima_tentativa = 0")
+        outbox.conexao.execute("UPDATE entregas SET proxima_tentativa = 0")
+        cliente = Mock(nome="twitter")
+        cliente.enviar.return_value = {"id": "11"}
+        publicados = []
+        self.assertEqual(outbox.drenar("VITORIA", lambda: [cliente], publicados.append), {"k1": "publicado"})
+        
+        cliente.enviar.assert_called_once_with("parte 2", responder_a="10", chave="k1-1")
+        self.assertEqual(publicados[0]["chave"], "k1")
+        self.assertEqual(outbox.enfileirar("k1", "Vitória", ["parte 1", "parte 2"], {}), "publicado")
+        self.assertEqual(outbox.drenar("VITORIA", lambda: [cliente]), {})
+    
+    def test_rate_limit_adia_para_o_reset(self):
+        """Testa que um 429 com reset distante deixa o post agendado sem novas chamadas"""
+        import time
+        
+        outbox = Outbox(":memory:")
+        outbox.enfileirar("k1", "Vitória", ["tweet"], {})
+        reset = int(time.time()) + 900
+        
+        cliente = Mock(nome="twitter")
+        cliente.enviar.side_effect = ErroAPI(429, {"x-rate-limit-reset": str(reset)})
+        self.assertEqual(outbox.drenar("VITORIA", lambda: [cliente]), {"k1": "pendente"})
+        self.assertEqual(outbox.drenar("VITORIA", lambda: [cliente]), {"k1": "pendente"})
+        cliente.enviar.assert_called_once()
+        self.assertGreaterEqual(outbox.pendentes("VITORIA")[0]["proxima_tentativa"], reset)
+        
+        # Dados novos substituem o post que nunca chegou a sair
+        outbox.enfileirar("k2", "Vitória", ["tweet novo"], {})
+        self.assertEqual(outbox.estado("k1"), "substituido")
+        
+        # Os dados voltam a ser os de k1: k1 é retomado e k2 passa a ser o substituído
+        self.assertEqual(outbox.enfileirar("k1", "Vitória", ["tweet"], {}), "pendente")
+        self.assertEqual(outbox.estado("k2"), "substituido")
+        self.assertEqual([post["chave"] for post in outbox.pendentes("VITORIA")], ["k1"])
+        cliente.enviar.side_effect = None
+        cliente.enviar.return_value = {"id": "20"}
+        self.assertEqual(outbox.drenar("VITORIA", lambda: [cliente]), {"k1": "publicado"})
+
+
+class TestPublicadores(unittest.TestCase):
+    """Testes para o despacho a vários canais"""
+    
+    def setUp(self):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        recebidos = self.recebidos = []
+        
+        class Manipulador(BaseHTTPRequestHandler):
+            """Imita as APIs do Mastodon e do Telegram"""
+            
+            def do_POST(self):
+                corpo = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                recebidos.append((self.path, dict(self.headers), corpo))
+                numero = sum(1 for r in recebidos if r[0] == self.path)
+                if self.path == "/api/v1/statuses":
+                    resposta = {"id": str(100 + numero)}
+                else:
+                    resposta = {"ok": True, "result": {"message_id": numero}}
+                dados = json.dumps(resposta).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manipulador)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+    
+    def tearDown(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+    
+    @patch('src.outbox.DESPACHO_TIMEOUT', 0.3)
+    def test_canal_lento_nao_atrasa_os_outros(self):
+        """Testa o envio concorrente, a thread em cada canal e o isolamento de um canal lento"""
+        import threading
+        import time
+        from src.publicadores import Publicador, PublicadorMastodon, PublicadorTelegram
+        
+        liberar = threading.Event()
+        chamadas = []
+        
+        class CanalLento(Publicador):
+            nome = "lento"
+            
+            def enviar(self, texto, responder_a=None, chave=None):
+                chamadas.append(texto)
+                liberar.wait(5)
+                return {"id": "1"}
+        
+        canais = [
+            CanalLento(),
+            PublicadorMastodon(self.url, "token"),
+            PublicadorTelegram(self.url, "123:abc", "-100"),
+        ]
+        for canal in canais:
+            canal.intervalo = 0
+        
+        outbox = Outbox(":memory:")
+        outbox.enfileirar("k1", "Vitória", ["parte 1", "parte 2"], {})
+        publicados = []
+        
+        self.assertEqual(outbox.drenar("VITORIA", lambda: canais, publicados.append), {"k1": "pendente"})
+        
+        # O canal lento conta uma tentativa falha e roda em thread daemon (não segura a saída)
+        self.assertEqual(outbox.entregas("k1")["lento"]["ultimo_erro"], "sem resposta em 0.3s")
+        self.assertTrue(all(t.daemon for t in threading.enumerate() if t.name == "despacho-lento"))
+        with self.assertRaises(TypeError):
+            Publicador()
+        
+        # O cache é gravado assim que um canal publica, sem esperar o lento
+        self.assertEqual(len(publicados), 1)
+        self.assertEqual(len(self.recebidos), 4)
+        mastodon = [r for r in self.recebidos if r[0] == "/api/v1/statuses"]
+        self.assertEqual(mastodon[0][1]["Authorization"], "Bearer token")
+        self.assertEqual(mastodon[1][1]["Idempotency-Key"], "k1-1")
+        self.assertEqual(mastodon[1][2], {"status": "parte 2", "in_reply_to_id": "101"})
+        telegram = [r for r in self.recebidos if r[0] == "/bot123:abc/sendMessage"]
+        self.assertEqual(telegram[0][2], {"chat_id": "-100", "text": "parte 1"})
+        self.assertEqual(telegram[1][2]["reply_to_message_id"], 1)
+        
+        # Outro despacho enquanto o envio lento continua não manda o post de novo
+        self.assertEqual(outbox.drenar("VITORIA", lambda: canais, publicados.append), {"k1": "pendente"})
+        self.assertEqual(chamadas, ["parte 1"])
+        
+        # O envio lento termina em segundo plano e só ele falta na próxima execução
+        liberar.set()
+        for _ in range(50):
+            if outbox.entregas("k1").get("lento", {}).get("estado") == "publicado":
+                break
+            time.sleep(0.05)
+        self.assertEqual(outbox.drenar("VITORIA", lambda: canais, publicados.append), {"k1": "publicado"})
+        self.assertEqual(len(self.recebidos), 4)
+        self.assertEqual(len(publicados), 1)
+        self.assertEqual(len(chamadas), 2)
+
+
+class TestMetricas(unittest.TestCase):
+    """Testes para as métricas de cada execução"""
+    
+    def test_exporta_prometheus_e_json(self):
+        """Testa o registro de downloads, etapas e posts e os dois formatos exportados"""
+        import json
+        import tempfile
+        import main
+        from src.metricas import nova_execucao, metricas_atuais
+        
+        metricas = nova_execucao()
+        with patch('main.obter_conteudo', side_effect=[{"origem": "rede", "bytes": 2048}, Exception("timeout")]):
+            main._obter_conteudo_seguro(main.URLS["rebaixamento"])
+            main._obter_conteudo_seguro(main.URLS["libertadores"])
+        with metricas.etapa("parse"):
+            pass
+        metricas.registrar_post('Atlético "MG"', "falhou")
+        metricas.finalizar(False)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            metricas.exportar(os.path.join(tmp, "bot.prom"), os.path.join(tmp, "resumo.json"))
+            with open(os.path.join(tmp, "bot.prom"), encoding="utf-8") as f:
+                prom = f.read()
+            with open(os.path.join(tmp, "resumo.json"), encoding="utf-8") as f:
+                resumo = json.load(f)
+        
+        self.assertIs(metricas_atuais(), metricas)
+        self.assertIn('vitoria_bot_requisicao_bytes{pagina="rebaixamento"} 2048', prom)
+        self.assertIn('vitoria_bot_paginas{origem="erro"} 1', prom)
+        self.assertIn('vitoria_bot_posts{clube="Atlético \\"MG\\"",resultado="falhou"} 1', prom)
+        self.assertIn("vitoria_bot_execucao_sucesso 0", prom)
+        self.assertEqual(resumo["etapas"]["parse"]["vezes"], 1)
+        self.assertEqual(resumo["bytes_baixados"], 2048)
+        self.assertEqual(resumo["paginas_por_origem"], {"rede": 1, "erro": 1})
+    
+    @unittest.skipIf(sys.platform == 'win32', "permissões POSIX")
+    def test_exportacao_legivel_pelo_node_exporter(self):
+        """Testa que o .prom e o JSON ficam legíveis por outros usuários mesmo com umask restritiva"""
+        import stat
+        import tempfile
+        from src.metricas import Metricas
+        
+        umask = os.umask(0o077)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                caminhos = [os.path.join(tmp, "bot.prom"), os.path.join(tmp, "resumo.json")]
+                Metricas().exportar(*caminhos)
+                for caminho in caminhos:
+                    self.assertTrue(os.stat(caminho).st_mode & stat.S_IROTH, caminho)
+        finally:
+            os.umask(umask)
+
+
+class TestLogs(unittest.TestCase):
+    """Testes para o logging em fila"""
+    
+    def test_json_lines_com_argumentos_preguicosos(self):
+        """Testa o arquivo em JSON lines, a exceção separada e que debug desligado não formata"""
+        import json
+        import logging
+        import tempfile
+        from src.logs import configurar_logging, parar_logging
+        
+        class Caro:
+            formatacoes = 0
+            
+            def __str__(self):
+                Caro.formatacoes += 1
+                return "caro"
+        
+        raiz = logging.getLogger()
+        manipuladores, nivel = list(raiz.handlers), raiz.level
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                configurar_logging(tmp, "bot.log", "INFO", formato_json=True)
+                logger = logging.getLogger("teste")
+                logger.debug("Antiga: %s", Caro())
+                logger.info("Coleta de %s", "Vitória")
+                try:
+                    raise ValueError("falhou")
+                except ValueError:
+                    logger.error("Erro: %s", Caro(), exc_info=True)
+                parar_logging()
+                
+                with open(os.path.join(tmp, "bot.log"), encoding="utf-8") as f:
+                    registros = [json.loads(linha) for linha in f]
+        finally:
+            for manipulador in list(raiz.handlers):
+                raiz.removeHandler(manipulador)
+            for manipulador in manipuladores:
+                raiz.addHandler(manipulador)
+            raiz.setLevel(nivel)
+        
+        self.assertEqual([r["mensagem"] for r in registros], ["Coleta de Vitória", "Erro: caro"])
+        self.assertEqual(registros[1]["nivel"], "ERROR")
+        self.assertIn("ValueError: falhou", registros[1]["excecao"])
+        self.assertEqual(Caro.formatacoes, 1)
+
+
+class TestReplay(unittest.TestCase):
+    """Testes para o servidor local que imita o UFMG"""
+    
+    HTML = (
+        "<html><body><table><tr><th>Pos</th><th>Time</th><th>Prob</th></tr>"
+        "<tr><td>17</td><td>Vitória</td><td>45,6</td></tr></table></body></html>"
+    )
+    
+    def test_etag_304_e_layout_alterado(self):
+        """Testa o 304 por ETag e que o layout alterado continua legível pelo cabeçalho"""
+        import tempfile
+        import requests
+        from config.settings import URLS
+        from src.replay import ServidorUFMG
+        from src.scraper import parsear_tabela
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "rebaixamento.html"), "w", encoding="utf-8") as f:
+                f.write(self.HTML)
+            
+            with ServidorUFMG(tmp, porta=0) as servidor:
+                url = servidor.urls()["rebaixamento"]
+                resposta = requests.get(url, timeout=5)
+                self.assertEqual(resposta.status_code, 200)
+                revalidacao = requests.get(
+                    url, headers={"If-None-Match": resposta.headers["ETag"]}, timeout=5
+                )
+                self.assertEqual(revalidacao.status_code, 304)
+                self.assertEqual(requests.get(servidor.url_base + "/outra/", timeout=5).status_code, 404)
+            
+            with ServidorUFMG(tmp, falhas={"layout_alterado": True}, porta=0) as servidor:
+                html = requests.get(servidor.urls()["rebaixamento"], timeout=5).text
+        
+        self.assertIn("<td>Vitória</td><td>45,6</td><td>17</td>", html)
+        linha = parsear_tabela(html, "probabilidade").buscar("VITORIA")
+        self.assertEqual((linha["posicao"], linha["probabilidade"]), ("17", "45,6"))
+        self.assertTrue(URLS["rebaixamento"].startswith("https://www.mat.ufmg.br"))
+    
+    def test_replay_cobre_todas_as_competicoes(self):
+        """Testa que a Série B também é servida localmente e que nenhuma URL fica no site real"""
+        import copy
+        import tempfile
+        import requests
+        from config.settings import COMPETICOES, URLS
+        from src.coleta import planejar
+        from src.replay import iniciar_replay
+        
+        originais = copy.deepcopy(COMPETICOES)
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "serie_b"))
+            with open(os.path.join(tmp, "serie_b", "rebaixamento.html"), "w", encoding="utf-8") as f:
+                f.write(self.HTML)
+            
+            servidor = iniciar_replay(tmp, porta=0)
+            try:
+                plano = planejar(COMPETICOES)
+                self.assertTrue(all(url.startswith(servidor.url_base) for url in plano["urls"]))
+                self.assertIs(URLS, COMPETICOES["serie_a"]["paginas"])
+                
+                serie_b = requests.get(plano["paginas"]["serie_b"]["rebaixamento"], timeout=5)
+                self.assertEqual(serie_b.status_code, 200)
+                self.assertIn("Vitória", serie_b.text)
+                # Mesma chave na Série A, sem snapshot: não cai no arquivo da Série B
+                self.assertEqual(requests.get(URLS["rebaixamento"], timeout=5).status_code, 404)
+            finally:
+                servidor.parar()
+                for competicao, dados in originais.items():
+                    COMPETICOES[competicao]["paginas"].update(dados["paginas"])
+
+
+class TestHistorico(unittest.TestCase):
+    """Testes para o histórico em SQLite"""
+    
+    def test_serie_e_ultimo_post(self):
+        """Testa a consulta por período e o último post de um clube"""
+        historico = Historico(":memory:")
+        historico.registrar_coleta(tabelas_exemplo(), coletado_em=100)
+        historico.registrar_coleta(tabelas_exemplo(), coletado_em=200)
+        historico.registrar_coleta(tabelas_exemplo(), coletado_em=300)
+        
+        serie = historico.serie("Vitória", "rebaixamento", inicio=150)
+        
+        self.assertEqual(serie, [(200.0, 38, 5.0), (300.0, 38, 5.0)])
+        self.assertIsNone(historico.ultimo_post("VITORIA"))
+        
+        historico.registrar_post("VITORIA", {"classificacao": {"Posicao": "15º"}})
+        self.assertEqual(historico.ultimo_post("Vitória")["classificacao"]["Posicao"], "15º")
+        
+        with self.assertRaises(ValueError):
+            historico.serie("VITORIA", "1; DROP TABLE coletas")
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file